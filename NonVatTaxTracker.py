@@ -1,21 +1,32 @@
+import argparse
+import os
 import tkinter as tk
-from core.app_state import AppState
-from gui.setup_wizard import SetupWizard
-from gui.main_window import MainWindow
+from core.paths import ensure_app_dirs
+from core.clients import ClientRegistry, StoragePool
 
 
-def main():
-    root = tk.Tk()
-    root.withdraw()
+def start(root, db_path=None):
+    """Build the first window on an existing root. Split out of main() so the
+    cold-start benchmark can measure first paint without entering mainloop.
+    db_path (--db) replaces the default client's database."""
+    ensure_app_dirs()
 
-    app_state = AppState()
-    app_state.load()
+    # The client list is a small JSON index; only the active client's
+    # database is opened
+    clients = ClientRegistry(default_db=db_path)
+    pool = StoragePool(clients)
+    app_state = clients.load_state(clients.active)
 
     def launch_main():
+        # customtkinter and the GUI tabs are only needed once setup is done
+        from gui.main_window import MainWindow
+
         root.deiconify()
-        MainWindow(root, app_state)
+        MainWindow(root, app_state, storage=pool.get(clients.active), clients=clients, pool=pool)
 
     if not app_state.is_configured:
+        from gui.setup_wizard import SetupWizard
+
         SetupWizard(
             root=root,
             parent=root,
@@ -25,7 +36,40 @@ def main():
     else:
         launch_main()
 
-    root.mainloop()
+    return pool
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Non-VAT Income & Expense Tax Tracker")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile this session and write the results to data/diagnostics on exit")
+    parser.add_argument("--db", help="database file, file: URI or :memory: (default: $TAX_TRACKER_DB "
+                                     "or data/records.db)")
+    # Unknown arguments (e.g. from a launcher) are ignored
+    return parser.parse_known_args(argv)[0]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # cProfile/pstats are only imported when asked for; they slow startup
+    session = None
+    if args.profile or os.environ.get("TAX_TRACKER_PROFILE"):
+        from core.profiling import ProfileSession, enabled_from_env
+        if args.profile or enabled_from_env():
+            session = ProfileSession()
+            session.start()
+
+    root = tk.Tk()
+    root.withdraw()
+
+    pool = start(root, db_path=args.db)
+
+    try:
+        root.mainloop()
+    finally:
+        if session:
+            session.stop(storages=list(pool.open.values()))
 
 
 if __name__ == "__main__":
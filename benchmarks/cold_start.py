@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must NOT be pulled in just by importing the entry point.
+LAZY_MODULES = [
+    "customtkinter",
+    "tkcalendar",
+    "gui.main_window",
+    "gui.setup_wizard",
+    "gui.income_form",
+    "gui.expense_form",
+]
+
+FIRST_PAINT_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+import tkinter as tk
+import NonVatTaxTracker as app
+t_import = time.perf_counter()
+try:
+    root = tk.Tk()
+except tk.TclError as e:
+    print(json.dumps({"skipped": str(e)}))
+    raise SystemExit(0)
+root.withdraw()
+app.start(root)
+root.update()
+t_paint = time.perf_counter()
+root.destroy()
+print(json.dumps({
+    "import_ms": (t_import - t0) * 1000,
+    "first_paint_ms": (t_paint - t0) * 1000,
+}))
+"""
+
+
+def run_python(args, timeout=60, env=None):
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env=env
+    )
+
+
+def scratch_data_dir(folder, db_path=None):
+    """
+    Sets up `folder` as the app's data folder with configured books, so the
+    first paint neither touches the real data nor waits in the setup wizard.
+    db_path is copied in as the books to paint (default: empty books).
+    """
+    from core.app_state import AppState
+
+    AppState(state_file=os.path.join(folder, "app_state.json")).update_profile("sole", "graduated", "itemized")
+    if db_path:
+        shutil.copyfile(db_path, os.path.join(folder, "records.db"))
+    return folder
+
+
+def parse_importtime(stderr: str):
+    """Returns {module: (self_us, cumulative_us)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].strip()
+        modules[name] = (int(parts[0]), int(parts[1]))
+    return modules
+
+
+def measure_import():
+    result = run_python(["-X", "importtime", "-c", "import NonVatTaxTracker"])
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+
+    modules = parse_importtime(result.stderr)
+    total_us = modules.get("NonVatTaxTracker", (0, 0))[1]
+    slowest = sorted(modules.items(), key=lambda kv: kv[1][0], reverse=True)[:10]
+
+    return {
+        "import_ms": total_us / 1000,
+        "eager_heavy_modules": [m for m in LAZY_MODULES if m in modules],
+        "slowest_self_ms": [(name, self_us / 1000) for name, (self_us, _) in slowest],
+    }
+
+
+def measure_first_paint(data_dir):
+    from core.paths import DATA_DIR_ENV
+    from core.storage import DB_ENV
+
+    env = dict(os.environ, **{DATA_DIR_ENV: data_dir})
+    env.pop(DB_ENV, None)
+    try:
+        result = run_python(["-c", FIRST_PAINT_SNIPPET], env=env)
+    except subprocess.TimeoutExpired:
+        return {"skipped": "timed out (a modal dialog is probably waiting for input)"}
+
+    if result.returncode != 0:
+        return {"skipped": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Times `import NonVatTaxTracker` and the first paint (on scratch books) in fresh "
+                    "interpreters; exits 1 when either is over budget or the first paint cannot run."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=300.0)
+    parser.add_argument("--paint-budget-ms", type=float, default=2500.0)
+    parser.add_argument("--db", help="books to paint, copied into a scratch data folder (default: empty books)")
+    parser.add_argument("--skip-paint", action="store_true",
+                        help="only time the import (no display); otherwise a first paint that cannot run fails")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args(argv)
+
+    imports = [measure_import() for _ in range(args.runs)]
+    paints = []
+    if not args.skip_paint:
+        with tempfile.TemporaryDirectory() as scratch:
+            data_dir = scratch_data_dir(scratch, args.db)
+            paints = [measure_first_paint(data_dir) for _ in range(args.runs)]
+
+    import_ms = statistics.median(r["import_ms"] for r in imports)
+    paint_times = [p["first_paint_ms"] for p in paints if "first_paint_ms" in p]
+    paint_ms = statistics.median(paint_times) if paint_times else None
+
+    report = {
+        "runs": args.runs,
+        "import_ms": round(import_ms, 2),
+        "import_budget_ms": args.import_budget_ms,
+        "first_paint_ms": round(paint_ms, 2) if paint_ms is not None else None,
+        "paint_budget_ms": args.paint_budget_ms,
+        "eager_heavy_modules": imports[0]["eager_heavy_modules"],
+        "slowest_self_ms": imports[0]["slowest_self_ms"],
+    }
+    if paint_ms is None:
+        report["first_paint_skipped"] = paints[0].get("skipped") if paints else "--skip-paint"
+
+    print(f"import NonVatTaxTracker : {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    if paint_ms is None:
+        print(f"first paint             :  skipped ({report['first_paint_skipped']})")
+    else:
+        print(f"first paint             : {paint_ms:8.1f} ms (budget {args.paint_budget_ms:.0f} ms)")
+    print("slowest imports (self):")
+    for name, ms in report["slowest_self_ms"]:
+        print(f"  {ms:8.2f} ms  {name}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.1f} ms is over budget")
+    if paint_ms is None and not args.skip_paint:
+        failures.append(f"first paint did not run ({report['first_paint_skipped']})")
+    elif paint_ms is not None and paint_ms > args.paint_budget_ms:
+        failures.append(f"first paint {paint_ms:.1f} ms is over budget")
+    if report["eager_heavy_modules"]:
+        failures.append("imported eagerly: " + ", ".join(report["eager_heavy_modules"]))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from benchmarks.synthetic import DEFAULT_SEED, ensure_ledger, parse_count, format_count, PROJECT_ROOT
+from core.storage import StorageManager, QUARTER_MONTHS
+from core.app_state import AppState
+from core.backup import backup_income, backup_expense, backup_summary
+from core.tax import graduated_tax, income_tax, percentage_tax
+from core.optimizer import evaluate_grid
+
+DEFAULT_SIZES = "1k,10k,100k"
+
+# Ratios above this in --compare are flagged as regressions
+REGRESSION_RATIO = 1.10
+
+# Inputs per call of the tax cases
+TAX_INPUTS = 10_000
+
+
+# ================== CASES ==================
+def ledger_cases(storage, app_state, year, scratch):
+    """(name, fn) pairs timed against one ledger."""
+    return [
+        ("get_all_income", lambda: storage.get_all_income()),
+        ("get_all_expense", lambda: storage.get_all_expense()),
+        ("get_quarter_summary", lambda: [storage.get_quarter_summary(year, q) for q in QUARTER_MONTHS]),
+        ("get_annual_summary", lambda: storage.get_annual_summary(year)),
+        ("backup_income", lambda: backup_income(storage, scratch)),
+        ("backup_expense", lambda: backup_expense(storage, scratch)),
+        ("backup_summary", lambda: backup_summary(storage, app_state, year, scratch)),
+    ]
+
+
+def tax_cases(seed):
+    """Size-independent cases: TAX_INPUTS calls each, on seeded inputs."""
+    rng = random.Random(seed)
+    grosses = [rng.uniform(0, 6_000_000) for _ in range(TAX_INPUTS)]
+    expenses = [g * rng.uniform(0, 0.8) for g in grosses]
+    pairs = list(zip(grosses, expenses))
+
+    def income_tax_all(tax_type, earner_type, deduction_type):
+        return lambda: [income_tax(g, e, tax_type, earner_type, deduction_type) for g, e in pairs]
+
+    return [
+        ("graduated_tax", lambda: [graduated_tax(g) for g in grosses]),
+        ("income_tax 8%", income_tax_all("8_percent", "sole", None)),
+        ("income_tax osd", income_tax_all("graduated", "sole", "osd")),
+        ("income_tax itemized", income_tax_all("graduated", "mixed", "itemized")),
+        ("percentage_tax", lambda: [percentage_tax(g, "graduated") for g in grosses]),
+        ("evaluate_grid 100x50", lambda: evaluate_grid(
+            [i * 60_000 for i in range(1, 101)], [i / 50 for i in range(50)], "sole"
+        )),
+    ]
+
+
+def time_case(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "best_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "max_ms": round(timings[-1], 3),
+        "repeat": repeat,
+    }
+
+
+# ================== RUN ==================
+def open_ledger(path, memory=False):
+    if not memory:
+        return StorageManager(db_path=path)
+    storage = StorageManager(db_path=":memory:")
+    source = sqlite3.connect(path)
+    try:
+        source.backup(storage.conn)
+    finally:
+        source.close()
+    return storage
+
+
+def build_progress(size):
+    def progress(done, total):
+        end = "\n" if done == total else ""
+        print(f"\rbuilding {format_count(size)} ledger: {done / total:6.1%}", end=end, file=sys.stderr, flush=True)
+    return progress
+
+
+def git_info():
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def run(sizes, seed=DEFAULT_SEED, repeat=5, cases=None, year=None, log=print, memory=False):
+    """Returns the report dict. `cases` filters by case name (substring match)."""
+    year = year or date.today().year - 1
+    wanted = lambda name: not cases or any(c in name for c in cases)
+    results = []
+
+    for name, fn in tax_cases(seed):
+        if wanted(name):
+            results.append({"case": name, "rows": None, **time_case(fn, repeat)})
+            log(f"{name:<24}{'':>8}{results[-1]['best_ms']:>12.2f}{results[-1]['median_ms']:>12.2f}")
+
+    for size in sizes:
+        # The summarized year is the ledger's second-to-last, so it is a full year
+        path = ensure_ledger(size, seed, last_year=year + 1, progress=build_progress(size))
+        storage = open_ledger(path, memory)
+        # Never saved; only profile_for() is read
+        app_state = AppState(state_file=os.devnull)
+        app_state.earner_type, app_state.tax_type, app_state.deduction_type = "sole", "graduated", "osd"
+        app_state.is_configured = True
+
+        scratch = tempfile.mkdtemp(prefix="bench_backup_")
+        try:
+            for name, fn in ledger_cases(storage, app_state, year, scratch):
+                if wanted(name):
+                    results.append({"case": name, "rows": size, **time_case(fn, repeat)})
+                    log(f"{name:<24}{format_count(size):>8}"
+                        f"{results[-1]['best_ms']:>12.2f}{results[-1]['median_ms']:>12.2f}")
+        finally:
+            storage.conn.close()
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "git": git_info(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": seed,
+        "year": year,
+        "memory": memory,
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    """Prints best-time ratios against an earlier report. Returns the regressed case keys."""
+    before = {(r["case"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\nvs {(baseline['git'].get('commit') or '?')[:10]} ({baseline['git'].get('subject') or ''})")
+    print(f"{'case':<24}{'rows':>8}{'before ms':>12}{'after ms':>12}{'ratio':>8}")
+    for r in report["results"]:
+        key = (r["case"], r["rows"])
+        if key not in before:
+            continue
+        old, new = before[key]["best_ms"], r["best_ms"]
+        ratio = new / old if old else float("inf")
+        flag = "  slower" if ratio > REGRESSION_RATIO else ""
+        if flag:
+            regressions.append(key)
+        rows = format_count(r["rows"]) if r["rows"] else ""
+        print(f"{r['case']:<24}{rows:>8}{old:>12.2f}{new:>12.2f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Core storage, backup and tax benchmarks on cached synthetic ledgers; "
+                    "the JSON report is tagged with the git commit for --compare"
+    )
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="income rows per ledger, e.g. 1k,100k,10M")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--year", type=int, default=None, help="year to summarize (default: last year)")
+    parser.add_argument("--case", action="append", help="only cases whose name contains this (repeatable)")
+    parser.add_argument("--memory", action="store_true", help="run on in-memory copies of the ledgers")
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help=f"exit 1 when a case is over {REGRESSION_RATIO:.2f}x its --compare time")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_count(s) for s in args.sizes.split(",") if s.strip()]
+
+    print(f"{'case':<24}{'rows':>8}{'best ms':>12}{'median ms':>12}")
+    report = run(sizes, args.seed, args.repeat, args.case, args.year, memory=args.memory)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f))
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
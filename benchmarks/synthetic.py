@@ -0,0 +1,235 @@
+import argparse
+import calendar
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from core.storage import StorageManager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Ledgers built for benchmarks.run, by size, seed and year
+CACHE_DIR = os.path.join(PROJECT_ROOT, "benchmarks", ".cache")
+
+# Bump when the generated data changes, so cached ledgers are rebuilt
+GENERATOR_VERSION = 1
+
+DEFAULT_SEED = 42
+DEFAULT_YEARS = 3
+EXPENSE_RATIO = 0.5
+
+# Rows handed to bulk_add_* per statement; commits happen per chunk so a
+# 10M-row build never holds one huge transaction
+CHUNK_ROWS = 50_000
+
+# (ATC, withholding rate, share of records)
+INCOME_ATCS = [
+    ("WI010", 0.05, 0.30),   # professional fees, individual, gross <= 3M
+    ("WI011", 0.10, 0.08),   # professional fees, individual, gross > 3M
+    ("WI157", 0.02, 0.25),   # services by top withholding agents
+    ("WI158", 0.01, 0.12),   # goods by top withholding agents
+    ("WI100", 0.05, 0.05),   # rentals
+    ("", 0.0, 0.20),         # paid by individuals, no withholding
+]
+EXPENSE_ATCS = [
+    ("WI158", 0.01, 0.10),
+    ("WI157", 0.02, 0.08),
+    ("WI100", 0.05, 0.07),
+    ("", 0.0, 0.75),         # ordinary purchases, nothing withheld
+]
+
+# Median amount (pesos) and log-normal spread
+INCOME_AMOUNT = (15_000, 0.9)
+EXPENSE_AMOUNT = (2_500, 1.1)
+
+CLIENTS = [
+    "Acme Trading", "Bayanihan Logistics", "Cebu Pacific Prints", "Dela Cruz & Sons",
+    "Everbright Foods", "Filinvest Tech", "Golden Harvest Farms", "Habagat Studio",
+    "Isla Marketing", "Jollity Events", "Kalayaan Realty", "Luzon Builders",
+    "Mabuhay Clinic", "Nayon Cafe", "Orient Pearl Hotel", "Pinoy Apps Inc.",
+]
+VENDORS = [
+    "Meralco", "PLDT Fibr", "Globe Postpaid", "National Book Store", "Mercury Drug",
+    "Shell Station", "Grab", "Lazada", "Shopee", "Office Warehouse", "Jollibee",
+    "Ace Hardware", "Cebu Pacific", "Coworking Space", "Adobe", "Google Workspace",
+]
+
+
+def parse_count(text) -> int:
+    """'1000', '10k', '2.5M' -> int."""
+    text = str(text).strip().lower().replace("_", "").replace(",", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    if scale != 1:
+        text = text[:-1]
+    return int(float(text) * scale)
+
+
+def format_count(count: int) -> str:
+    for scale, suffix in ((1_000_000, "M"), (1_000, "k")):
+        if count >= scale and count % scale == 0:
+            return f"{count // scale}{suffix}"
+    return str(count)
+
+
+# ================== DISTRIBUTIONS ==================
+def day_weights(first_year: int, last_year: int):
+    """([date], [cumulative weight]) over the years, for rng.choices."""
+    days, cumulative, total = [], [], 0.0
+    day = date(first_year, 1, 1)
+    end = date(last_year, 12, 31)
+    while day <= end:
+        weight = 1.0 if day.weekday() < 5 else 0.15
+        last_day = calendar.monthrange(day.year, day.month)[1]
+        if day.day > last_day - 3:
+            weight *= 3.0    # month-end billing
+        elif day.day in (14, 15, 16):
+            weight *= 2.0    # mid-month billing
+        if day.month == 12:
+            weight *= 1.3
+        total += weight
+        days.append(day.isoformat())
+        cumulative.append(total)
+        day += timedelta(days=1)
+    return days, cumulative
+
+
+def generate_records(kind, count, rng, first_year, last_year):
+    """Yields lists of up to CHUNK_ROWS record dicts for bulk_add_income / bulk_add_expense."""
+    if kind == "income":
+        atcs, (median, sigma), names = INCOME_ATCS, INCOME_AMOUNT, CLIENTS
+        gross_field, tax_field, net_field, prefix = "gross_income", "cwt", "income_received", "INV"
+    else:
+        atcs, (median, sigma), names = EXPENSE_ATCS, EXPENSE_AMOUNT, VENDORS
+        gross_field, tax_field, net_field, prefix = "gross_expense", "wt", "expense_paid", "OR"
+
+    days, cumulative = day_weights(first_year, last_year)
+    atc_cumulative = []
+    running = 0.0
+    for _, _, share in atcs:
+        running += share
+        atc_cumulative.append(running)
+    mu = math.log(median)
+
+    serial = 0
+    while serial < count:
+        size = min(CHUNK_ROWS, count - serial)
+        dates = sorted(rng.choices(days, cum_weights=cumulative, k=size))
+        picks = rng.choices(atcs, cum_weights=atc_cumulative, k=size)
+
+        chunk = []
+        for record_date, (atc, rate, _) in zip(dates, picks):
+            serial += 1
+            gross = round(max(50.0, rng.lognormvariate(mu, sigma)), 2)
+            tax = round(gross * rate, 2)
+            chunk.append({
+                "date": record_date,
+                gross_field: gross,
+                "description": f"{rng.choice(names)} {prefix}-{serial:07d}",
+                tax_field: tax,
+                "atc": atc,
+                net_field: round(gross - tax, 2),
+            })
+        yield chunk
+
+
+# ================== LEDGERS ==================
+def build_ledger(db_path, income_rows, expense_rows=None, seed=DEFAULT_SEED,
+                 last_year=None, years=DEFAULT_YEARS, progress=None):
+    """
+    Creates db_path (replacing it) with the given number of rows. Dates span
+    `years` calendar years ending with last_year (default: this year).
+    """
+    if expense_rows is None:
+        expense_rows = int(income_rows * EXPENSE_RATIO)
+    last_year = last_year or date.today().year
+    first_year = last_year - years + 1
+
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    storage = StorageManager(db_path=db_path)
+    # A throwaway file: no need to survive a crash halfway through the build
+    storage.conn.execute("PRAGMA synchronous = OFF")
+    storage.conn.execute("PRAGMA journal_mode = MEMORY")
+
+    # Loading into bare tables and indexing afterwards is several times faster
+    # than maintaining the secondary indexes and the search index row by row
+    cursor = storage.conn.cursor()
+    for name, kind in cursor.execute("""
+        SELECT name, type FROM sqlite_master
+        WHERE tbl_name IN ('income', 'expense') AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """).fetchall():
+        cursor.execute(f"DROP {kind.upper()} {name}")
+
+    rng = random.Random(seed)
+    done, total = 0, income_rows + expense_rows
+    try:
+        for kind, count, bulk_add in (
+            ("income", income_rows, storage.bulk_add_income),
+            ("expense", expense_rows, storage.bulk_add_expense),
+        ):
+            for chunk in generate_records(kind, count, rng, first_year, last_year):
+                bulk_add(chunk, commit=False)
+                storage.conn.commit()
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        storage.create_indexes()
+        storage.create_search_index()
+        if storage.fts_enabled:
+            for table in ("income", "expense"):
+                cursor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        storage.conn.execute("ANALYZE")
+        storage.conn.commit()
+    finally:
+        storage.conn.close()
+    return db_path
+
+
+def ensure_ledger(income_rows, seed=DEFAULT_SEED, last_year=None, cache_dir=CACHE_DIR, progress=None):
+    """Path to a cached ledger with income_rows income records, building it on first use."""
+    last_year = last_year or date.today().year
+    os.makedirs(cache_dir, exist_ok=True)
+    name = f"ledger_v{GENERATOR_VERSION}_{format_count(income_rows)}_s{seed}_{last_year}.db"
+    path = os.path.join(cache_dir, name)
+    if os.path.exists(path):
+        return path
+
+    # Build under a temporary name so an interrupted build is never reused
+    partial = path + ".partial"
+    build_ledger(partial, income_rows, seed=seed, last_year=last_year, progress=progress)
+    os.replace(partial, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build a seeded synthetic records.db (the same seed always gives the same ledger)"
+    )
+    parser.add_argument("--rows", default="10k", help="income rows, e.g. 1000, 100k, 10M (expenses: half)")
+    parser.add_argument("--expense-rows", default=None)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS)
+    parser.add_argument("--last-year", type=int, default=None)
+    parser.add_argument("--out", required=True, help="database file to create (replaced if it exists)")
+    args = parser.parse_args(argv)
+
+    income_rows = parse_count(args.rows)
+    expense_rows = parse_count(args.expense_rows) if args.expense_rows else None
+
+    def progress(done, total):
+        print(f"\r{done / total:6.1%}  {done:,} / {total:,} rows", end="", file=sys.stderr)
+
+    started = time.perf_counter()
+    build_ledger(args.out, income_rows, expense_rows, seed=args.seed,
+                 last_year=args.last_year, years=args.years, progress=progress)
+    print(file=sys.stderr)
+    print(f"Wrote {args.out} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
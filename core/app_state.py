@@ -4,34 +4,65 @@ from core.paths import DATA_DIR
 
 STATE_FILE = os.path.join(DATA_DIR, "app_state.json")
 
+# Percent of the VAT threshold at which a warning is shown
+DEFAULT_VAT_WARNING_TIERS = [80, 90, 100]
+
+
+class TaxProfile:
+    """The election in force for one tax year."""
+
+    def __init__(self, earner_type, tax_type, deduction_type=None):
+        self.earner_type = earner_type
+        self.tax_type = tax_type
+        self.deduction_type = deduction_type
+
+    def to_dict(self):
+        return {
+            "earner_type": self.earner_type,
+            "tax_type": self.tax_type,
+            "deduction_type": self.deduction_type
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, TaxProfile) and self.to_dict() == other.to_dict()
+
 
 class AppState:
-    def __init__(self):
+    def __init__(self, state_file=None):
+        self.state_file = state_file or STATE_FILE
         self.earner_type = None
         self.tax_type = None
         self.deduction_type = None
         self.is_configured = False
+        self.vat_warning_tiers = list(DEFAULT_VAT_WARNING_TIERS)
+        # "YYYY" -> profile dict for years that keep an earlier election.
+        # Years not listed use the current profile above.
+        self.profiles = {}
 
     def load(self):
-        if not os.path.exists(STATE_FILE):
+        if not os.path.exists(self.state_file):
             return
 
-        with open(STATE_FILE, "r") as f:
+        with open(self.state_file, "r") as f:
             data = json.load(f)
 
         self.earner_type = data.get("earner_type")
         self.tax_type = data.get("tax_type")
         self.deduction_type = data.get("deduction_type")
         self.is_configured = data.get("is_configured", False)
+        self.vat_warning_tiers = data.get("vat_warning_tiers", list(DEFAULT_VAT_WARNING_TIERS))
+        self.profiles = data.get("profiles", {})
 
     def save(self):
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(STATE_FILE, "w") as f:
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        with open(self.state_file, "w") as f:
             json.dump({
                 "earner_type": self.earner_type,
                 "tax_type": self.tax_type,
                 "deduction_type": self.deduction_type,
-                "is_configured": self.is_configured
+                "is_configured": self.is_configured,
+                "vat_warning_tiers": self.vat_warning_tiers,
+                "profiles": self.profiles
             }, f, indent=4)
 
     def update_profile(self, earner_type, tax_type, deduction_type=None):
@@ -40,3 +71,31 @@ class AppState:
         self.deduction_type = deduction_type
         self.is_configured = True
         self.save()
+
+    # ================== PER-YEAR PROFILES ==================
+    def current_profile(self) -> TaxProfile:
+        return TaxProfile(self.earner_type, self.tax_type, self.deduction_type)
+
+    def profile_for(self, year) -> TaxProfile:
+        stored = self.profiles.get(str(year))
+        if stored:
+            return TaxProfile(stored["earner_type"], stored["tax_type"], stored.get("deduction_type"))
+        return self.current_profile()
+
+    def pin_years(self, years):
+        """
+        Record the current election for `years` that do not have their own
+        yet, so a later profile change leaves them as they were filed.
+        """
+        if not self.is_configured:
+            return
+        changed = False
+        for year in years:
+            if str(year) not in self.profiles:
+                self.profiles[str(year)] = self.current_profile().to_dict()
+                changed = True
+        if changed:
+            self.save()
+
+    def years_using_current_profile(self, years) -> list:
+        return [year for year in years if str(year) not in self.profiles]
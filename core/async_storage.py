@@ -0,0 +1,93 @@
+import asyncio
+import functools
+
+from core.storage_service import StorageService
+
+# Calls in flight per database; the rest wait on a semaphore, not in the executor
+MAX_CONCURRENCY = 4
+
+# StorageManager methods exposed as coroutines
+READ_METHODS = (
+    # summaries
+    "get_quarter_summary", "get_annual_summary", "get_year_gross_income",
+    "get_monthly_totals", "get_income_summary", "get_expense_summary",
+    # pages
+    "get_income_page", "count_income", "get_expense_page", "count_expense",
+    "get_records_between",
+    # lookups
+    "get_income", "get_expense", "search_records", "get_record_position",
+    "get_years", "get_record_years",
+)
+WRITE_METHODS = (
+    "bulk_add_income", "bulk_add_expense",
+    "add_income", "add_expense", "update_income", "update_expense",
+    "delete_income", "delete_expense",
+)
+
+
+class AsyncStorage:
+    """
+    StorageManager calls as coroutines, on a StorageService: reads on its
+    read-only connections, writes group-committed by its writer. Pass one
+    shared ThreadPoolExecutor to bound the threads across many databases.
+    """
+
+    def __init__(self, db_file, max_concurrency=MAX_CONCURRENCY, executor=None, instrument=None):
+        self.db_file = db_file
+        self.service = None     # built by open()
+        self._executor = executor
+        self._options = {"readers": max_concurrency, "executor": executor, "instrument": instrument}
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self._opening = asyncio.Lock()
+
+    async def open(self):
+        """
+        Builds the StorageService on a worker thread. It leaves the file as it
+        is (no DDL, journal mode unchanged) until the first write.
+        """
+        async with self._opening:
+            if self.service is None:
+                self.service = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, functools.partial(StorageService, self.db_file, wal=False, **self._options)
+                )
+        return self.service
+
+    async def read(self, fn, *args, **kwargs):
+        """Awaits fn(storage, *args) (or storage.<fn>(*args)) on a read connection."""
+        service = self.service or await self.open()
+        async with self._limit:
+            return await asyncio.wrap_future(service.read(fn, *args, **kwargs))
+
+    async def write(self, fn, *args, **kwargs):
+        """Awaits fn(storage, *args) (or storage.<fn>(*args)) on the writer thread, once committed."""
+        service = self.service or await self.open()
+        async with self._limit:
+            return await asyncio.wrap_future(service.write(fn, *args, **kwargs))
+
+    async def close(self):
+        # Waits for queued writes without holding up the loop
+        if self.service is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.service.close)
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _delegate(name, call):
+    async def method(self, *args, **kwargs):
+        return await call(self, name, *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = f"Awaitable StorageManager.{name}."
+    return method
+
+
+for _name in READ_METHODS:
+    setattr(AsyncStorage, _name, _delegate(_name, AsyncStorage.read))
+for _name in WRITE_METHODS:
+    setattr(AsyncStorage, _name, _delegate(_name, AsyncStorage.write))
+del _name
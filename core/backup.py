@@ -1,15 +1,39 @@
 import csv
+import functools
 import os
+import time
+from collections import deque
 from datetime import datetime
 from core.paths import BACKUP_DIR
 
+# This session's backup runs, oldest first; shown in About > Diagnostics
+RECENT_BACKUPS = deque(maxlen=50)
 
-def ensure_backup_dir():
-    os.makedirs(BACKUP_DIR, exist_ok=True)
 
+def timed_backup(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            RECENT_BACKUPS.append({
+                "name": fn.__name__,
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "seconds": time.perf_counter() - started,
+            })
+    return wrapper
 
-def backup_income(storage):
-    ensure_backup_dir()
+
+def ensure_backup_dir(backup_dir=None):
+    backup_dir = backup_dir or BACKUP_DIR
+    os.makedirs(backup_dir, exist_ok=True)
+    return backup_dir
+
+
+@timed_backup
+def backup_income(storage, backup_dir=None):
+    backup_dir = ensure_backup_dir(backup_dir)
 
     incomes = storage.get_all_income()
     grouped = {}
@@ -19,14 +43,14 @@ def backup_income(storage):
         grouped.setdefault(year, []).append(inc)
 
     # Make sure all years in backups are updated
-    existing_files = [f for f in os.listdir(BACKUP_DIR) if f.endswith("_income.csv")]
+    existing_files = [f for f in os.listdir(backup_dir) if f.endswith("_income.csv")]
     years_in_files = [f.split("_")[0] for f in existing_files]
 
     all_years = set(list(grouped.keys()) + years_in_files)
 
     for year in all_years:
         rows = grouped.get(year, [])  # will be empty if no records
-        path = os.path.join(BACKUP_DIR, f"{year}_income.csv")
+        path = os.path.join(backup_dir, f"{year}_income.csv")
 
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
@@ -46,8 +70,9 @@ def backup_income(storage):
                 ])
 
 
-def backup_expense(storage):
-    ensure_backup_dir()
+@timed_backup
+def backup_expense(storage, backup_dir=None):
+    backup_dir = ensure_backup_dir(backup_dir)
 
     expenses = storage.get_all_expense()
     grouped = {}
@@ -57,14 +82,14 @@ def backup_expense(storage):
         grouped.setdefault(year, []).append(exp)
 
     # Make sure all years in backups are updated
-    existing_files = [f for f in os.listdir(BACKUP_DIR) if f.endswith("_expense.csv")]
+    existing_files = [f for f in os.listdir(backup_dir) if f.endswith("_expense.csv")]
     years_in_files = [f.split("_")[0] for f in existing_files]
 
     all_years = set(list(grouped.keys()) + years_in_files)
 
     for year in all_years:
         rows = grouped.get(year, [])  # empty if no records for that year
-        path = os.path.join(BACKUP_DIR, f"{year}_expense.csv")
+        path = os.path.join(backup_dir, f"{year}_expense.csv")
 
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
@@ -87,8 +112,9 @@ def backup_expense(storage):
 TAX_EXEMPTION = 250_000
 
 
-def backup_summary(storage, app_state, year: int):
-    ensure_backup_dir()
+@timed_backup
+def backup_summary(storage, app_state, year: int, backup_dir=None):
+    backup_dir = ensure_backup_dir(backup_dir)
 
     summary = storage.get_annual_summary(year)
 
@@ -97,11 +123,13 @@ def backup_summary(storage, app_state, year: int):
     gross_expense = summary["gross_expense"]
     expense_wt = summary["wt"]
 
-    tax_type = app_state.tax_type
-    deduction_type = app_state.deduction_type
+    # The election in force for that year, not necessarily today's
+    profile = app_state.profile_for(year)
+    tax_type = profile.tax_type
+    deduction_type = profile.deduction_type
 
     # ================= TAX COMPUTATION =================
-    earner_type = app_state.earner_type
+    earner_type = profile.earner_type
 
     if tax_type == "8_percent":
         if earner_type == "mixed":
@@ -135,7 +163,7 @@ def backup_summary(storage, app_state, year: int):
 
         percentage_tax = gross_income * 0.03
 
-    filepath = os.path.join(BACKUP_DIR, f"{year}_summary.csv")
+    filepath = os.path.join(backup_dir, f"{year}_summary.csv")
 
     with open(filepath, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
@@ -0,0 +1,202 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from core.storage import StorageManager, QUARTER_MONTHS
+from core.storage_service import read_only_uri
+from core.app_state import AppState
+from core.tax import income_tax, percentage_tax, quarterly_income_tax
+
+REPORT_COLUMNS = [
+    "client", "year", "period", "tax_type", "deduction_type",
+    "gross_income", "gross_expense", "cwt", "expense_wt",
+    "taxable_income", "income_tax_due", "income_tax_payable", "percentage_tax",
+]
+# Written with two decimals; empty sums come back from SQLite as the integer 0
+MONEY_COLUMNS = REPORT_COLUMNS[REPORT_COLUMNS.index("gross_income"):]
+
+
+# ================== PER-CLIENT WORK ==================
+def client_report(job):
+    """
+    Runs in a worker process. job = (client name, db path, state path, year).
+    Returns (rows, seconds). Income tax on quarterly rows is the 1701Q
+    figure (core.tax.quarterly_income_tax); Q4 income tax is settled on the
+    annual return, so only its 2551Q figure is filled in.
+    """
+    name, db_path, state_path, year = job
+    started = time.perf_counter()
+
+    # Read-only and without schema setup: a report never changes the books
+    storage = StorageManager(db_path=read_only_uri(db_path), schema=False)
+    app_state = AppState(state_file=state_path)
+    app_state.load()
+    profile = app_state.profile_for(year)
+
+    rows = []
+    try:
+        summaries = [storage.get_quarter_summary(year, quarter) for quarter in QUARTER_MONTHS]
+        filings = quarterly_income_tax(summaries, profile.tax_type, profile.earner_type, profile.deduction_type)
+        for quarter, summary, filing in zip(QUARTER_MONTHS, summaries, filings):
+            rows.append({
+                "client": name,
+                "year": year,
+                "period": quarter,
+                "tax_type": profile.tax_type,
+                "deduction_type": profile.deduction_type or "",
+                "gross_income": summary["gross_income"],
+                "gross_expense": summary["gross_expense"],
+                "cwt": summary["cwt"],
+                "expense_wt": summary["wt"],
+                "taxable_income": filing["taxable"],
+                "income_tax_due": filing["tax_due"],
+                "income_tax_payable": None if quarter == "Q4" else filing["payable"],
+                "percentage_tax": percentage_tax(summary["gross_income"], profile.tax_type),
+            })
+
+        annual = storage.get_annual_summary(year)
+        tax = income_tax(
+            annual["gross_income"], annual["gross_expense"],
+            profile.tax_type, profile.earner_type, profile.deduction_type
+        )
+        rows.append({
+            "client": name,
+            "year": year,
+            "period": "Annual",
+            "tax_type": profile.tax_type,
+            "deduction_type": profile.deduction_type or "",
+            "gross_income": annual["gross_income"],
+            "gross_expense": annual["gross_expense"],
+            "cwt": annual["cwt"],
+            "expense_wt": annual["wt"],
+            "taxable_income": tax["taxable"],
+            "income_tax_due": tax["tax_due"],
+            "income_tax_payable": max(0.0, tax["tax_due"] - filings[-1]["prior_payable"] - annual["cwt"]),
+            "percentage_tax": percentage_tax(annual["gross_income"], profile.tax_type),
+        })
+    finally:
+        storage.conn.close()
+
+    return rows, time.perf_counter() - started
+
+
+# ================== JOBS ==================
+def jobs_from_dirs(dirs, year):
+    """A client folder holds records.db and app_state.json; its name is the folder name."""
+    jobs = []
+    for folder in dirs:
+        db_path = os.path.join(folder, "records.db")
+        if not os.path.exists(db_path):
+            print(f"Skipping {folder}: no records.db", file=sys.stderr)
+            continue
+        name = os.path.basename(os.path.normpath(folder))
+        jobs.append((name, db_path, os.path.join(folder, "app_state.json"), year))
+    return jobs
+
+
+def jobs_from_registry(year):
+    from core.clients import ClientRegistry
+
+    registry = ClientRegistry()
+    jobs = []
+    for slug, entry in registry.list_clients():
+        paths = registry.paths(slug)
+        if os.path.exists(paths["db"]):
+            jobs.append((entry["name"], paths["db"], paths["state"], year))
+    return jobs
+
+
+def run(jobs, workers=None):
+    """Returns (rows, timing). Clients are spread over `workers` processes (default: CPU count)."""
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    rows, client_seconds = [], []
+    if workers == 1:
+        results = map(client_report, jobs)
+        for client_rows, seconds in results:
+            rows.extend(client_rows)
+            client_seconds.append(seconds)
+    else:
+        # Several clients per task keeps process round-trips small next to the work
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for client_rows, seconds in pool.map(client_report, jobs, chunksize=chunksize):
+                rows.extend(client_rows)
+                client_seconds.append(seconds)
+
+    wall = time.perf_counter() - started
+    timing = {
+        "clients": len(jobs),
+        "workers": workers,
+        "wall_seconds": round(wall, 4),
+        "client_seconds_total": round(sum(client_seconds), 4),
+        "client_seconds_max": round(max(client_seconds, default=0.0), 4),
+        "clients_per_second": round(len(jobs) / wall, 2) if wall > 0 else None,
+    }
+    return rows, timing
+
+
+# ================== OUTPUT ==================
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({
+                key: "" if value is None else f"{value:.2f}" if key in MONEY_COLUMNS else value
+                for key, value in row.items()
+            })
+
+
+def write_json(path, rows, timing):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.now().isoformat(),
+            "timing": timing,
+            "rows": rows,
+        }, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Quarterly (1701Q / 2551Q) and annual tax figures for many clients, "
+                    "computed in worker processes into one CSV and/or JSON file."
+    )
+    parser.add_argument("dirs", nargs="*", help="client data folders (each with records.db)")
+    parser.add_argument("--all-clients", action="store_true", help="every client in data/clients/index.json")
+    parser.add_argument("--year", type=int, default=datetime.now().year)
+    parser.add_argument("--out", default=None, help="output path without extension (default: report_<year>)")
+    parser.add_argument("--format", choices=["csv", "json", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    jobs = jobs_from_dirs(args.dirs, args.year)
+    if args.all_clients:
+        jobs += jobs_from_registry(args.year)
+    if not jobs:
+        parser.error("no client databases found; pass client folders or --all-clients")
+
+    rows, timing = run(jobs, args.workers)
+
+    out = args.out or f"report_{args.year}"
+    if args.format in ("csv", "both"):
+        write_csv(out + ".csv", rows)
+    if args.format in ("json", "both"):
+        write_json(out + ".json", rows, timing)
+
+    print(
+        f"{timing['clients']} client(s) on {timing['workers']} worker(s) in {timing['wall_seconds']:.2f}s "
+        f"({timing['clients_per_second']} clients/s; slowest client {timing['client_seconds_max']:.3f}s)",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
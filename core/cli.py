@@ -0,0 +1,382 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# core modules only: no tkinter, so the CLI runs without a display
+from core.paths import DATA_DIR, BACKUP_DIR
+from core.storage import StorageManager, QUARTER_MONTHS, default_db_path
+from core.app_state import AppState, STATE_FILE
+from core.journal import UndoJournal
+from core.tax import income_tax, percentage_tax, quarterly_income_tax
+from core.backup import backup_income, backup_expense, backup_summary
+
+RECORD_FIELDS = {
+    "income": ("gross_income", "cwt", "income_received"),
+    "expense": ("gross_expense", "wt", "expense_paid"),
+}
+
+
+# ================== CONTEXT ==================
+def resolve_paths(args):
+    """(db, state file, backup dir) for --client, --data-dir or the default data folder; --db overrides the db."""
+    db_path, state_file, backup_dir = default_paths(args)
+    return args.db or db_path, state_file, backup_dir
+
+
+def default_paths(args):
+    if args.client:
+        from core.clients import ClientRegistry
+
+        registry = ClientRegistry()
+        if args.client not in registry.index["clients"]:
+            raise SystemExit(f"Unknown client '{args.client}'")
+        paths = registry.paths(args.client)
+        return paths["db"], paths["state"], paths["backup_dir"]
+
+    if args.data_dir:
+        return (
+            os.path.join(args.data_dir, "records.db"),
+            os.path.join(args.data_dir, "app_state.json"),
+            os.path.join(args.data_dir, "backups"),
+        )
+
+    return default_db_path(), STATE_FILE, BACKUP_DIR
+
+
+def open_books(args, instrument=None):
+    db_path, state_file, backup_dir = resolve_paths(args)
+    storage = StorageManager(db_path=db_path, instrument=instrument)
+    app_state = AppState(state_file=state_file)
+    app_state.load()
+    return storage, app_state, backup_dir
+
+
+# ================== COMMANDS ==================
+def cmd_add(args):
+    from core.importer import parse_date
+
+    storage, _, _ = open_books(args)
+    gross_field, tax_field, net_field = RECORD_FIELDS[args.type]
+
+    try:
+        record_date = parse_date(args.date)
+    except ValueError:
+        raise SystemExit(f"Invalid date '{args.date}' (use YYYY-MM-DD)")
+    if args.gross <= 0:
+        raise SystemExit("Gross amount must be greater than 0")
+    if not 0 <= args.tax <= args.gross:
+        raise SystemExit("Withholding tax must be between 0 and the gross amount")
+
+    data = {
+        "date": record_date,
+        gross_field: args.gross,
+        "description": args.description,
+        tax_field: args.tax,
+        "atc": args.atc,
+        net_field: args.net if args.net is not None else args.gross - args.tax,
+    }
+    if args.type == "income":
+        record_id = storage.add_income(data)
+    else:
+        record_id = storage.add_expense(data)
+
+    # Undoable from the app like any other entry
+    UndoJournal(storage).record(args.type, "add", record_id)
+    print(f"Added {args.type} #{record_id}")
+    return 0
+
+
+def cmd_import(args):
+    from core.importer import ImportJob, CsvImportError
+
+    storage, _, _ = open_books(args)
+    job = ImportJob(storage, args.file, args.type, journal=UndoJournal(storage),
+                    skip_duplicates=not args.keep_duplicates)
+
+    def progress(job):
+        if not args.quiet:
+            print(f"\r{job.progress:6.1%}  imported {job.inserted:,}", end="", file=sys.stderr)
+
+    try:
+        job.run(progress=progress)
+    except (CsvImportError, OSError, UnicodeDecodeError) as e:
+        raise SystemExit(f"Import failed, nothing was saved: {e}")
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Imported {job.inserted:,} {args.type} record(s); "
+          f"skipped {job.duplicates:,} duplicate(s) and {len(job.errors):,} invalid line(s)")
+    for line_no, message in job.errors[:20]:
+        print(f"  line {line_no}: {message}", file=sys.stderr)
+    return 0 if not job.errors else 2
+
+
+def quarters_through(quarter=None):
+    """Q1 up to `quarter`, or the whole year."""
+    names = list(QUARTER_MONTHS)
+    return names[:names.index(quarter) + 1] if quarter else names
+
+
+def summarize(storage, app_state, year, quarter=None):
+    annual = storage.get_annual_summary(year)
+    quarters = [storage.get_quarter_summary(year, name) for name in quarters_through(quarter)]
+    return tax_figures(app_state.profile_for(year), year, annual, quarters, quarter)
+
+
+async def summarize_async(books, app_state, year, quarter=None):
+    """summarize() over a core.async_storage.AsyncStorage, all queries at once."""
+    annual, *quarters = await asyncio.gather(
+        books.get_annual_summary(year),
+        *(books.get_quarter_summary(year, name) for name in quarters_through(quarter)),
+    )
+    return tax_figures(app_state.profile_for(year), year, annual, quarters, quarter)
+
+
+def tax_figures(profile, year, annual, quarters, quarter=None):
+    """
+    `quarters` are the quarter summaries from Q1 through `quarter` (all four
+    for the year). Payables are net of CWT and of the 1701Q payments before.
+    """
+    tax = income_tax(annual["gross_income"], annual["gross_expense"],
+                     profile.tax_type, profile.earner_type, profile.deduction_type)
+    filings = quarterly_income_tax(quarters, profile.tax_type, profile.earner_type, profile.deduction_type)
+
+    result = {
+        "year": year,
+        "tax_type": profile.tax_type,
+        "deduction_type": profile.deduction_type,
+        "gross_income_ytd": annual["gross_income"],
+        "gross_expense_ytd": annual["gross_expense"],
+        "cwt_ytd": annual["cwt"],
+        "expense_wt_ytd": annual["wt"],
+        "taxable_income": tax["taxable"],
+        "income_tax_due": tax["tax_due"],
+        "income_tax_payable": max(0.0, tax["tax_due"] - filings[-1]["prior_payable"] - annual["cwt"]),
+        "percentage_tax": percentage_tax(annual["gross_income"], profile.tax_type),
+    }
+
+    if quarter:
+        summary, filing = quarters[-1], filings[-1]
+        result.update({
+            "quarter": quarter,
+            "gross_income_quarter": summary["gross_income"],
+            "gross_expense_quarter": summary["gross_expense"],
+            "cwt_quarter": summary["cwt"],
+            "taxable_income": filing["taxable"],
+            "income_tax_due": filing["tax_due"],
+            "income_tax_paid_prior": filing["prior_payable"],
+            "income_tax_payable": filing["payable"],
+            "percentage_tax": percentage_tax(summary["gross_income"], profile.tax_type),
+        })
+    return result
+
+
+def cmd_summary(args):
+    if args.all_clients:
+        return asyncio.run(summary_all_clients(args))
+
+    storage, app_state, _ = open_books(args)
+    if not app_state.is_configured:
+        print("Note: no tax profile set up for these books; using graduated rates with itemized deductions.",
+              file=sys.stderr)
+    result = summarize(storage, app_state, args.year, args.quarter)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    width = max(len(key) for key in result)
+    for key, value in result.items():
+        text = f"{value:,.2f}" if isinstance(value, float) else value
+        print(f"{key.replace('_', ' '):<{width}}  {text}")
+    return 0
+
+
+async def summary_all_clients(args):
+    """Every registered client's figures, queried concurrently on one event loop."""
+    from concurrent.futures import ThreadPoolExecutor
+    from core.async_storage import AsyncStorage
+    from core.clients import ClientRegistry
+
+    registry = ClientRegistry(default_db=args.db)
+    executor = ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix="summary")
+
+    async def client_summary(slug):
+        paths = registry.paths(slug)
+        if not os.path.exists(paths["db"]):
+            return None  # never opened, so nothing recorded
+        async with AsyncStorage(paths["db"], max_concurrency=args.jobs, executor=executor) as books:
+            return await summarize_async(books, registry.load_state(slug), args.year, args.quarter)
+
+    slugs = [slug for slug, _ in registry.list_clients()]
+    try:
+        results = dict(zip(slugs, await asyncio.gather(*(client_summary(slug) for slug in slugs))))
+    finally:
+        executor.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    columns = ("gross_income_ytd", "gross_expense_ytd", "income_tax_payable", "percentage_tax")
+    width = max(len(registry.name(slug)) for slug in slugs)
+    print(f"{'client':<{width}}" + "".join(f"{name.replace('_', ' '):>22}" for name in columns))
+    for slug, result in results.items():
+        figures = "".join(f"{result[name]:>22,.2f}" for name in columns) if result else f"{'(no records)':>22}"
+        print(f"{registry.name(slug):<{width}}" + figures)
+    return 0
+
+
+def cmd_backup(args):
+    storage, app_state, backup_dir = open_books(args)
+    backup_income(storage, backup_dir)
+    backup_expense(storage, backup_dir)
+    years = args.year or storage.get_record_years() or [datetime.now().year]
+    for year in years:
+        backup_summary(storage, app_state, year, backup_dir)
+    print(f"Backed up to {backup_dir}")
+    return 0
+
+
+def cmd_restore(args):
+    """
+    Re-imports backup CSVs (the backup columns are import aliases) under
+    their original ids. Ids already in the database are skipped, so
+    restoring twice is harmless; nothing else is treated as a duplicate,
+    since the backup is the books as they were.
+    """
+    from core.importer import ImportJob, CsvImportError
+
+    storage, _, backup_dir = open_books(args)
+    files = args.files or sorted(
+        glob.glob(os.path.join(backup_dir, "*_income.csv")) + glob.glob(os.path.join(backup_dir, "*_expense.csv"))
+    )
+    if not files:
+        raise SystemExit(f"No backup files found in {backup_dir}")
+
+    journal = UndoJournal(storage)
+    status = 0
+    restored = 0
+    for path in files:
+        name = os.path.basename(path)
+        if name.endswith("_income.csv"):
+            record_type = "income"
+        elif name.endswith("_expense.csv"):
+            record_type = "expense"
+        else:
+            print(f"Skipping {name}: not an income or expense backup", file=sys.stderr)
+            continue
+
+        try:
+            job = ImportJob(storage, path, record_type, journal=journal, skip_duplicates=False, keep_ids=True).run()
+        except (CsvImportError, OSError, UnicodeDecodeError) as e:
+            print(f"{name}: failed, nothing restored ({e})", file=sys.stderr)
+            status = 1
+            continue
+        restored += job.inserted
+        print(f"{name}: restored {job.inserted:,}, already present {job.duplicates:,}, invalid {len(job.errors):,}")
+        for line_no, message in job.errors[:20]:
+            print(f"  line {line_no}: {message}", file=sys.stderr)
+        if job.errors:
+            status = 1
+
+    print(f"Restored {restored:,} record(s); the books now hold "
+          f"{storage.count_income():,} income and {storage.count_expense():,} expense record(s)")
+    return status
+
+
+def cmd_bench(args):
+    """Times the operations the app runs after every change, on the selected books."""
+    storage, app_state, _ = open_books(args, instrument=args.queries or None)
+    year = args.year or datetime.now().year
+
+    with tempfile.TemporaryDirectory() as scratch:
+        cases = [
+            ("get_all_income", lambda: storage.get_all_income()),
+            ("get_all_expense", lambda: storage.get_all_expense()),
+            ("get_annual_summary", lambda: storage.get_annual_summary(year)),
+            ("get_quarter_summary x4", lambda: [storage.get_quarter_summary(year, q) for q in QUARTER_MONTHS]),
+            ("summary (with tax)", lambda: summarize(storage, app_state, year)),
+            ("backup_income", lambda: backup_income(storage, scratch)),
+            ("backup_expense", lambda: backup_expense(storage, scratch)),
+            ("backup_summary", lambda: backup_summary(storage, app_state, year, scratch)),
+        ]
+
+        print(f"{'operation':<26}{'best ms':>10}{'mean ms':>10}")
+        for name, fn in cases:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{name:<26}{min(timings):>10.2f}{sum(timings) / len(timings):>10.2f}")
+
+    if storage.query_stats:
+        print()
+        print(storage.query_stats.format_report())
+    return 0
+
+
+# ================== ENTRY POINT ==================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="Non-VAT tax tracker, headless.")
+    parser.add_argument("--data-dir", help=f"data folder to use (default: {DATA_DIR})")
+    parser.add_argument("--client", help="client slug from the multi-client registry")
+    parser.add_argument("--db", help="database file or file: URI to use instead")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="add one income or expense record")
+    add.add_argument("type", choices=["income", "expense"])
+    add.add_argument("--date", required=True, help="YYYY-MM-DD")
+    add.add_argument("--gross", type=float, required=True)
+    add.add_argument("--tax", type=float, default=0.0, help="CWT (income) or WT (expense)")
+    add.add_argument("--net", type=float, default=None, help="amount received/paid (default: gross - tax)")
+    add.add_argument("--description", default="")
+    add.add_argument("--atc", default="")
+    add.set_defaults(func=cmd_add)
+
+    imp = sub.add_parser("import", help="import records from a CSV file")
+    imp.add_argument("type", choices=["income", "expense"])
+    imp.add_argument("file")
+    imp.add_argument("--keep-duplicates", action="store_true", help="import rows that look already recorded")
+    imp.add_argument("--quiet", action="store_true")
+    imp.set_defaults(func=cmd_import)
+
+    summary = sub.add_parser("summary", help="income tax and percentage tax figures")
+    summary.add_argument("--year", type=int, default=datetime.now().year)
+    summary.add_argument("--quarter", choices=list(QUARTER_MONTHS))
+    summary.add_argument("--json", action="store_true")
+    summary.add_argument("--all-clients", action="store_true", help="one line per client in the registry")
+    summary.add_argument("--jobs", type=int, default=4, help="databases queried at once with --all-clients")
+    summary.set_defaults(func=cmd_summary)
+
+    backup = sub.add_parser("backup", help="write the CSV backups")
+    backup.add_argument("--year", type=int, action="append", help="summary year(s) (default: every year on record)")
+    backup.set_defaults(func=cmd_backup)
+
+    restore = sub.add_parser("restore", help="restore records from backup CSVs")
+    restore.add_argument("files", nargs="*", help="backup files (default: every income/expense backup)")
+    restore.set_defaults(func=cmd_restore)
+
+    bench = sub.add_parser("bench", help="time the core operations on these books")
+    bench.add_argument("--year", type=int)
+    bench.add_argument("--repeat", type=int, default=5)
+    bench.add_argument("--queries", action="store_true", help="also time each SQL statement")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import json
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+from core.paths import DATA_DIR, BACKUP_DIR
+from core.storage import StorageManager, default_db_path
+from core.app_state import AppState, STATE_FILE
+
+CLIENTS_DIR = os.path.join(DATA_DIR, "clients")
+INDEX_FILE = os.path.join(CLIENTS_DIR, "index.json")
+
+# The books that existed before multi-client mode stay where they were
+DEFAULT_CLIENT = "default"
+
+# Client databases kept open at once
+MAX_OPEN_CLIENTS = 8
+
+
+def slugify(name: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", name.strip().lower()).strip("-")
+    return slug or "client"
+
+
+# ================== CLIENT REGISTRY ==================
+class ClientRegistry:
+    """
+    One folder per client under data/clients/<slug>/ with its own
+    records.db, app_state.json and backups. index.json lists the clients
+    with a cached summary (this year's income/expense totals), so the
+    client list never opens a database however many clients there are.
+    default_db replaces the default client's database (--db).
+    """
+
+    def __init__(self, index_file=INDEX_FILE, default_db=None):
+        self.index_file = index_file
+        self.default_db = default_db
+        self.clients_dir = os.path.dirname(index_file)
+        self.index = {"active": DEFAULT_CLIENT, "clients": {}}
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.index_file):
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+        self.index["clients"].setdefault(DEFAULT_CLIENT, {
+            "name": "My Books",
+            "created_at": datetime.now().isoformat(),
+            "summary": None,
+        })
+        if self.index.get("active") not in self.index["clients"]:
+            self.index["active"] = DEFAULT_CLIENT
+
+    def save(self):
+        os.makedirs(self.clients_dir, exist_ok=True)
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=4)
+        os.replace(tmp, self.index_file)
+
+    # ================== CLIENTS ==================
+    @property
+    def active(self):
+        return self.index.get("active", DEFAULT_CLIENT)
+
+    def set_active(self, slug):
+        self.index["active"] = slug
+        self.index["clients"][slug]["last_opened"] = datetime.now().isoformat()
+        self.save()
+
+    def list_clients(self):
+        """[(slug, entry)] sorted by name; entry has name, last_opened and the cached summary."""
+        return sorted(self.index["clients"].items(), key=lambda item: item[1]["name"].lower())
+
+    def add_client(self, name: str) -> str:
+        base = slugify(name)
+        slug, n = base, 2
+        while slug in self.index["clients"]:
+            slug, n = f"{base}-{n}", n + 1
+
+        self.index["clients"][slug] = {
+            "name": name.strip(),
+            "created_at": datetime.now().isoformat(),
+            "summary": None,
+        }
+        os.makedirs(self.paths(slug)["backup_dir"], exist_ok=True)
+        self.save()
+        return slug
+
+    def name(self, slug):
+        return self.index["clients"][slug]["name"]
+
+    def paths(self, slug):
+        if slug == DEFAULT_CLIENT:
+            return {"db": self.default_db or default_db_path(), "state": STATE_FILE, "backup_dir": BACKUP_DIR}
+        folder = os.path.join(self.clients_dir, slug)
+        return {
+            "db": os.path.join(folder, "records.db"),
+            "state": os.path.join(folder, "app_state.json"),
+            "backup_dir": os.path.join(folder, "backups"),
+        }
+
+    def load_state(self, slug) -> AppState:
+        app_state = AppState(state_file=self.paths(slug)["state"])
+        app_state.load()
+        return app_state
+
+    # ================== CACHED SUMMARIES ==================
+    def update_summary(self, slug, storage, year=None):
+        """Cache a client's year totals in the index (called when leaving a client)."""
+        year = year or datetime.now().year
+        summary = storage.get_annual_summary(year)
+        self.index["clients"][slug]["summary"] = {
+            "year": year,
+            "gross_income": summary["gross_income"],
+            "gross_expense": summary["gross_expense"],
+            "updated_at": datetime.now().isoformat(),
+        }
+        self.save()
+
+
+# ================== CONNECTION POOL ==================
+class StoragePool:
+    """
+    Opens client databases on demand and keeps the most recently used
+    MAX_OPEN_CLIENTS open, so switching back and forth reuses the
+    connection (and SQLite's page cache) instead of reopening the file.
+    """
+
+    def __init__(self, registry, max_open=MAX_OPEN_CLIENTS):
+        self.registry = registry
+        self.max_open = max_open
+        self.open = OrderedDict()  # slug -> StorageManager
+
+    def get(self, slug) -> StorageManager:
+        storage = self.open.get(slug)
+        if storage is not None:
+            self.open.move_to_end(slug)
+            return storage
+
+        storage = StorageManager(db_path=self.registry.paths(slug)["db"])
+        self.open[slug] = storage
+        while len(self.open) > self.max_open:
+            _, oldest = self.open.popitem(last=False)
+            oldest.conn.close()
+        return storage
+
+    def close_all(self):
+        while self.open:
+            _, storage = self.open.popitem()
+            storage.conn.close()
@@ -0,0 +1,159 @@
+import os
+import re
+import sqlite3
+import time
+
+from core.instrumentation import SLOW_QUERY_LOG
+from core.backup import RECENT_BACKUPS
+
+# Rotated slow-query logs read when looking for the last N entries
+SLOW_LOG_FILES = 2
+
+_SLOW_ENTRY = re.compile(r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\d+ ([\d.]+) ms, (\d+) row\(s\): (.*)$")
+
+
+# ================== SIZES ==================
+def file_info(storage):
+    def size(path):
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    pragma = lambda name: storage.conn.execute(f"PRAGMA {name}").fetchone()[0]
+    page_size = pragma("page_size")
+    db_file = storage.db_file or ""  # in-memory databases have no file
+    return {
+        "path": storage.db_file or storage.db_path,
+        "db_bytes": size(db_file),
+        "wal_bytes": size(db_file + "-wal"),
+        "shm_bytes": size(db_file + "-shm"),
+        "page_size": page_size,
+        "page_count": pragma("page_count"),
+        "free_pages": pragma("freelist_count"),
+        "journal_mode": pragma("journal_mode"),
+        "auto_vacuum": {0: "none", 1: "full", 2: "incremental"}.get(pragma("auto_vacuum"), "?"),
+        "analyzed": bool(storage.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()),
+    }
+
+
+def cache_info(storage, info=None):
+    """Configured page cache and the share of the database it can hold.
+
+    Python's sqlite3 has no access to the page-cache hit counters, so this
+    is the closest figure.
+    """
+    info = info or file_info(storage)
+    cache_size = storage.conn.execute("PRAGMA cache_size").fetchone()[0]
+    # Negative cache_size is in KiB, positive in pages
+    cache_bytes = -cache_size * 1024 if cache_size < 0 else cache_size * info["page_size"]
+    db_bytes = info["page_count"] * info["page_size"]
+    return {
+        "cache_bytes": cache_bytes,
+        "coverage": min(1.0, cache_bytes / db_bytes) if db_bytes else 1.0,
+    }
+
+
+# ================== ROWS ==================
+def table_counts(storage):
+    """[(table, rows)] for the app's tables (not SQLite's or the search index internals)."""
+    tables = [row[0] for row in storage.conn.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table'
+          AND name NOT LIKE 'sqlite_%'
+          AND name NOT LIKE '%_fts_%'
+          AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'
+        ORDER BY name
+    """).fetchall()]
+    return [(table, storage.conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]) for table in tables]
+
+
+def year_counts(storage):
+    """[(year, income rows, expense rows)], newest first; counted per year on the date index."""
+    return [
+        (year, storage.count_income(year=year), storage.count_expense(year=year))
+        for year in storage.get_record_years()
+    ]
+
+
+def index_list(storage):
+    """[{table, name, columns, unique, origin}] for income/expense and the app's other tables."""
+    indexes = []
+    for table, _ in table_counts(storage):
+        for row in storage.conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+            name, unique, origin = row[1], row[2], row[3]
+            columns = [
+                info[2] or "(expression)"
+                for info in storage.conn.execute(f'PRAGMA index_info("{name}")').fetchall()
+            ]
+            indexes.append({
+                "table": table,
+                "name": name,
+                "columns": ", ".join(columns),
+                "unique": bool(unique),
+                "origin": {"c": "CREATE INDEX", "u": "UNIQUE", "pk": "PRIMARY KEY"}.get(origin, origin),
+            })
+    return indexes
+
+
+# ================== SLOW QUERIES / BACKUPS ==================
+def slow_queries(limit=50, log_path=SLOW_QUERY_LOG):
+    """The last `limit` entries of the slow-query log, newest first: {at, ms, rows, sql, plan}."""
+    paths = [log_path] + [f"{log_path}.{n}" for n in range(1, SLOW_LOG_FILES)]
+    entries = []
+    for path in reversed(paths):  # oldest file first
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                match = _SLOW_ENTRY.match(line)
+                if match:
+                    entries.append({
+                        "at": match.group(1),
+                        "ms": float(match.group(2)),
+                        "rows": int(match.group(3)),
+                        "sql": match.group(4),
+                        "plan": [],
+                    })
+                elif entries and line.startswith("    plan: "):
+                    entries[-1]["plan"].append(line[len("    plan: "):])
+    return entries[::-1][:limit]
+
+
+def backup_timings():
+    """This session's backup runs, newest first."""
+    return list(reversed(RECENT_BACKUPS))
+
+
+# ================== MAINTENANCE ==================
+def run_maintenance(db_path, action):
+    """
+    Runs "analyze", "optimize" or "vacuum" on its own connection to the file
+    db_path, so it can be called from a worker thread. Returns
+    {action, seconds, bytes_before, bytes_after}.
+    VACUUM becomes incremental_vacuum when the database uses auto_vacuum=INCREMENTAL.
+    """
+    before = os.path.getsize(db_path)
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        if action == "analyze":
+            conn.execute("ANALYZE")
+        elif action == "optimize":
+            conn.execute("PRAGMA optimize")
+        elif action == "vacuum":
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                conn.execute("PRAGMA incremental_vacuum").fetchall()
+            else:
+                conn.execute("VACUUM")
+        else:
+            raise ValueError(f"Unknown maintenance action '{action}'")
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        "action": action,
+        "seconds": time.perf_counter() - started,
+        "bytes_before": before,
+        "bytes_after": os.path.getsize(db_path),
+    }
@@ -0,0 +1,50 @@
+import re
+import unicodedata
+from datetime import date, timedelta
+
+# How far apart two entries can be and still count as the same transaction
+DATE_WINDOW_DAYS = 3
+AMOUNT_TOLERANCE = 1.00  # pesos
+
+
+def normalize_description(text) -> str:
+    """'  Payment - ACME Corp. #123 ' -> 'payment acme corp 123'"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+class DuplicateDetector:
+    """
+    Finds entries that look like the same transaction: same normalized
+    description, gross amount within `amount_tolerance` and date within
+    `date_window_days`. Candidates come from a range query on the
+    (date, amount) index, so each check is O(log n) however big the ledger is.
+    """
+
+    def __init__(self, storage, date_window_days=DATE_WINDOW_DAYS, amount_tolerance=AMOUNT_TOLERANCE):
+        self.storage = storage
+        self.date_window_days = date_window_days
+        self.amount_tolerance = amount_tolerance
+
+    def find(self, record_type, record_date, amount, description, exclude_id=None, max_id=None):
+        """Returns the existing records (with id <= max_id if given) that match (empty list if none)."""
+        day = date.fromisoformat(record_date[:10])
+        window = timedelta(days=self.date_window_days)
+
+        candidates = self.storage.get_records_in_window(
+            record_type,
+            (day - window).isoformat(),
+            # include timestamps on the last day ("YYYY-MM-DD" < "YYYY-MM-DDT…")
+            (day + window).isoformat() + "~",
+            amount - self.amount_tolerance,
+            amount + self.amount_tolerance,
+            exclude_id=exclude_id,
+            max_id=max_id
+        )
+
+        key = normalize_description(description)
+        return [rec for rec in candidates if normalize_description(rec.get("description")) == key]
+
+    def is_duplicate(self, record_type, record_date, amount, description, exclude_id=None, max_id=None) -> bool:
+        return bool(self.find(record_type, record_date, amount, description, exclude_id, max_id))
@@ -0,0 +1,328 @@
+import csv
+import os
+import re
+from datetime import date
+from core.duplicates import DuplicateDetector, normalize_description
+
+# ================== COLUMN MAPPING ==================
+# Header names (case-insensitive) recognised for each field. The first entries
+# match the backup CSVs, so backups can be imported back as-is.
+COLUMN_ALIASES = {
+    "income": {
+        "date": ["date", "transaction date", "posting date", "value date"],
+        "gross_income": ["gross income", "gross", "amount", "credit", "deposit"],
+        "description": ["description", "particulars", "details", "memo", "narration", "payee"],
+        "cwt": ["cwt", "withholding tax", "tax withheld"],
+        "atc": ["atc", "atc code"],
+        "income_received": ["income received", "net", "net amount"],
+    },
+    "expense": {
+        "date": ["date", "transaction date", "posting date", "value date"],
+        "gross_expense": ["gross expense", "gross", "amount", "debit", "withdrawal"],
+        "description": ["description", "particulars", "details", "memo", "narration", "payee"],
+        "wt": ["wt", "withholding tax", "tax withheld"],
+        "atc": ["atc", "atc code"],
+        "expense_paid": ["expense paid", "net", "net amount"],
+    },
+}
+
+# (gross, withholding, net) field names per record type
+AMOUNT_FIELDS = {
+    "income": ("gross_income", "cwt", "income_received"),
+    "expense": ("gross_expense", "wt", "expense_paid"),
+}
+
+CHUNK_SIZE = 1000
+
+
+class CsvImportError(Exception):
+    """Raised when a file cannot be imported at all (e.g. no date/amount columns)."""
+
+
+# ================== PIPELINE STAGES ==================
+# Each stage takes and yields (line_no, record, error) tuples so a bad line is
+# reported and skipped without stopping the stream.
+
+def read_rows(path, progress=None):
+    """Stream CSV rows as dicts. `progress(fraction)` is updated as the file is read."""
+    total = os.path.getsize(path) or 1
+    consumed = 0
+
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+
+        def counted_lines():
+            nonlocal consumed
+            for line in f:
+                consumed += len(line)
+                yield line
+
+        reader = csv.DictReader(counted_lines(), dialect=dialect)
+        for row in reader:
+            if progress:
+                progress(min(1.0, consumed / total))
+            yield reader.line_num, row
+
+
+def resolve_columns(headers, record_type, mapping=None, with_id=False):
+    """
+    Returns {field: header} using `mapping` first, then the known aliases.
+    with_id also maps an "ID" column (the record id in backups).
+    """
+    by_name = {h.strip().lower(): h for h in headers if h}
+    resolved = {}
+
+    for field, aliases in COLUMN_ALIASES[record_type].items():
+        if mapping and mapping.get(field):
+            if mapping[field] not in headers:
+                raise CsvImportError(f"Column '{mapping[field]}' not found in file")
+            resolved[field] = mapping[field]
+            continue
+        for alias in aliases:
+            if alias in by_name:
+                resolved[field] = by_name[alias]
+                break
+    if with_id and "id" in by_name:
+        resolved["id"] = by_name["id"]
+
+    gross_field = AMOUNT_FIELDS[record_type][0]
+    for required in ("date", gross_field):
+        if required not in resolved:
+            raise CsvImportError(f"Could not find a '{required}' column. Columns found: {', '.join(headers)}")
+    return resolved
+
+
+def map_columns(rows, record_type, mapping=None, with_id=False):
+    columns = None
+    for line_no, row in rows:
+        if columns is None:
+            columns = resolve_columns(list(row.keys()), record_type, mapping, with_id)
+        yield line_no, {field: (row.get(header) or "").strip() for field, header in columns.items()}, None
+
+
+def parse_amount(value: str) -> float:
+    if not value:
+        return 0.0
+    text = re.sub(r"[₱$,\s]|PHP", "", value, flags=re.IGNORECASE)
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return float(text)
+
+
+def parse_date(value: str) -> str:
+    # fromisoformat also takes "20240115" and "2024-W03-1" (3.11+); the ledger's
+    # range queries compare strings, so store the YYYY-MM-DD form
+    return date.fromisoformat(value.strip()).isoformat()
+
+
+def validate(rows, record_type):
+    gross_field, tax_field, net_field = AMOUNT_FIELDS[record_type]
+
+    for line_no, rec, error in rows:
+        if error:
+            yield line_no, rec, error
+            continue
+
+        try:
+            record_date = parse_date(rec["date"])
+        except ValueError:
+            yield line_no, rec, f"Invalid date '{rec['date']}' (use YYYY-MM-DD)"
+            continue
+
+        try:
+            gross = parse_amount(rec.get(gross_field, ""))
+            tax = parse_amount(rec.get(tax_field, ""))
+            net = parse_amount(rec.get(net_field, "")) if rec.get(net_field) else gross - tax
+        except ValueError:
+            yield line_no, rec, "Amounts must be numbers"
+            continue
+
+        if gross <= 0:
+            yield line_no, rec, "Gross amount must be greater than 0"
+            continue
+        if tax < 0 or tax > gross:
+            yield line_no, rec, "Withholding tax must be between 0 and the gross amount"
+            continue
+
+        record = {
+            "date": record_date,
+            gross_field: gross,
+            "description": rec.get("description", ""),
+            tax_field: tax,
+            "atc": rec.get("atc", ""),
+            net_field: net,
+        }
+        if rec.get("id"):
+            try:
+                record["id"] = int(rec["id"])
+            except ValueError:
+                yield line_no, rec, f"Invalid id '{rec['id']}'"
+                continue
+        yield line_no, record, None
+
+
+def mark_duplicates(rows, storage, record_type, detector=None):
+    """
+    Flags records already in the ledger before the import (same fuzzy
+    date/amount window check as manual entry) and exact repeats of an earlier
+    line (same date, amount and description). Lines are never fuzzy-matched
+    against each other, so the result does not depend on the chunk size.
+    """
+    gross_field = AMOUNT_FIELDS[record_type][0]
+    detector = detector or DuplicateDetector(storage)
+    seen = set()
+    # Runs on the first next(), before any chunk is inserted; rows this import
+    # adds get higher ids and are left out of the ledger check
+    ledger_last_id = storage.get_last_id(record_type)
+
+    for line_no, rec, error in rows:
+        if error:
+            yield line_no, rec, error
+            continue
+
+        key = (rec["date"], rec[gross_field], normalize_description(rec["description"]))
+        if key in seen or detector.is_duplicate(
+            record_type, rec["date"], rec[gross_field], rec["description"], max_id=ledger_last_id
+        ):
+            yield line_no, rec, "duplicate"
+            continue
+
+        seen.add(key)
+        yield line_no, rec, None
+
+
+def chunked(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ================== IMPORT JOB ==================
+class ImportJob:
+    """
+    Streams a CSV through parse -> map columns -> validate -> duplicate check
+    -> chunked bulk insert. The whole import is one transaction (and one undo
+    step when a journal is given): cancelling rolls it back completely.
+
+    GUI callers call step() from the event loop (one chunk per call);
+    scripts call run().
+
+    keep_ids restores backups: rows with an ID keep it, and rows whose id is
+    already in use are counted as duplicates instead of inserted.
+    """
+
+    def __init__(self, storage, path, record_type, journal=None, mapping=None,
+                 skip_duplicates=True, chunk_size=CHUNK_SIZE, keep_ids=False):
+        self.storage = storage
+        self.record_type = record_type
+        self.journal = journal
+        self.skip_duplicates = skip_duplicates
+
+        self.progress = 0.0
+        self.inserted = 0
+        self.duplicates = 0
+        self.errors = []  # (line_no, message)
+        self.done = False
+        self.cancelled = False
+
+        stream = read_rows(path, progress=self._set_progress)
+        stream = map_columns(stream, record_type, mapping, with_id=keep_ids)
+        stream = validate(stream, record_type)
+        if skip_duplicates:
+            stream = mark_duplicates(stream, storage, record_type)
+        self.chunks = chunked(stream, chunk_size)
+        self.started = False
+
+    def _set_progress(self, fraction):
+        self.progress = fraction
+
+    def step(self) -> bool:
+        """Process one chunk. Returns True while there is more to do."""
+        if self.done:
+            return False
+
+        if not self.started:
+            self.started = True
+            if self.journal:
+                self.journal.begin_group()
+
+        try:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self._finish()
+                return False
+            self._insert(chunk)
+        except Exception:
+            # Whatever failed (bad file, database error), none of the import is kept
+            self._rollback()
+            raise
+        return True
+
+    def _insert(self, chunk):
+        records = []
+        for line_no, rec, error in chunk:
+            if error == "duplicate":
+                self.duplicates += 1
+            elif error:
+                self.errors.append((line_no, error))
+            else:
+                records.append(rec)
+
+        restored = [rec for rec in records if "id" in rec]
+        records = [rec for rec in records if "id" not in rec]
+
+        ids = []
+        if restored:
+            if self.record_type == "income":
+                ids += self.storage.bulk_restore_income(restored, commit=False)
+            else:
+                ids += self.storage.bulk_restore_expense(restored, commit=False)
+            self.duplicates += len(restored) - len(ids)
+        if records:
+            if self.record_type == "income":
+                ids += self.storage.bulk_add_income(records, commit=False)
+            else:
+                ids += self.storage.bulk_add_expense(records, commit=False)
+        if ids:
+            if self.journal:
+                self.journal.record_many(self.record_type, "add", [{"id": i} for i in ids])
+            self.inserted += len(ids)
+
+    def run(self, progress=None, should_cancel=None):
+        while self.step():
+            if progress:
+                progress(self)
+            if should_cancel and should_cancel():
+                self.cancel()
+                break
+        return self
+
+    def cancel(self):
+        if not self.done:
+            self._rollback()
+            self.cancelled = True
+
+    def _finish(self):
+        self.done = True
+        self.progress = 1.0
+        if self.journal:
+            self.journal.end_group()  # commits
+        else:
+            self.storage.conn.commit()
+
+    def _rollback(self):
+        self.done = True
+        self.storage.conn.rollback()
+        if self.journal:
+            self.journal.abort_group()
+        self.inserted = 0
@@ -0,0 +1,265 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from core.paths import DATA_DIR
+
+# Query timing is on with StorageManager(instrument=True) or this set to 1;
+# when off the connection is a plain sqlite3.Connection
+ENABLE_ENV = "TAX_TRACKER_QUERY_STATS"
+SLOW_MS_ENV = "TAX_TRACKER_SLOW_QUERY_MS"
+
+# Statements slower than the threshold, with their EXPLAIN QUERY PLAN
+SLOW_QUERY_LOG = os.path.join(DATA_DIR, "slow_queries.log")
+DEFAULT_SLOW_MS = 100.0
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+# Latencies kept per statement for the p95 (the most recent ones)
+SAMPLES_PER_STATEMENT = 1000
+
+# Only these have a query plan worth logging
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def enabled_from_env() -> bool:
+    return os.environ.get(ENABLE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def slow_ms_from_env() -> float:
+    try:
+        return float(os.environ[SLOW_MS_ENV])
+    except (KeyError, ValueError):
+        return DEFAULT_SLOW_MS
+
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(sql: str) -> str:
+    """One key per statement shape: whitespace collapsed, IN (?, ?, ...) lists folded."""
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    return _PLACEHOLDER_LIST.sub("(?, ...)", sql)
+
+
+def slow_query_logger(path=SLOW_QUERY_LOG):
+    """The rotating slow-query log; the handler is attached once per path."""
+    logger = logging.getLogger(f"tax_tracker.slow_queries.{os.path.abspath(path)}")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+# ================== STATISTICS ==================
+class QueryStats:
+    """Per-statement counters, shared by every cursor of one connection."""
+
+    def __init__(self, slow_ms=None, log_path=SLOW_QUERY_LOG):
+        self.slow_ms = slow_ms_from_env() if slow_ms is None else slow_ms
+        self.log_path = log_path
+        self.statements = {}  # normalized sql -> counters
+        self.slow_count = 0
+        self._lock = threading.Lock()
+        self._logger = None
+
+    def _entry(self, key):
+        entry = self.statements.get(key)
+        if entry is None:
+            entry = self.statements[key] = {
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "rows": 0,
+                "samples": deque(maxlen=SAMPLES_PER_STATEMENT),
+            }
+        return entry
+
+    def record(self, key, elapsed_ms, rows):
+        with self._lock:
+            entry = self._entry(key)
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["rows"] += rows
+            entry["samples"].append(elapsed_ms)
+            if elapsed_ms > entry["max_ms"]:
+                entry["max_ms"] = elapsed_ms
+
+    def add_fetch(self, key, elapsed_ms, rows):
+        """Rows fetched after the statement was recorded (e.g. fetchone() in a loop)."""
+        with self._lock:
+            entry = self._entry(key)
+            entry["total_ms"] += elapsed_ms
+            entry["rows"] += rows
+
+    def log_slow(self, sql, params, elapsed_ms, rows, plan):
+        self.slow_count += 1
+        if self._logger is None:
+            self._logger = slow_query_logger(self.log_path)
+        lines = [f"{elapsed_ms:.1f} ms, {rows} row(s): {normalize(sql)}"]
+        if params:
+            lines.append(f"    params: {params!r}"[:500])
+        lines += [f"    plan: {step}" for step in plan]
+        self._logger.info("\n".join(lines))
+
+    def snapshot(self):
+        """[{sql, count, total_ms, mean_ms, p95_ms, max_ms, rows}] sorted by total time."""
+        with self._lock:
+            items = list(self.statements.items())
+            result = []
+            for sql, entry in items:
+                samples = sorted(entry["samples"])
+                p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+                result.append({
+                    "sql": sql,
+                    "count": entry["count"],
+                    "total_ms": round(entry["total_ms"], 3),
+                    "mean_ms": round(entry["total_ms"] / entry["count"], 3) if entry["count"] else 0.0,
+                    "p95_ms": round(p95, 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "rows": entry["rows"],
+                })
+        result.sort(key=lambda item: item["total_ms"], reverse=True)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.statements.clear()
+            self.slow_count = 0
+
+    def format_report(self, limit=20):
+        lines = [f"{'count':>7}{'total ms':>11}{'p95 ms':>9}{'rows':>10}  statement"]
+        for item in self.snapshot()[:limit]:
+            sql = item["sql"] if len(item["sql"]) <= 90 else item["sql"][:87] + "..."
+            lines.append(f"{item['count']:>7}{item['total_ms']:>11.1f}{item['p95_ms']:>9.2f}{item['rows']:>10}  {sql}")
+        return "\n".join(lines)
+
+
+# ================== CONNECTION / CURSOR ==================
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Times a statement from execute() until the caller stops fetching:
+    the sample is taken at the first fetchone(), at fetchall()/fetchmany(),
+    when iteration is exhausted, or at the next execute(). Rows fetched
+    after that still count towards the statement's rows and total time.
+    """
+
+    def _begin(self, sql, params):
+        self._finish()
+        self._sql, self._params = sql, params
+        self._key = normalize(sql)
+        self._elapsed = 0.0
+        self._rows = 0
+        self._open = True
+
+    def _finish(self):
+        if not getattr(self, "_open", False):
+            return
+        self._open = False
+        stats = self.connection.query_stats
+        stats.record(self._key, self._elapsed, self._rows)
+        if self._elapsed >= stats.slow_ms:
+            stats.log_slow(self._sql, self._params, self._elapsed, self._rows,
+                           explain(self.connection, self._sql, self._params))
+
+    def _timed(self, elapsed_ms, rows):
+        if getattr(self, "_open", False):
+            self._elapsed += elapsed_ms
+            self._rows += rows
+        elif getattr(self, "_key", None):
+            self.connection.query_stats.add_fetch(self._key, elapsed_ms, rows)
+
+    def execute(self, sql, parameters=()):
+        self._begin(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._timed((time.perf_counter() - started) * 1000, 0)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._begin(sql, None)  # the parameters may be a generator; nothing to EXPLAIN with
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._timed((time.perf_counter() - started) * 1000, 0)
+            self._finish()
+
+    def executescript(self, script):
+        self._finish()
+        return super().executescript(script)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._timed((time.perf_counter() - started) * 1000, 0 if row is None else 1)
+        self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._timed((time.perf_counter() - started) * 1000, len(rows))
+        self._finish()
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._timed((time.perf_counter() - started) * 1000, len(rows))
+        self._finish()
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._timed((time.perf_counter() - started) * 1000, 0)
+            self._finish()
+            raise
+        self._timed((time.perf_counter() - started) * 1000, 1)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3.connect(..., factory=InstrumentedConnection); set query_stats before use."""
+
+    query_stats = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def explain(conn, sql, params):
+    """EXPLAIN QUERY PLAN details for a statement, on a plain (untimed) cursor."""
+    if params is None or not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    try:
+        cursor = sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+        rows = cursor.execute("EXPLAIN QUERY PLAN " + sql, params or ()).fetchall()
+        cursor.close()
+    except sqlite3.Error as e:
+        return [f"(unavailable: {e})"]
+    return [row[3] for row in rows]
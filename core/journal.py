@@ -0,0 +1,239 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime
+
+# Columns restored when a deleted record comes back (id and created_at included
+# so the record is identical to what was removed).
+RECORD_COLUMNS = {
+    "income": ("id", "date", "gross_income", "description", "cwt", "atc", "income_received", "created_at"),
+    "expense": ("id", "date", "gross_expense", "description", "wt", "atc", "expense_paid", "created_at"),
+}
+
+
+# ================== UNDO / REDO JOURNAL ==================
+class UndoJournal:
+    """
+    Undo/redo history kept in the records database instead of in memory.
+
+    Every user action is a *group* of one or more entries (a bulk delete or an
+    import is one group) and is undone/redone as a single transaction. Only
+    the newest `capacity` groups are kept, so the journal stays the same size
+    however long the session runs, and it survives restarts.
+
+    Entries store compact diffs:
+        add    -> nothing until undone (the row is captured then, for redo)
+        edit   -> only the changed fields, as {field: [old, new]}
+        delete -> the removed row
+    """
+
+    def __init__(self, storage, capacity=200):
+        self.storage = storage
+        self.conn = storage.conn
+        self.capacity = capacity
+        self._group_id = None
+        self.create_table()
+
+    def create_table(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS undo_journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                group_id INTEGER NOT NULL,
+                record_type TEXT NOT NULL,
+                action TEXT NOT NULL,
+                record_id INTEGER NOT NULL,
+                diff TEXT,
+                undone INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_undo_journal_group
+            ON undo_journal(undone, group_id)
+        """)
+        self.conn.commit()
+
+    # ================== RECORDING ==================
+    @contextmanager
+    def group(self):
+        """Record everything inside the block as one undoable action."""
+        if self._group_id is not None:
+            yield  # already grouping; nested groups join the outer one
+            return
+
+        self.begin_group()
+        try:
+            yield
+        finally:
+            self.end_group()
+
+    def begin_group(self):
+        """Start a group explicitly, for work spread over several event-loop callbacks."""
+        self._group_id = self._start_group()
+
+    def end_group(self):
+        self._group_id = None
+        self._trim()
+        self.conn.commit()
+
+    def abort_group(self):
+        """Forget the open group; the caller rolls back its transaction."""
+        self._group_id = None
+
+    def record(self, record_type, action, record_id, old=None, new=None):
+        if action == "edit":
+            diff = {
+                key: [old.get(key), new.get(key)]
+                for key in RECORD_COLUMNS[record_type]
+                if key not in ("id", "created_at") and old.get(key) != new.get(key)
+            }
+            if not diff:
+                return  # saved without changes, nothing to undo
+        elif action == "delete":
+            diff = {key: old.get(key) for key in RECORD_COLUMNS[record_type]}
+        else:
+            diff = None
+
+        if self._group_id is not None:
+            self._insert(self._group_id, record_type, action, record_id, diff)
+            return
+
+        group_id = self._start_group()
+        self._insert(group_id, record_type, action, record_id, diff)
+        self._trim()
+        self.conn.commit()
+
+    def record_many(self, record_type, action, rows):
+        """Bulk variant of record() for adds and deletes of whole rows."""
+        rows = list(rows)
+        if not rows:
+            return
+        with self.group():
+            self.conn.executemany("""
+                INSERT INTO undo_journal (group_id, record_type, action, record_id, diff, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    self._group_id, record_type, action, row["id"],
+                    json.dumps({key: row.get(key) for key in RECORD_COLUMNS[record_type]})
+                    if action == "delete" else None,
+                    datetime.now().isoformat()
+                )
+                for row in rows
+            ])
+
+    def _start_group(self):
+        # A new action invalidates everything that could have been redone
+        self.conn.execute("DELETE FROM undo_journal WHERE undone = 1")
+        row = self.conn.execute("SELECT IFNULL(MAX(group_id), 0) FROM undo_journal").fetchone()
+        return row[0] + 1
+
+    def _insert(self, group_id, record_type, action, record_id, diff):
+        self.conn.execute("""
+            INSERT INTO undo_journal (group_id, record_type, action, record_id, diff, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            group_id,
+            record_type,
+            action,
+            record_id,
+            json.dumps(diff) if diff is not None else None,
+            datetime.now().isoformat()
+        ))
+
+    def _trim(self):
+        # Keep only the newest `capacity` groups (ring buffer)
+        self.conn.execute("""
+            DELETE FROM undo_journal
+            WHERE group_id <= (
+                SELECT IFNULL(MAX(group_id), 0) - ? FROM undo_journal
+            )
+        """, (self.capacity,))
+
+    # ================== UNDO / REDO ==================
+    def can_undo(self) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM undo_journal WHERE undone = 0 LIMIT 1"
+        ).fetchone() is not None
+
+    def can_redo(self) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM undo_journal WHERE undone = 1 LIMIT 1"
+        ).fetchone() is not None
+
+    def undo(self) -> set:
+        """Undo the newest group. Returns the record types touched (empty if nothing to undo)."""
+        row = self.conn.execute(
+            "SELECT MAX(group_id) FROM undo_journal WHERE undone = 0"
+        ).fetchone()
+        if row[0] is None:
+            return set()
+        return self._apply_group(row[0], undo=True)
+
+    def redo(self) -> set:
+        """Redo the oldest undone group. Returns the record types touched."""
+        row = self.conn.execute(
+            "SELECT MIN(group_id) FROM undo_journal WHERE undone = 1"
+        ).fetchone()
+        if row[0] is None:
+            return set()
+        return self._apply_group(row[0], undo=False)
+
+    def _apply_group(self, group_id, undo: bool) -> set:
+        entries = self.conn.execute("""
+            SELECT id, record_type, action, record_id, diff
+            FROM undo_journal
+            WHERE group_id = ?
+            ORDER BY id
+        """, (group_id,)).fetchall()
+
+        if undo:
+            entries = list(reversed(entries))
+
+        touched = set()
+        with self.conn:  # one transaction for the whole group
+            for entry_id, record_type, action, record_id, diff in entries:
+                diff = json.loads(diff) if diff else None
+                new_diff = self._apply_entry(record_type, action, record_id, diff, undo)
+                self.conn.execute(
+                    "UPDATE undo_journal SET undone = ?, diff = ? WHERE id = ?",
+                    (1 if undo else 0, json.dumps(new_diff) if new_diff is not None else None, entry_id)
+                )
+                touched.add(record_type)
+        return touched
+
+    def _apply_entry(self, record_type, action, record_id, diff, undo):
+        """Applies one entry and returns the diff to keep for the opposite direction."""
+        table = record_type  # "income" / "expense" are also the table names
+
+        if action == "edit":
+            index = 0 if undo else 1
+            assignments = ", ".join(f"{key} = ?" for key in diff)
+            self.conn.execute(
+                f"UPDATE {table} SET {assignments} WHERE id = ?",
+                [values[index] for values in diff.values()] + [record_id]
+            )
+            return diff
+
+        # add undone / delete redone -> remove the row; delete undone / add redone -> put it back
+        removes_row = (action == "add") == undo
+        if removes_row:
+            if diff is None:
+                columns = RECORD_COLUMNS[record_type]
+                row = self.conn.execute(
+                    f"SELECT {', '.join(columns)} FROM {table} WHERE id = ?", (record_id,)
+                ).fetchone()
+                diff = dict(zip(columns, row)) if row else None
+            self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+        elif diff is not None:
+            columns = RECORD_COLUMNS[record_type]
+            self.conn.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [diff.get(key) for key in columns]
+            )
+
+        # Keep the row for adds only while it is undone; redo puts it back and
+        # the next undo captures it again
+        if action == "add":
+            return diff if undo else None
+        return diff
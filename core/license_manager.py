@@ -1,24 +1,18 @@
 import hmac
 import hashlib
 import os
-import sys
 import json
 import glob
 from datetime import date
+from core.paths import LICENSE_DIR
 
 SECRET_KEY = "ARRGGGHHHH"  # KEEP THIS SECRET
 APP_ID = "NON_VAT_INCOME_EXPENSE_TAX_TRACKER"
 
 
-# ================== EXE-SAFE PATH ==================
-def get_app_root():
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
 # ================== LICENSE FOLDER ==================
-LICENSE_DIR = os.path.join(get_app_root(), "data", "license")
-os.makedirs(LICENSE_DIR, exist_ok=True)
+def ensure_license_dir():
+    os.makedirs(LICENSE_DIR, exist_ok=True)
 
 LAST_RUN_FILE = os.path.join(LICENSE_DIR, "last_run.json")
 VIOLATION_FILE = os.path.join(LICENSE_DIR, "violation.lock")
@@ -64,6 +58,7 @@ def save_last_run(run_date: date):
         "signature": sign_last_run(run_date.isoformat())
     }
 
+    ensure_license_dir()
     with open(LAST_RUN_FILE, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2)
 
@@ -174,6 +169,7 @@ def mark_violation(reason: str):
         "reason": reason,
         "date": date.today().isoformat()
     }
+    ensure_license_dir()
     with open(VIOLATION_FILE, "w", encoding="utf-8") as f:
         json.dump(payload, f)
 
@@ -0,0 +1,153 @@
+from bisect import bisect_right
+from datetime import date
+
+from core.tax import (
+    GRADUATED_BRACKETS, BRACKET_BOUNDS, TAX_EXEMPTION, FLAT_RATE, OSD_RATE,
+    PERCENTAGE_TAX_RATE, VAT_THRESHOLD, graduated_tax, income_tax, percentage_tax,
+)
+from core.projection import project_year
+
+# Every election the setup wizard offers
+OPTIONS = (
+    {"key": "8_percent", "tax_type": "8_percent", "deduction_type": None, "label": "8% Flat"},
+    {"key": "osd", "tax_type": "graduated", "deduction_type": "osd", "label": "Graduated + OSD (40%)"},
+    {"key": "itemized", "tax_type": "graduated", "deduction_type": "itemized", "label": "Graduated + Itemized"},
+)
+
+# Remaining-quarter scenarios: share of the projected remainder that materialises
+SCENARIOS = (("Slow", 0.5), ("Expected", 1.0), ("Strong", 1.5))
+
+# Graduated tax at each bracket bound, for inverting the table
+BRACKET_TAX = [base for _, base, _ in GRADUATED_BRACKETS]
+
+
+# ================== SINGLE POINT ==================
+def evaluate_options(gross_income, gross_expense, earner_type) -> list:
+    """
+    Total tax (income tax + percentage tax) of every option for one year.
+    The 8% option is only eligible up to the VAT threshold.
+    """
+    results = []
+    for option in OPTIONS:
+        tax = income_tax(gross_income, gross_expense, option["tax_type"], earner_type, option["deduction_type"])
+        pct_tax = percentage_tax(gross_income, option["tax_type"])
+        results.append({
+            **option,
+            "taxable": tax["taxable"],
+            "income_tax": tax["tax_due"],
+            "percentage_tax": pct_tax,
+            "total": tax["tax_due"] + pct_tax,
+            "eligible": option["tax_type"] != "8_percent" or gross_income <= VAT_THRESHOLD,
+        })
+    return results
+
+
+def cheapest_option(results) -> dict:
+    return min((r for r in results if r["eligible"]), key=lambda r: r["total"])
+
+
+# ================== BREAK-EVEN ==================
+def inverse_graduated_tax(tax) -> float:
+    """Largest taxable income whose graduated tax is `tax`."""
+    if tax <= 0:
+        return float(BRACKET_BOUNDS[1])  # everything up to the exemption is taxed at 0
+    lower, base, rate = GRADUATED_BRACKETS[bisect_right(BRACKET_TAX, tax) - 1]
+    return lower + (tax - base) / rate
+
+
+def break_even_expense_ratio(gross_income, earner_type) -> dict:
+    """
+    Expense-to-income ratios above which itemized deductions beat the
+    other options (solved on the bracket table, no search):
+        "osd"  -> always 40%
+        "flat" -> ratio where graduated itemized tax + 3% equals the 8% tax,
+                  0.0 if itemized is cheaper with no expenses at all, None if
+                  itemized never catches up (or 8% is not eligible)
+    """
+    if gross_income <= 0 or gross_income > VAT_THRESHOLD:
+        return {"osd": OSD_RATE, "flat": None}
+
+    flat_total = FLAT_RATE * (gross_income if earner_type == "mixed" else max(0, gross_income - TAX_EXEMPTION))
+    target = flat_total - PERCENTAGE_TAX_RATE * gross_income
+    if target < 0:
+        return {"osd": OSD_RATE, "flat": None}
+
+    taxable = inverse_graduated_tax(target)
+    return {"osd": OSD_RATE, "flat": max(0.0, 1 - taxable / gross_income)}
+
+
+# ================== BATCH ==================
+def evaluate_grid(incomes, expense_ratios, earner_type) -> list:
+    """
+    Cheapest option index (into OPTIONS) for every income x expense-ratio
+    point, as grid[row for ratio][column for income]. The per-income parts
+    (8% and OSD totals) are computed once per column, so a grid costs one
+    bracket lookup per cell.
+    """
+    columns = []
+    for gross in incomes:
+        if gross > VAT_THRESHOLD:
+            flat = float("inf")
+        else:
+            flat = FLAT_RATE * (gross if earner_type == "mixed" else max(0, gross - TAX_EXEMPTION))
+        pct = PERCENTAGE_TAX_RATE * gross
+        osd = graduated_tax(gross * (1 - OSD_RATE)) + pct
+        columns.append((gross, flat, osd, pct))
+
+    grid = []
+    for ratio in expense_ratios:
+        row = []
+        for gross, flat, osd, pct in columns:
+            itemized = graduated_tax(max(0.0, gross * (1 - ratio))) + pct
+            # ties go to the simpler election (8%, then OSD)
+            if flat <= osd and flat <= itemized:
+                row.append(0)
+            elif osd <= itemized:
+                row.append(1)
+            else:
+                row.append(2)
+        grid.append(row)
+    return grid
+
+
+# ================== PER YEAR / SCENARIOS ==================
+def compare_years(storage, app_state, years) -> list:
+    """Options evaluated on each year's recorded totals (with that year's earner type)."""
+    comparison = []
+    for year in years:
+        earner_type = app_state.profile_for(year).earner_type
+        summary = storage.get_annual_summary(year)
+        results = evaluate_options(summary["gross_income"], summary["gross_expense"], earner_type)
+        comparison.append({
+            "year": year,
+            "gross_income": summary["gross_income"],
+            "gross_expense": summary["gross_expense"],
+            "options": results,
+            "best": cheapest_option(results),
+            "break_even": break_even_expense_ratio(summary["gross_income"], earner_type),
+        })
+    return comparison
+
+
+def remaining_quarter_scenarios(storage, app_state, year, as_of: date = None) -> list:
+    """
+    Options evaluated on year-end figures where the rest of the year comes
+    in slower than, as, or stronger than projected.
+    """
+    projection = project_year(storage, app_state, year, as_of)
+    remaining_income = projection["gross_income"] - projection["ytd_income"]
+    remaining_expense = projection["gross_expense"] - projection["ytd_expense"]
+
+    scenarios = []
+    for name, factor in SCENARIOS:
+        gross_income = projection["ytd_income"] + remaining_income * factor
+        gross_expense = projection["ytd_expense"] + remaining_expense * factor
+        results = evaluate_options(gross_income, gross_expense, app_state.profile_for(year).earner_type)
+        scenarios.append({
+            "name": name,
+            "gross_income": gross_income,
+            "gross_expense": gross_expense,
+            "options": results,
+            "best": cheapest_option(results),
+        })
+    return scenarios
@@ -1,29 +1,40 @@
 import os
 import sys
 
+# Overrides the data folder (the cold-start benchmark points it at a scratch copy)
+DATA_DIR_ENV = "TAX_TRACKER_DATA_DIR"
 
-def get_app_data_dir():
+
+def get_app_root():
     """
-    Returns the base data directory beside the .exe (or script when running as .py)
+    Returns the folder that holds the .exe (or the project root when running as .py)
     """
     if getattr(sys, "frozen", False):
-        base = os.path.dirname(sys.executable)
-    else:
-        base = os.path.dirname(os.path.abspath(sys.argv[0]))
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    data_dir = os.path.join(base, "data")
-    os.makedirs(data_dir, exist_ok=True)
-    return data_dir
+
+def get_app_data_dir():
+    """
+    Returns the base data directory beside the .exe (or script when running as .py),
+    or $TAX_TRACKER_DATA_DIR when it is set
+    """
+    return os.environ.get(DATA_DIR_ENV) or os.path.join(get_app_root(), "data")
 
 
 # ================== GLOBAL PATHS ==================
+# Computing these is cheap; the folders themselves are only created by
+# ensure_app_dirs() so importing this module has no side effects.
 DATA_DIR = get_app_data_dir()
 
 BACKUP_DIR = os.path.join(DATA_DIR, "backups")
 # DB_DIR = os.path.join(DATA_DIR, "database")
 LICENSE_DIR = os.path.join(DATA_DIR, "license")
 
-# Ensure subfolders exist
-os.makedirs(BACKUP_DIR, exist_ok=True)
-# os.makedirs(DB_DIR, exist_ok=True)
-os.makedirs(LICENSE_DIR, exist_ok=True)
+
+def ensure_app_dirs():
+    """Create the data folders. Called once at startup, not on import."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    # os.makedirs(DB_DIR, exist_ok=True)
+    os.makedirs(LICENSE_DIR, exist_ok=True)
@@ -0,0 +1,113 @@
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from core.paths import DATA_DIR
+
+# Same as starting with --profile
+PROFILE_ENV = "TAX_TRACKER_PROFILE"
+# Function names, source lines and counts only, never records, so customers can send them
+DIAGNOSTICS_DIR = os.path.join(DATA_DIR, "diagnostics")
+
+# Traceback depth kept per allocation (deeper costs more memory while running)
+TRACE_FRAMES = 10
+TOP_FUNCTIONS = 60
+TOP_ALLOCATIONS = 40
+TOP_TRACEBACKS = 10
+
+
+def enabled_from_env() -> bool:
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class ProfileSession:
+    def __init__(self, out_dir=DIAGNOSTICS_DIR, frames=TRACE_FRAMES):
+        self.out_dir = out_dir
+        self.frames = frames
+        self.profiler = cProfile.Profile()
+        self.started_at = None
+        self._started = None
+
+    def start(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        tracemalloc.start(self.frames)
+        self.profiler.enable()
+
+    def stop(self, storages=()):
+        """Stops profiling and writes the files. Returns the .pstats path."""
+        self.profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        prefix = os.path.join(self.out_dir, f"profile_{self.started_at:%Y%m%d_%H%M%S}")
+
+        self.profiler.dump_stats(prefix + ".pstats")
+        self.write_functions(prefix + "_functions.txt")
+        self.write_allocations(prefix + "_allocations.txt", snapshot)
+
+        with open(prefix + "_meta.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "seconds": round(time.perf_counter() - self._started, 1),
+                "memory_current_bytes": current,
+                "memory_peak_bytes": peak,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "frozen": bool(getattr(sys, "frozen", False)),
+                "databases": [database_summary(storage) for storage in storages],
+            }, f, indent=2)
+        return prefix + ".pstats"
+
+    def write_functions(self, path):
+        text = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=text)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+
+    def write_allocations(self, path, snapshot):
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+        lines = [f"Top {TOP_ALLOCATIONS} allocation sites (live at exit)", ""]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {stat.traceback[0]}")
+
+        lines += ["", f"Top {TOP_TRACEBACKS} allocation tracebacks", ""]
+        for stat in snapshot.statistics("traceback")[:TOP_TRACEBACKS]:
+            lines.append(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+            lines += ["    " + line for line in stat.traceback.format()]
+            lines.append("")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+
+def database_summary(storage):
+    """Row counts (per table and per year) that tag a profile; no record contents."""
+    from core.diagnostics import table_counts, year_counts
+
+    db_file = storage.db_file
+    try:
+        return {
+            "file": os.path.basename(db_file) if db_file else storage.db_path,
+            "bytes": os.path.getsize(db_file) if db_file and os.path.exists(db_file) else None,
+            "tables": dict(table_counts(storage)),
+            "years": {str(year): {"income": income, "expense": expense}
+                      for year, income, expense in year_counts(storage)},
+        }
+    except Exception as e:  # a closed or broken database must not lose the profile
+        return {"file": storage.db_path, "error": str(e)}
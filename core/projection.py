@@ -0,0 +1,129 @@
+import calendar
+from datetime import date
+
+from core.tax import VAT_THRESHOLD, income_tax, percentage_tax
+
+# Prior years used for the seasonal model
+HISTORY_YEARS = 3
+
+
+# ================== ELAPSED TIME ==================
+def elapsed_months(year: int, as_of: date):
+    """
+    Fraction of each month of `year` that has passed by `as_of` (12 floats):
+    1.0 for past months, part of the current month, 0.0 for future months.
+    """
+    if as_of.year > year:
+        return [1.0] * 12
+    if as_of.year < year:
+        return [0.0] * 12
+
+    days = calendar.monthrange(year, as_of.month)[1]
+    return [
+        1.0 if m < as_of.month else as_of.day / days if m == as_of.month else 0.0
+        for m in range(1, 13)
+    ]
+
+
+# ================== MODELS ==================
+def project_linear(actual, elapsed, year):
+    """Extends the year-to-date daily run rate over the days left."""
+    days = [calendar.monthrange(year, m)[1] for m in range(1, 13)]
+    days_elapsed = sum(d * e for d, e in zip(days, elapsed))
+    if days_elapsed <= 0:
+        return list(actual)
+
+    rate = sum(actual) / days_elapsed
+    return [a + rate * d * (1 - e) for a, d, e in zip(actual, days, elapsed)]
+
+
+def seasonal_shares(history):
+    """Average share of the yearly total earned in each month, over the years in `history`."""
+    totals = [series for series in history if sum(series) > 0]
+    if not totals:
+        return None
+    return [
+        sum(series[m] / sum(series) for series in totals) / len(totals)
+        for m in range(12)
+    ]
+
+
+def project_seasonal(actual, elapsed, shares):
+    """
+    Scales the year-to-date total by the share of the year usually earned by
+    now, then fills the remaining months in their usual proportions.
+    """
+    expected_fraction = sum(s * e for s, e in zip(shares, elapsed))
+    if expected_fraction <= 0:
+        return None
+
+    year_total = sum(actual) / expected_fraction
+    return [a + year_total * s * (1 - e) for a, s, e in zip(actual, shares, elapsed)]
+
+
+def project_series(actual, elapsed, year, history=None, model="seasonal"):
+    """Returns (model used, projected monthly series). Falls back to linear without usable history."""
+    if model == "seasonal" and history:
+        shares = seasonal_shares(history)
+        projected = project_seasonal(actual, elapsed, shares) if shares else None
+        if projected is not None:
+            return "seasonal", projected
+    return "linear", project_linear(actual, elapsed, year)
+
+
+# ================== VAT THRESHOLD ==================
+def threshold_crossing(monthly, year, threshold=VAT_THRESHOLD):
+    """
+    Estimated date the cumulative monthly series reaches `threshold`
+    (interpolated within the month), or None if it stays below.
+    """
+    cumulative = 0.0
+    for m, amount in enumerate(monthly, start=1):
+        if amount > 0 and cumulative + amount >= threshold:
+            days = calendar.monthrange(year, m)[1]
+            day = max(1, min(days, int((threshold - cumulative) / amount * days + 0.999)))
+            return date(year, m, day)
+        cumulative += amount
+    return None
+
+
+# ================== YEAR-END PROJECTION ==================
+def project_year(storage, app_state, year: int, as_of: date = None, model="seasonal") -> dict:
+    """
+    Year-end gross income, expenses and tax due extrapolated from the
+    monthly totals (one GROUP BY per table, no raw rows), plus the estimated
+    date gross income crosses the VAT threshold.
+    """
+    as_of = as_of or date.today()
+    totals = storage.get_monthly_totals(year - HISTORY_YEARS, year)
+    elapsed = elapsed_months(year, as_of)
+    history = range(year - HISTORY_YEARS, year)
+
+    model_used, income = project_series(
+        totals[year]["income"], elapsed, year, [totals[y]["income"] for y in history], model
+    )
+    _, expense = project_series(
+        totals[year]["expense"], elapsed, year, [totals[y]["expense"] for y in history], model_used
+    )
+
+    gross_income, gross_expense = sum(income), sum(expense)
+    profile = app_state.profile_for(year)
+    tax = income_tax(
+        gross_income, gross_expense,
+        profile.tax_type, profile.earner_type, profile.deduction_type
+    )
+
+    return {
+        "model": model_used,
+        "as_of": as_of,
+        "ytd_income": sum(totals[year]["income"]),
+        "ytd_expense": sum(totals[year]["expense"]),
+        "monthly_income": income,
+        "monthly_expense": expense,
+        "gross_income": gross_income,
+        "gross_expense": gross_expense,
+        "taxable": tax["taxable"],
+        "tax_due": tax["tax_due"],
+        "percentage_tax": percentage_tax(gross_income, profile.tax_type),
+        "vat_crossing": threshold_crossing(income, year),
+    }
@@ -0,0 +1,236 @@
+import os
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+
+from core.importer import read_rows, parse_amount, CsvImportError
+
+# A statement line may post a few days after the entry's date
+DATE_WINDOW_DAYS = 5
+
+STATEMENT_ALIASES = {
+    "date": ["date", "transaction date", "posting date", "value date"],
+    "description": ["description", "particulars", "details", "memo", "narration", "payee"],
+    "credit": ["credit", "deposit", "deposits", "money in"],
+    "debit": ["debit", "withdrawal", "withdrawals", "money out"],
+    "amount": ["amount", "net amount"],
+}
+
+
+# ================== STATEMENT LOADING ==================
+def load_statement(path, mapping=None):
+    """
+    Reads a bank statement CSV. Returns (lines, errors) where each line is
+    {"line_no", "date", "amount", "direction", "description"}; direction is
+    "in" (credit, matches income) or "out" (debit, matches expense).
+    A single signed Amount column works too (negative = money out).
+    """
+    lines, errors = [], []
+    columns = None
+
+    for line_no, row in read_rows(path):
+        if columns is None:
+            by_name = {h.strip().lower(): h for h in row.keys() if h}
+            columns = {}
+            for field, aliases in STATEMENT_ALIASES.items():
+                if mapping and mapping.get(field):
+                    columns[field] = mapping[field]
+                    continue
+                columns[field] = next((by_name[a] for a in aliases if a in by_name), None)
+            if not columns["date"] or not (columns["amount"] or columns["credit"] or columns["debit"]):
+                raise CsvImportError("A statement needs a Date column and Amount or Credit/Debit columns")
+
+        def cell(field):
+            return (row.get(columns[field]) or "").strip() if columns[field] else ""
+
+        try:
+            line_date = date.fromisoformat(cell("date")).isoformat()
+        except ValueError:
+            errors.append((line_no, f"Invalid date '{cell('date')}' (use YYYY-MM-DD)"))
+            continue
+
+        try:
+            credit, debit = parse_amount(cell("credit")), parse_amount(cell("debit"))
+            if not credit and not debit:
+                signed = parse_amount(cell("amount"))
+                credit, debit = (signed, 0.0) if signed > 0 else (0.0, -signed)
+        except ValueError:
+            errors.append((line_no, "Amounts must be numbers"))
+            continue
+
+        if credit:
+            lines.append({"line_no": line_no, "date": line_date, "amount": abs(credit),
+                          "direction": "in", "description": cell("description")})
+        elif debit:
+            lines.append({"line_no": line_no, "date": line_date, "amount": abs(debit),
+                          "direction": "out", "description": cell("description")})
+
+    return lines, errors
+
+
+def to_cents(amount) -> int:
+    return int(round(amount * 100))
+
+
+# ================== RECONCILER ==================
+class Reconciler:
+    """
+    Matches statement lines to recorded entries by amount and date window.
+
+    Money in is matched against income (amount received, then gross), money
+    out against expense (amount paid, then gross). Records in the statement's
+    date range are loaded once and bucketed by amount in cents; inside a
+    bucket dates are sorted, so each line is a dict lookup plus a bisect
+    instead of a scan over all records.
+
+    Results are stored in the `reconciliation` table, one run per statement.
+    """
+
+    def __init__(self, storage, date_window_days=DATE_WINDOW_DAYS):
+        self.storage = storage
+        self.conn = storage.conn
+        self.date_window_days = date_window_days
+        self.create_table()
+
+    def create_table(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reconciliation (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id INTEGER NOT NULL,
+                statement_file TEXT,
+                line_no INTEGER,
+                line_date TEXT,
+                amount REAL,
+                direction TEXT,
+                description TEXT,
+                record_type TEXT,
+                record_id INTEGER,
+                status TEXT NOT NULL,
+                date_diff INTEGER,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reconciliation_run ON reconciliation(run_id, status)"
+        )
+        self.conn.commit()
+
+    # ================== MATCHING ==================
+    def reconcile_file(self, path, mapping=None):
+        lines, errors = load_statement(path, mapping)
+        result = self.reconcile(lines, statement_file=os.path.basename(path))
+        result["errors"] = errors
+        return result
+
+    def reconcile(self, lines, statement_file=None):
+        """
+        Returns {"run_id", "matched", "unmatched_lines", "unmatched_records"};
+        unmatched_records are entries inside the statement period that no line matched.
+        """
+        window = timedelta(days=self.date_window_days)
+        results = []
+        unmatched_records = []
+
+        for direction, record_type in (("in", "income"), ("out", "expense")):
+            side = sorted((l for l in lines if l["direction"] == direction), key=lambda l: l["date"])
+            if not side:
+                continue
+
+            first = date.fromisoformat(side[0]["date"])
+            last = date.fromisoformat(side[-1]["date"])
+            records = self.storage.get_records_between(
+                record_type, (first - window).isoformat(), (last + window).isoformat() + "~"
+            )
+
+            wanted = {to_cents(line["amount"]) for line in side}
+            net_index, gross_index = self._build_indexes(records, wanted)
+            used = set()
+
+            for line in side:
+                day = date.fromisoformat(line["date"]).toordinal()
+                cents = to_cents(line["amount"])
+                match = (
+                    self._take_closest(net_index.get(cents), day, used)
+                    or self._take_closest(gross_index.get(cents), day, used)
+                )
+                if match:
+                    record_id, diff = match
+                    results.append({**line, "record_type": record_type, "record_id": record_id,
+                                    "status": "matched", "date_diff": diff})
+                else:
+                    results.append({**line, "record_type": record_type, "record_id": None,
+                                    "status": "unmatched", "date_diff": None})
+
+            # Entries inside the statement period that nothing matched
+            for rec in records:
+                if rec["id"] not in used and side[0]["date"] <= rec["date"][:10] <= side[-1]["date"]:
+                    unmatched_records.append({**rec, "record_type": record_type})
+
+        run_id = self._save(results, statement_file)
+        return {
+            "run_id": run_id,
+            "matched": [r for r in results if r["status"] == "matched"],
+            "unmatched_lines": [r for r in results if r["status"] == "unmatched"],
+            "unmatched_records": unmatched_records,
+        }
+
+    def _build_indexes(self, records, wanted):
+        """{cents: sorted [(date ordinal, id)]} for net and gross amounts that appear on the statement."""
+        net_index, gross_index = {}, {}
+        for rec in records:
+            net = rec["net"] if rec["net"] is not None else rec["gross"]
+            net_cents, gross_cents = to_cents(net), to_cents(rec["gross"])
+            if net_cents not in wanted and gross_cents not in wanted:
+                continue
+            day = date.fromisoformat(rec["date"][:10]).toordinal()
+            if net_cents in wanted:
+                net_index.setdefault(net_cents, []).append((day, rec["id"]))
+            if gross_cents in wanted:
+                gross_index.setdefault(gross_cents, []).append((day, rec["id"]))
+        for index in (net_index, gross_index):
+            for bucket in index.values():
+                bucket.sort()
+        return net_index, gross_index
+
+    def _take_closest(self, bucket, day, used):
+        """Closest unused record in the bucket within the date window -> (id, day difference)."""
+        if not bucket:
+            return None
+
+        best = None
+        i = bisect_left(bucket, (day - self.date_window_days, -1))
+        while i < len(bucket) and bucket[i][0] <= day + self.date_window_days:
+            rec_day, record_id = bucket[i]
+            if record_id not in used and (best is None or abs(rec_day - day) < abs(best[1])):
+                best = (record_id, rec_day - day)
+            i += 1
+
+        if best:
+            used.add(best[0])
+        return best
+
+    def _save(self, results, statement_file):
+        row = self.conn.execute("SELECT IFNULL(MAX(run_id), 0) + 1 FROM reconciliation").fetchone()
+        run_id = row[0]
+        created_at = datetime.now().isoformat()
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO reconciliation (
+                    run_id, statement_file, line_no, line_date, amount, direction, description,
+                    record_type, record_id, status, date_diff, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (run_id, statement_file, r["line_no"], r["date"], r["amount"], r["direction"],
+                 r["description"], r["record_type"], r["record_id"], r["status"], r["date_diff"], created_at)
+                for r in results
+            ])
+        return run_id
+
+    # ================== HISTORY ==================
+    def get_run(self, run_id, status=None):
+        sql = "SELECT * FROM reconciliation WHERE run_id = ?"
+        params = [run_id]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        return [dict(row) for row in self.conn.execute(sql + " ORDER BY line_no", params).fetchall()]
@@ -0,0 +1,105 @@
+from core.tax import (
+    GRADUATED_BRACKETS, TAX_EXEMPTION, FLAT_RATE, OSD_RATE, PERCENTAGE_TAX_RATE,
+    VAT_THRESHOLD, graduated_tax, income_tax, percentage_tax,
+)
+
+
+# ================== TAX AS A FUNCTION OF ONE INPUT ==================
+def total_tax(gross_income, gross_expense, tax_type, earner_type, deduction_type) -> float:
+    """Income tax plus percentage tax for the year."""
+    tax = income_tax(gross_income, gross_expense, tax_type, earner_type, deduction_type)
+    return tax["tax_due"] + percentage_tax(gross_income, tax_type)
+
+
+def tax_curve(gross_income, gross_expense, tax_type, earner_type, deduction_type,
+              deltas, dimension="income") -> list:
+    """
+    Extra tax for each amount in `deltas` of additional income (or expense,
+    with dimension="expense") on top of the year's figures:
+        [(delta, total tax, extra tax vs today)]
+    Taxable income and percentage tax are linear in the delta, so they are
+    set up once per curve and each point costs one bracket lookup.
+    """
+    income_step = 1.0 if dimension == "income" else 0.0
+    expense_step = 1.0 - income_step
+
+    flat = tax_type == "8_percent"
+    if flat:
+        exempt = 0.0 if earner_type == "mixed" else TAX_EXEMPTION
+        taxable_base, taxable_step = gross_income - exempt, income_step
+        pct_base = pct_step = 0.0
+    else:
+        if deduction_type == "osd":
+            taxable_base, taxable_step = gross_income * (1 - OSD_RATE), income_step * (1 - OSD_RATE)
+        else:
+            taxable_base, taxable_step = gross_income - gross_expense, income_step - expense_step
+        pct_base, pct_step = gross_income * PERCENTAGE_TAX_RATE, income_step * PERCENTAGE_TAX_RATE
+
+    base = total_tax(gross_income, gross_expense, tax_type, earner_type, deduction_type)
+    curve = []
+    for delta in deltas:
+        taxable = max(0.0, taxable_base + taxable_step * delta)
+        total = (FLAT_RATE * taxable if flat else graduated_tax(taxable)) + pct_base + pct_step * delta
+        curve.append((delta, total, total - base))
+    return curve
+
+
+# ================== BREAKPOINTS ==================
+def breakpoints(gross_income, gross_expense, tax_type, earner_type, deduction_type,
+                max_delta, dimension="income") -> list:
+    """
+    Additional amounts (0 < delta <= max_delta) where the marginal rate
+    changes, solved from the bracket bounds rather than by sampling:
+        [(delta, label)]
+    Taxable income is linear in the delta, so each bound maps to one delta.
+    """
+    points = []
+
+    if tax_type == "8_percent":
+        if dimension == "income":
+            if earner_type != "mixed":
+                points.append((TAX_EXEMPTION - gross_income, "₱250k exemption used up"))
+            points.append((VAT_THRESHOLD - gross_income, "VAT threshold (8% no longer allowed)"))
+    else:
+        if dimension == "income":
+            # taxable = slope * (income + delta) - expenses
+            slope = 1 - OSD_RATE if deduction_type == "osd" else 1.0
+            offset = 0.0 if deduction_type == "osd" else gross_expense
+            for lower, _, rate in GRADUATED_BRACKETS[1:]:
+                delta = (lower + offset) / slope - gross_income
+                points.append((delta, f"{rate:.0%} bracket starts"))
+            points.append((VAT_THRESHOLD - gross_income, "VAT threshold"))
+        elif deduction_type != "osd":
+            # More expenses lower taxable income: taxable = income - expenses - delta
+            taxable = gross_income - gross_expense
+            for lower, _, rate in GRADUATED_BRACKETS[1:]:
+                points.append((taxable - lower, f"Drops below the {rate:.0%} bracket"))
+
+    return sorted((d, label) for d, label in points if 0 < d <= max_delta)
+
+
+def marginal_rate(gross_income, gross_expense, tax_type, earner_type, deduction_type,
+                  dimension="income") -> float:
+    """Tax on the next peso of income (or saved by the next peso of expense)."""
+    if tax_type == "8_percent":
+        if dimension == "expense":
+            return 0.0
+        if earner_type != "mixed" and gross_income < TAX_EXEMPTION:
+            return 0.0
+        return FLAT_RATE
+
+    if dimension == "expense" and deduction_type == "osd":
+        return 0.0
+
+    slope = 1 - OSD_RATE if deduction_type == "osd" else 1.0
+    deductible = gross_income * OSD_RATE if deduction_type == "osd" else gross_expense
+    taxable = gross_income - deductible
+
+    rate = 0.0
+    for lower, _, bracket_rate in GRADUATED_BRACKETS:
+        if taxable >= lower:
+            rate = bracket_rate
+
+    if dimension == "expense":
+        return -rate if taxable > 0 else 0.0
+    return slope * rate + PERCENTAGE_TAX_RATE
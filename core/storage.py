@@ -1,32 +1,146 @@
-import sys
 import sqlite3
 import os
+import re
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs, unquote
+from core.paths import DATA_DIR
 
 # ================== PATH HELPERS ==================
-def get_app_root():
-    if getattr(sys, "frozen", False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-LICENSE_DIR = os.path.join(get_app_root(), "data", "license")
-os.makedirs(LICENSE_DIR, exist_ok=True)
+# Overrides the default database (the same as NonVatTaxTracker.py --db)
+DB_ENV = "TAX_TRACKER_DB"
 
 
 def get_data_dir():
-    path = os.path.join(get_app_root(), "data")
-    os.makedirs(path, exist_ok=True)
-    return path
-
-DB_FILE = os.path.join(get_data_dir(), "records.db")
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return DATA_DIR
+
+
+def default_db_path():
+    """The default books: $TAX_TRACKER_DB if set, else data/records.db. Read on each call."""
+    return os.environ.get(DB_ENV) or os.path.join(DATA_DIR, "records.db")
+
+
+def database_file(db_path):
+    """
+    The file behind a path, "file:" URI or ":memory:" (None for in-memory
+    databases), for code that needs the file itself: sizes, VACUUM, copies.
+    """
+    if db_path == ":memory:":
+        return None
+    if db_path.startswith("file:"):
+        uri = urlparse(db_path)
+        if parse_qs(uri.query).get("mode") == ["memory"] or uri.path in ("", ":memory:"):
+            return None
+        return os.path.abspath(unquote(uri.path))
+    return os.path.abspath(db_path)
+
+QUARTER_MONTHS = {"Q1": (1, 3), "Q2": (4, 6), "Q3": (7, 9), "Q4": (10, 12)}
+
+# Largest SQLite rowid (no id limit)
+MAX_ROW_ID = 2 ** 63 - 1
+# Ids looked up per statement when restoring (below SQLite's variable limit)
+RESTORE_LOOKUP_BATCH = 500
+
+# Stored in PRAGMA user_version; bump it with each new step in migrate()
+SCHEMA_VERSION = 1
+
+# Pragmas a connection can be opened with. Names and values cannot be bound
+# as parameters, so both are checked before they go into the statement
+CONNECTION_PRAGMAS = {
+    "journal_mode", "synchronous", "cache_size", "temp_store", "mmap_size", "busy_timeout", "foreign_keys",
+}
+PRAGMA_VALUE = re.compile(r"-?\d+|[A-Za-z]+")
+
+# Columns the record tables can be sorted by (whitelist -> SQL expression).
+# Text columns sort case-insensitively and have NOCASE indexes to match.
+SORT_COLUMNS = {
+    "income": {
+        "date": "date",
+        "gross_income": "gross_income",
+        "description": "description COLLATE NOCASE",
+        "cwt": "cwt",
+        "atc": "atc COLLATE NOCASE",
+        "income_received": "income_received",
+    },
+    "expense": {
+        "date": "date",
+        "gross_expense": "gross_expense",
+        "description": "description COLLATE NOCASE",
+        "wt": "wt",
+        "atc": "atc COLLATE NOCASE",
+        "expense_paid": "expense_paid",
+    },
+}
+
+
+def date_range(year: int, quarter: str = None):
+    """
+    Returns (start, end) ISO dates for `date >= start AND date < end`.
+    Unlike strftime('%Y', date) this lets SQLite use the date index.
+    """
+    if quarter is None:
+        return f"{year:04d}-01-01", f"{year + 1:04d}-01-01"
+
+    start_month, end_month = QUARTER_MONTHS[quarter]
+    start = f"{year:04d}-{start_month:02d}-01"
+    end = f"{year + 1:04d}-01-01" if end_month == 12 else f"{year:04d}-{end_month + 1:02d}-01"
+    return start, end
 
 # ================== STORAGE MANAGER ==================
 class StorageManager:
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_FILE)
+    """
+    db_path is a file path, a "file:" URI (e.g. "file:books.db?mode=ro") or
+    ":memory:"; the default is default_db_path(). connect_options go to
+    sqlite3.connect (timeout, check_same_thread, ...) and pragmas are set
+    on the new connection, e.g. {"journal_mode": "WAL"} (only names in
+    CONNECTION_PRAGMAS). schema=False skips create_tables(), for read-only
+    connections to books another connection has already set up.
+    """
+
+    def __init__(self, db_path=None, instrument=None, connect_options=None, pragmas=None, schema=True):
+        for name, value in (pragmas or {}).items():
+            if name not in CONNECTION_PRAGMAS or not PRAGMA_VALUE.fullmatch(str(value)):
+                raise ValueError(f"Unsupported pragma: {name} = {value!r}")
+
+        self.db_path = db_path or default_db_path()
+        self.db_file = database_file(self.db_path)
+        if self.db_file:
+            os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+
+        options = dict(connect_options or {})
+        if self.db_path.startswith("file:"):
+            options["uri"] = True
+
+        # Query timing (core.instrumentation); None means "per the environment"
+        if instrument is None:
+            from core.instrumentation import enabled_from_env
+            instrument = enabled_from_env()
+        if instrument:
+            from core.instrumentation import InstrumentedConnection, QueryStats
+            self.conn = sqlite3.connect(self.db_path, factory=InstrumentedConnection, **options)
+            self.conn.query_stats = QueryStats()
+        else:
+            self.conn = sqlite3.connect(self.db_path, **options)
+        self.query_stats = getattr(self.conn, "query_stats", None)
+        self.autocommit = True
+
+        for name, value in (pragmas or {}).items():
+            self.conn.execute(f"PRAGMA {name} = {value}")
+
         self.conn.row_factory = sqlite3.Row  # so we can get dict-like rows
         self.cursor = self.conn.cursor()
-        self.create_tables()
+        if schema:
+            self.create_tables()
+        else:
+            self.fts_enabled = self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'income_fts'"
+            ).fetchone() is not None
+
+    def _commit(self):
+        # Write methods end with this; the storage service's writer turns
+        # autocommit off and commits a whole batch of them at once
+        if self.autocommit:
+            self.conn.commit()
 
     def create_tables(self):
         # Income table
@@ -55,8 +169,183 @@ class StorageManager:
                 created_at TEXT NOT NULL
             )
         """)
+        self.migrate()
+        self.create_indexes()
+        self.create_search_index()
         self.conn.commit()
 
+    def migrate(self):
+        """One-off changes to databases made by older versions, run once per file."""
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        if version < 1:
+            # idx_{table}_date_amount replaced the date-only index
+            for table in ("income", "expense"):
+                self.cursor.execute(f"DROP INDEX IF EXISTS idx_{table}_date")
+        self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def create_indexes(self):
+        # Date ranges (year/quarter filters, summaries) and the sortable columns
+        for table, amount in (("income", "gross_income"), ("expense", "gross_expense")):
+            # (date, amount) serves date ranges and the duplicate check's date+amount window
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_date_amount ON {table}(date, {amount})")
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_amount ON {table}({amount})")
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_atc ON {table}(atc COLLATE NOCASE)")
+            self.cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_description ON {table}(description COLLATE NOCASE)"
+            )
+
+    def create_search_index(self):
+        """
+        FTS5 index over description and ATC of both tables (external content,
+        so the text is not stored twice), kept in sync by triggers.
+        Falls back to LIKE searches if this SQLite build has no FTS5.
+        """
+        try:
+            for table in ("income", "expense"):
+                existed = self.cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_fts",)
+                ).fetchone()
+
+                self.cursor.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                        description, atc,
+                        content='{table}', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2',
+                        prefix='2 3'
+                    )
+                """)
+                self.cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                        INSERT INTO {table}_fts(rowid, description, atc)
+                        VALUES (new.id, new.description, new.atc);
+                    END
+                """)
+                self.cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                        INSERT INTO {table}_fts({table}_fts, rowid, description, atc)
+                        VALUES ('delete', old.id, old.description, old.atc);
+                    END
+                """)
+                self.cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF description, atc ON {table} BEGIN
+                        INSERT INTO {table}_fts({table}_fts, rowid, description, atc)
+                        VALUES ('delete', old.id, old.description, old.atc);
+                        INSERT INTO {table}_fts(rowid, description, atc)
+                        VALUES (new.id, new.description, new.atc);
+                    END
+                """)
+
+                if not existed:
+                    # Index the records that were entered before search existed
+                    self.cursor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            self.fts_enabled = False
+
+    # ================== SEARCH ==================
+    def search_records(self, text: str, limit: int = 50):
+        """
+        Incremental search over descriptions and ATC codes of income and expense.
+        Every word typed is a prefix ("cli ab" finds "Client ABC"). Returns up to
+        `limit` matches per table, newest first.
+        """
+        terms = re.findall(r"\w+", text or "")
+        if not terms:
+            return []
+
+        results = []
+        for table, amount in (("income", "gross_income"), ("expense", "gross_expense")):
+            if self.fts_enabled:
+                match = " ".join(f'"{term}"*' for term in terms)
+                rows = self.cursor.execute(f"""
+                    SELECT r.id, r.date, r.{amount} AS amount, r.description, r.atc
+                    FROM {table}_fts
+                    JOIN {table} r ON r.id = {table}_fts.rowid
+                    WHERE {table}_fts MATCH ?
+                    ORDER BY {table}_fts.rowid DESC
+                    LIMIT ?
+                """, (match, limit)).fetchall()
+            else:
+                clauses = " AND ".join(
+                    "(description LIKE ? OR atc LIKE ?)" for _ in terms
+                )
+                params = [f"%{term}%" for term in terms for _ in (0, 1)]
+                rows = self.cursor.execute(f"""
+                    SELECT id, date, {amount} AS amount, description, atc
+                    FROM {table}
+                    WHERE {clauses}
+                    ORDER BY id DESC
+                    LIMIT ?
+                """, params + [limit]).fetchall()
+
+            results += [dict(row, record_type=table) for row in rows]
+
+        results.sort(key=lambda r: (r["date"], r["id"]), reverse=True)
+        return results[:limit]
+
+    def get_record_position(self, record_type: str, record_id: int):
+        """
+        Returns (year, index) of a record within its year in date order, so the
+        tables can open the page that contains it. None if it no longer exists.
+        """
+        table = "income" if record_type == "income" else "expense"
+        row = self.cursor.execute(f"SELECT date FROM {table} WHERE id = ?", (record_id,)).fetchone()
+        if not row:
+            return None
+
+        year = int(row["date"][:4])
+        start, end = date_range(year)
+        index = self.cursor.execute(f"""
+            SELECT COUNT(*)
+            FROM {table}
+            WHERE date >= ? AND date < ?
+              AND (date < ? OR (date = ? AND id < ?))
+        """, (start, end, row["date"], row["date"], record_id)).fetchone()[0]
+        return year, index
+
+    # ================== FILTERED / SORTED PAGES ==================
+    def _record_filters(self, amount_column, year=None, quarter=None,
+                        amount_min=None, amount_max=None, atcs=None):
+        clauses, params = [], []
+
+        if year is not None:
+            start, end = date_range(year, quarter)
+            clauses.append("date >= ? AND date < ?")
+            params += [start, end]
+        if amount_min is not None:
+            clauses.append(f"{amount_column} >= ?")
+            params.append(amount_min)
+        if amount_max is not None:
+            clauses.append(f"{amount_column} <= ?")
+            params.append(amount_max)
+        if atcs:
+            clauses.append(f"atc COLLATE NOCASE IN ({', '.join('?' for _ in atcs)})")
+            params += list(atcs)
+
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+    def _get_page(self, table, amount_column, order_by, descending, limit, offset, **filters):
+        where, params = self._record_filters(amount_column, **filters)
+
+        sort_expr = SORT_COLUMNS[table].get(order_by, "date")
+        direction = "DESC" if descending else "ASC"
+
+        sql = f"SELECT * FROM {table} {where} ORDER BY {sort_expr} {direction}, id {direction}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+
+        rows = self.cursor.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def _count(self, table, amount_column, **filters):
+        where, params = self._record_filters(amount_column, **filters)
+        return self.cursor.execute(f"SELECT COUNT(*) FROM {table} {where}", params).fetchone()[0]
+
     # ================== INCOME ==================
     def add_income(self, data: dict):
         self.cursor.execute("""
@@ -72,13 +361,37 @@ class StorageManager:
             data["income_received"],
             datetime.now().isoformat()
         ))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
+    def bulk_add_income(self, rows, commit=True):
+        """Insert many income rows in one statement. Returns the new ids."""
+        return self._bulk_add(
+            "income",
+            ("date", "gross_income", "description", "cwt", "atc", "income_received"),
+            {"cwt": 0},
+            rows,
+            commit
+        )
+
+    def bulk_restore_income(self, rows, commit=True):
+        """Insert backed-up income rows under their own ids. Returns the ids inserted."""
+        return self._bulk_restore(
+            "income",
+            ("date", "gross_income", "description", "cwt", "atc", "income_received"),
+            {"cwt": 0},
+            rows,
+            commit
+        )
+
     def get_all_income(self):
         rows = self.cursor.execute("SELECT * FROM income ORDER BY date ASC").fetchall()
         return [dict(row) for row in rows]
 
+    def get_income(self, record_id):
+        row = self.cursor.execute("SELECT * FROM income WHERE id = ?", (record_id,)).fetchone()
+        return dict(row) if row else None
+
     def update_income(self, record_id, data: dict):
         self.cursor.execute("""
             UPDATE income
@@ -93,11 +406,11 @@ class StorageManager:
             data["income_received"],
             record_id
         ))
-        self.conn.commit()
+        self._commit()
 
     def delete_income(self, record_id):
         self.cursor.execute("DELETE FROM income WHERE id = ?", (record_id,))
-        self.conn.commit()
+        self._commit()
 
     def restore_income(self, data: dict):
         self.cursor.execute("""
@@ -121,7 +434,7 @@ class StorageManager:
             data["income_received"],
             data["created_at"]
         ))
-        self.conn.commit()
+        self._commit()
 
     def restore_expense(self, data: dict):
         self.cursor.execute("""
@@ -143,7 +456,7 @@ class StorageManager:
             data["expense_paid"],
             data["created_at"]
         ))
-        self.conn.commit()
+        self._commit()
 
     def get_income_summary(self):
         row = self.cursor.execute("""
@@ -159,11 +472,24 @@ class StorageManager:
         rows = self.cursor.execute("""
             SELECT *
             FROM income
-            WHERE strftime('%Y', date) = ?
+            WHERE date >= ? AND date < ?
             ORDER BY date DESC
-        """, (str(year),)).fetchall()
+        """, date_range(year)).fetchall()
         return [dict(row) for row in rows]
 
+    def get_income_page(self, year=None, quarter=None, amount_min=None, amount_max=None, atcs=None,
+                        order_by="date", descending=False, limit=None, offset=0):
+        return self._get_page(
+            "income", "gross_income", order_by, descending, limit, offset,
+            year=year, quarter=quarter, amount_min=amount_min, amount_max=amount_max, atcs=atcs
+        )
+
+    def count_income(self, year=None, quarter=None, amount_min=None, amount_max=None, atcs=None):
+        return self._count(
+            "income", "gross_income",
+            year=year, quarter=quarter, amount_min=amount_min, amount_max=amount_max, atcs=atcs
+        )
+
     # ================== EXPENSE ==================
     def add_expense(self, data: dict):
         self.cursor.execute("""
@@ -179,13 +505,131 @@ class StorageManager:
             data["expense_paid"],
             datetime.now().isoformat()
         ))
-        self.conn.commit()
+        self._commit()
         return self.cursor.lastrowid
 
+    def bulk_add_expense(self, rows, commit=True):
+        """Insert many expense rows in one statement. Returns the new ids."""
+        return self._bulk_add(
+            "expense",
+            ("date", "gross_expense", "description", "wt", "atc", "expense_paid"),
+            {"wt": 0},
+            rows,
+            commit
+        )
+
+    def bulk_restore_expense(self, rows, commit=True):
+        """Insert backed-up expense rows under their own ids. Returns the ids inserted."""
+        return self._bulk_restore(
+            "expense",
+            ("date", "gross_expense", "description", "wt", "atc", "expense_paid"),
+            {"wt": 0},
+            rows,
+            commit
+        )
+
+    def _bulk_restore(self, table, columns, defaults, rows, commit):
+        # Ids already in use are skipped, so restoring a backup twice (or over
+        # books that still have some of its records) adds each record once
+        rows = list(rows)
+        taken = set()
+        wanted = [data["id"] for data in rows]
+        for start in range(0, len(wanted), RESTORE_LOOKUP_BATCH):
+            batch = wanted[start:start + RESTORE_LOOKUP_BATCH]
+            taken.update(row[0] for row in self.cursor.execute(
+                f"SELECT id FROM {table} WHERE id IN ({', '.join('?' for _ in batch)})", batch
+            ).fetchall())
+
+        fresh = []
+        for data in rows:
+            if data["id"] not in taken:
+                taken.add(data["id"])
+                fresh.append(data)
+
+        created_at = datetime.now().isoformat()
+        self.cursor.executemany(f"""
+            INSERT INTO {table} (id, {', '.join(columns)}, created_at)
+            VALUES (?, {', '.join('?' for _ in columns)}, ?)
+        """, (
+            [data["id"]] + [data.get(col, defaults.get(col)) for col in columns] + [created_at]
+            for data in fresh
+        ))
+        if commit:
+            self._commit()
+        return [data["id"] for data in fresh]
+
+    def _bulk_add(self, table, columns, defaults, rows, commit):
+        # AUTOINCREMENT ids are handed out in order, so everything above the
+        # current sequence value was inserted by this call
+        row = self.cursor.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)
+        ).fetchone()
+        last_id = row[0] if row else 0
+
+        created_at = datetime.now().isoformat()
+        self.cursor.executemany(f"""
+            INSERT INTO {table} ({', '.join(columns)}, created_at)
+            VALUES ({', '.join('?' for _ in columns)}, ?)
+        """, (
+            [data.get(col, defaults.get(col)) for col in columns] + [created_at]
+            for data in rows
+        ))
+
+        ids = [r[0] for r in self.cursor.execute(
+            f"SELECT id FROM {table} WHERE id > ? ORDER BY id", (last_id,)
+        ).fetchall()]
+        if commit:
+            self._commit()
+        return ids
+
+    def get_records_in_window(self, record_type, start_date, end_date, amount_min, amount_max, exclude_id=None,
+                              max_id=None):
+        """
+        Records dated start..end (inclusive) with a gross amount in range, and
+        id <= max_id if given. Used for duplicate checks.
+        """
+        table, amount_column = (
+            ("income", "gross_income") if record_type == "income" else ("expense", "gross_expense")
+        )
+        rows = self.cursor.execute(f"""
+            SELECT *
+            FROM {table}
+            WHERE date >= ? AND date <= ?
+              AND {amount_column} >= ? AND {amount_column} <= ?
+              AND id != ? AND id <= ?
+        """, (
+            start_date, end_date, amount_min, amount_max, exclude_id or -1,
+            max_id if max_id is not None else MAX_ROW_ID
+        )).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_last_id(self, record_type) -> int:
+        """The highest id in the table (0 if empty); records added later get higher ones."""
+        table = "income" if record_type == "income" else "expense"
+        return self.cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+
+    def get_records_between(self, record_type, start_date, end_date):
+        """id, date, gross and net of records dated start..end (inclusive). Used for reconciliation."""
+        table, gross_column, net_column = (
+            ("income", "gross_income", "income_received") if record_type == "income"
+            else ("expense", "gross_expense", "expense_paid")
+        )
+        rows = self.cursor.execute(f"""
+            SELECT id, date, description, {gross_column} AS gross, {net_column} AS net
+            FROM {table}
+            WHERE date >= ? AND date <= ?
+            ORDER BY date
+        """, (start_date, end_date)).fetchall()
+        return [dict(row) for row in rows]
+
     def get_all_expense(self):
         rows = self.cursor.execute("SELECT * FROM expense ORDER BY date ASC").fetchall()
         return [dict(row) for row in rows]
 
+    def get_expense(self, record_id):
+        row = self.cursor.execute("SELECT * FROM expense WHERE id = ?", (record_id,)).fetchone()
+        return dict(row) if row else None
+
     def update_expense(self, record_id, data: dict):
         self.cursor.execute("""
             UPDATE expense
@@ -200,11 +644,11 @@ class StorageManager:
             data["expense_paid"],
             record_id
         ))
-        self.conn.commit()
+        self._commit()
 
     def delete_expense(self, record_id):
         self.cursor.execute("DELETE FROM expense WHERE id = ?", (record_id,))
-        self.conn.commit()
+        self._commit()
 
     def get_expense_summary(self):
         row = self.cursor.execute("""
@@ -216,24 +660,37 @@ class StorageManager:
         """).fetchone()
         return {"gross_expense": row[0], "wt": row[1], "expense_paid": row[2]}
 
+    def get_expense_page(self, year=None, quarter=None, amount_min=None, amount_max=None, atcs=None,
+                         order_by="date", descending=False, limit=None, offset=0):
+        return self._get_page(
+            "expense", "gross_expense", order_by, descending, limit, offset,
+            year=year, quarter=quarter, amount_min=amount_min, amount_max=amount_max, atcs=atcs
+        )
+
+    def count_expense(self, year=None, quarter=None, amount_min=None, amount_max=None, atcs=None):
+        return self._count(
+            "expense", "gross_expense",
+            year=year, quarter=quarter, amount_min=amount_min, amount_max=amount_max, atcs=atcs
+        )
+
     # ================== ANNUAL / QUARTER SUMMARY ==================
     def get_quarter_summary(self, year: int, quarter: str):
-        quarter_months = {"Q1": (1, 3), "Q2": (4, 6), "Q3": (7, 9), "Q4": (10, 12)}
-        start_month, end_month = quarter_months[quarter]
+        start, end = date_range(year, quarter)
+        year_start, _ = date_range(year)
 
         # Gross income and CWT for this quarter
         income_row = self.cursor.execute("""
             SELECT IFNULL(SUM(gross_income),0), IFNULL(SUM(cwt),0)
             FROM income
-            WHERE strftime('%Y', date)=? AND CAST(strftime('%m', date) AS INTEGER) BETWEEN ? AND ?
-        """, (str(year), start_month, end_month)).fetchone()
+            WHERE date >= ? AND date < ?
+        """, (start, end)).fetchone()
 
         # Gross expense and WT for this quarter
         expense_row = self.cursor.execute("""
             SELECT IFNULL(SUM(gross_expense),0), IFNULL(SUM(wt),0)
             FROM expense
-            WHERE strftime('%Y', date)=? AND CAST(strftime('%m', date) AS INTEGER) BETWEEN ? AND ?
-        """, (str(year), start_month, end_month)).fetchone()
+            WHERE date >= ? AND date < ?
+        """, (start, end)).fetchone()
 
         # Since you don't track income tax paid yet, default to 0
         prior_income_tax_paid = 0.0
@@ -242,8 +699,8 @@ class StorageManager:
         prior_cwt_paid = self.cursor.execute("""
             SELECT IFNULL(SUM(cwt),0)
             FROM income
-            WHERE strftime('%Y', date) = ? AND CAST(strftime('%m', date) AS INTEGER) < ?
-        """, (str(year), start_month)).fetchone()[0]
+            WHERE date >= ? AND date < ?
+        """, (year_start, start)).fetchone()[0]
 
         cwt_current_quarter = income_row[1]
 
@@ -261,14 +718,14 @@ class StorageManager:
         income_row = self.cursor.execute("""
             SELECT IFNULL(SUM(gross_income),0), IFNULL(SUM(cwt),0)
             FROM income
-            WHERE strftime('%Y', date)=?
-        """, (str(year),)).fetchone()
+            WHERE date >= ? AND date < ?
+        """, date_range(year)).fetchone()
 
         expense_row = self.cursor.execute("""
             SELECT IFNULL(SUM(gross_expense),0), IFNULL(SUM(wt),0)
             FROM expense
-            WHERE strftime('%Y', date)=?
-        """, (str(year),)).fetchone()
+            WHERE date >= ? AND date < ?
+        """, date_range(year)).fetchone()
 
         return {
             "gross_income": income_row[0],
@@ -282,7 +739,62 @@ class StorageManager:
         row = self.cursor.execute("""
             SELECT IFNULL(SUM(gross_income), 0)
             FROM income
-            WHERE strftime('%Y', date) = ?
-        """, (str(year),)).fetchone()
+            WHERE date >= ? AND date < ?
+        """, date_range(year)).fetchone()
 
         return float(row[0])
+
+    def get_years(self, record_type: str) -> list:
+        """
+        Years that have records of one type, newest first.
+
+        Walks the date index one year at a time (a skip-scan): each step asks
+        for the latest date before the year found last, so it reads a
+        handful of index entries per year instead of every row.
+        """
+        table = {"income": "income", "expense": "expense"}[record_type]
+        rows = self.cursor.execute(f"""
+            WITH RECURSIVE years(year) AS (
+                SELECT substr((SELECT MAX(date) FROM {table}), 1, 4)
+                UNION ALL
+                SELECT substr((SELECT MAX(date) FROM {table} WHERE date < years.year), 1, 4)
+                FROM years
+                WHERE years.year IS NOT NULL
+            )
+            SELECT year FROM years WHERE year IS NOT NULL
+        """).fetchall()
+        return [int(row["year"]) for row in rows if row["year"].isdigit()]
+
+    def get_record_years(self) -> list:
+        """Years that have income or expense records, newest first."""
+        return sorted(set(self.get_years("income")) | set(self.get_years("expense")), reverse=True)
+
+    # FOR PROJECTIONS
+    def get_monthly_totals(self, first_year: int, last_year: int = None) -> dict:
+        """
+        Gross income and expense per month, rolled up in SQL:
+            {year: {"income": [12 floats], "expense": [12 floats]}}
+        Years without records are included with zeros.
+        """
+        last_year = last_year or first_year
+        totals = {
+            year: {"income": [0.0] * 12, "expense": [0.0] * 12}
+            for year in range(first_year, last_year + 1)
+        }
+        start, end = date_range(first_year)[0], date_range(last_year)[1]
+
+        for kind, table, amount_column in (
+            ("income", "income", "gross_income"),
+            ("expense", "expense", "gross_expense"),
+        ):
+            rows = self.cursor.execute(f"""
+                SELECT substr(date, 1, 7) AS month, SUM({amount_column}) AS total
+                FROM {table}
+                WHERE date >= ? AND date < ?
+                GROUP BY month
+            """, (start, end)).fetchall()
+            for row in rows:
+                year, month = int(row["month"][:4]), int(row["month"][5:7])
+                totals[year][kind][month - 1] = float(row["total"] or 0)
+
+        return totals
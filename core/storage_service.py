@@ -0,0 +1,217 @@
+import atexit
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from core.storage import StorageManager
+
+READERS = 2
+MAX_BATCH = 200         # write jobs per transaction at most
+POLL_MS = 50            # how often call_when_done checks a future
+BUSY_TIMEOUT = 30       # seconds a connection waits for a lock
+
+_STOP = object()
+
+
+def read_only_uri(db_file):
+    return Path(db_file).resolve().as_uri() + "?mode=ro"
+
+
+def call_job(storage, fn, args, kwargs):
+    """fn is a StorageManager method name or a callable taking the storage first."""
+    if isinstance(fn, str):
+        return getattr(storage, fn)(*args, **kwargs)
+    return fn(storage, *args, **kwargs)
+
+
+def call_when_done(widget, future, on_result, on_error=None, interval_ms=POLL_MS):
+    """
+    Calls on_result(result) or on_error(exception) on the Tk thread once
+    future is done, checking every interval_ms with widget.after(). Errors
+    without an on_error are re-raised into Tk's error reporting.
+    """
+    def check():
+        if not future.done():
+            widget.after(interval_ms, check)
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return
+        on_result(result)
+
+    widget.after(interval_ms, check)
+
+
+class StorageService:
+    def __init__(self, db_file, readers=READERS, max_batch=MAX_BATCH, instrument=None, executor=None, wal=True):
+        """
+        executor: a ThreadPoolExecutor to run reads on instead of a pool of
+        `readers` threads, so services for several databases can share one
+        (each thread then holds a read connection per database). It is not
+        shut down by close().
+
+        wal: set up the tables and switch the file to WAL now. With False the
+        file is left as it is until the first write, for reporting on books
+        that are already set up.
+        """
+        if db_file is None:
+            raise ValueError("StorageService needs a database file; in-memory databases cannot be shared")
+        self.db_file = db_file
+        self.max_batch = max_batch
+        self.instrument = instrument
+        self.batches = 0        # transactions committed by the writer
+        self.jobs = 0           # write jobs run
+
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._local = threading.local()
+        self._reader_storages = []
+        self._owns_readers = executor is None
+        self._readers = executor or ThreadPoolExecutor(max_workers=readers, thread_name_prefix="storage-reader")
+
+        if wal:
+            # Creates the tables the read-only connections cannot. WAL is a property
+            # of the file, so it also covers the UI's connection from its next transaction
+            StorageManager(
+                db_path=db_file, instrument=False,
+                connect_options={"timeout": BUSY_TIMEOUT}, pragmas={"journal_mode": "WAL"},
+            ).conn.close()
+
+        # The writer is a daemon thread; writes still queued at exit are finished
+        atexit.register(self.close)
+
+    # ================== READS ==================
+    def read(self, fn, *args, **kwargs) -> Future:
+        """Runs fn(storage, *args) (or storage.<fn>(*args)) on a read-only connection."""
+        if self._closed:
+            raise RuntimeError("StorageService is closed")
+        return self._readers.submit(self._read, fn, args, kwargs)
+
+    def _read(self, fn, args, kwargs):
+        return call_job(self._reader_storage(), fn, args, kwargs)
+
+    def _reader_storage(self):
+        # One connection per pool thread, opened on its first job
+        storage = getattr(self._local, "storage", None)
+        if storage is None:
+            storage = StorageManager(
+                db_path=read_only_uri(self.db_file),
+                instrument=self.instrument,
+                connect_options={"timeout": BUSY_TIMEOUT, "check_same_thread": False},
+                schema=False,
+            )
+            self._local.storage = storage
+            with self._lock:
+                self._reader_storages.append(storage)
+        return storage
+
+    # ================== WRITES ==================
+    def write(self, fn, *args, **kwargs) -> Future:
+        """
+        Queues fn(storage, *args) (or storage.<fn>(*args)) for the writer thread.
+        Jobs must leave committing to the writer, as StorageManager's write
+        methods do; the importer and the undo journal commit themselves.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("StorageService is closed")
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="storage-writer", daemon=True)
+                self._writer.start()
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def _write_loop(self):
+        storage = StorageManager(
+            db_path=self.db_file,
+            instrument=self.instrument,
+            connect_options={"timeout": BUSY_TIMEOUT},
+        )
+        storage.autocommit = False
+        try:
+            while True:
+                job = self._queue.get()
+                if job is _STOP:
+                    return
+                # Group everything that queued up while the last batch was committing:
+                # one fsync for the lot, and a failing job only rolls back its SAVEPOINT
+                batch = [job]
+                stop = False
+                while len(batch) < self.max_batch:
+                    try:
+                        job = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        stop = True
+                        break
+                    batch.append(job)
+                self._run_batch(storage, batch)
+                if stop:
+                    return
+        finally:
+            storage.conn.close()
+
+    def _run_batch(self, storage, batch):
+        conn = storage.conn
+        done = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, fn, args, kwargs in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = call_job(storage, fn, args, kwargs)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    future.set_exception(e)
+                    continue
+                conn.execute("RELEASE job")
+                done.append((future, result))
+            conn.commit()
+        except Exception as e:
+            # The transaction itself failed (locked, disk full, a job that
+            # committed on its own): nothing in it was written
+            if conn.in_transaction:
+                conn.rollback()
+            for future, _, _, _ in batch:
+                if not future.done():
+                    if future.running() or future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.jobs += len(done)
+        # Results only once they are durable
+        for future, result in done:
+            future.set_result(result)
+
+    # ================== SHUTDOWN ==================
+    def close(self, wait=True):
+        """Finishes queued writes and running reads, then closes every connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+        atexit.unregister(self.close)
+        if writer is not None:
+            self._queue.put(_STOP)
+            if wait:
+                writer.join()
+        if self._owns_readers:
+            self._readers.shutdown(wait=wait)
+        if wait:
+            for storage in self._reader_storages:
+                storage.conn.close()
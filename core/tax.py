@@ -0,0 +1,69 @@
+from bisect import bisect_right
+
+TAX_EXEMPTION = 250_000
+FLAT_RATE = 0.08
+OSD_RATE = 0.40
+PERCENTAGE_TAX_RATE = 0.03
+VAT_THRESHOLD = 3_000_000
+
+# Graduated income tax table used by the Reports tab:
+# (lower bound, tax on the lower bound, rate on the excess)
+GRADUATED_BRACKETS = (
+    (0, 0.0, 0.00),
+    (250_000, 0.0, 0.20),
+    (400_000, 30_000.0, 0.25),
+    (800_000, 130_000.0, 0.30),
+    (2_000_000, 490_000.0, 0.32),
+    (8_000_000, 2_410_000.0, 0.35),
+)
+BRACKET_BOUNDS = [b[0] for b in GRADUATED_BRACKETS]
+
+
+# ================== INCOME TAX ==================
+def graduated_tax(taxable_income) -> float:
+    if taxable_income <= 0:
+        return 0.0
+    # The table is continuous, so a bound can be taxed from either side
+    lower, base, rate = GRADUATED_BRACKETS[bisect_right(BRACKET_BOUNDS, taxable_income) - 1]
+    return base + (taxable_income - lower) * rate
+
+
+def income_tax(gross_income, gross_expense, tax_type, earner_type, deduction_type) -> dict:
+    """
+    Income tax due on cumulative figures.
+    Returns {"deductible", "taxable", "tax_due"}.
+    """
+    if tax_type == "8_percent":
+        taxable = gross_income if earner_type == "mixed" else max(0, gross_income - TAX_EXEMPTION)
+        return {"deductible": 0.0, "taxable": taxable, "tax_due": taxable * FLAT_RATE}
+
+    deductible = gross_income * OSD_RATE if deduction_type == "osd" else gross_expense
+    taxable = max(0, gross_income - deductible)
+    return {"deductible": deductible, "taxable": taxable, "tax_due": graduated_tax(taxable)}
+
+
+def quarterly_income_tax(quarters, tax_type, earner_type, deduction_type) -> list:
+    """
+    1701Q figures for a year's quarters, from Q1 on. `quarters` are the
+    quarter summaries (gross_income, gross_expense, cwt) in order. Tax is due
+    on the year-to-date totals to the end of each quarter, less the CWT to
+    date and what the earlier quarters made payable.
+    Returns {"taxable", "tax_due", "prior_payable", "payable"} per quarter.
+    """
+    filings = []
+    gross_income = gross_expense = cwt = paid = 0.0
+    for summary in quarters:
+        gross_income += summary["gross_income"]
+        gross_expense += summary["gross_expense"]
+        cwt += summary["cwt"]
+        tax = income_tax(gross_income, gross_expense, tax_type, earner_type, deduction_type)
+        payable = max(0.0, tax["tax_due"] - paid - cwt)
+        filings.append({"taxable": tax["taxable"], "tax_due": tax["tax_due"],
+                        "prior_payable": paid, "payable": payable})
+        paid += payable
+    return filings
+
+
+def percentage_tax(gross_income, tax_type) -> float:
+    """3% percentage tax; the 8% option already covers it."""
+    return 0.0 if tax_type == "8_percent" else gross_income * PERCENTAGE_TAX_RATE
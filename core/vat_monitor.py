@@ -0,0 +1,75 @@
+import time
+from datetime import date, datetime
+
+from core.tax import VAT_THRESHOLD
+
+# Warn at these fractions of the VAT threshold
+DEFAULT_TIERS = (0.80, 0.90, 1.00)
+
+# Re-read the total from the database after this many writes or seconds
+RECONCILE_EVERY_WRITES = 100
+RECONCILE_EVERY_SECONDS = 600
+
+
+# ================== VAT THRESHOLD MONITOR ==================
+class VatThresholdMonitor:
+    """
+    Current-year gross income kept in memory and adjusted by the delta of
+    each income write, so checking the VAT threshold after a save costs no
+    query. The total is re-read from the database on start, on year
+    change, after bulk changes (undo/redo, import) and every
+    RECONCILE_EVERY_WRITES writes or RECONCILE_EVERY_SECONDS seconds.
+    """
+
+    def __init__(self, storage, tiers=DEFAULT_TIERS, threshold=VAT_THRESHOLD,
+                 reconcile_every_writes=RECONCILE_EVERY_WRITES,
+                 reconcile_every_seconds=RECONCILE_EVERY_SECONDS):
+        self.storage = storage
+        self.threshold = threshold
+        self.tiers = sorted(tiers)
+        self.reconcile_every_writes = reconcile_every_writes
+        self.reconcile_every_seconds = reconcile_every_seconds
+
+        self.year = None
+        self.total = 0.0
+        self.writes = 0
+        self.reconciled_at = 0.0
+        self.reconcile()
+
+    def reconcile(self):
+        self.year = datetime.now().year
+        self.total = self.storage.get_year_gross_income(self.year)
+        self.writes = 0
+        self.reconciled_at = time.monotonic()
+
+    # ================== DELTAS ==================
+    def apply(self, old=None, new=None):
+        """
+        Account for one income write: old=None for an add, new=None for a
+        delete, both for an edit (the date may move in or out of the year).
+        """
+        self.total -= self._year_amount(old)
+        self.total += self._year_amount(new)
+        self.writes += 1
+
+    def _year_amount(self, record):
+        if not record:
+            return 0.0
+        if not str(record["date"]).startswith(f"{self.year:04d}-"):
+            return 0.0
+        return float(record["gross_income"] or 0)
+
+    def _maybe_reconcile(self):
+        if (
+            datetime.now().year != self.year
+            or self.writes >= self.reconcile_every_writes
+            or time.monotonic() - self.reconciled_at >= self.reconcile_every_seconds
+        ):
+            self.reconcile()
+
+    # ================== TIERS ==================
+    def current_tier(self):
+        """Highest tier reached (e.g. 0.9), or None below the first one."""
+        self._maybe_reconcile()
+        reached = [tier for tier in self.tiers if self.total >= self.threshold * tier]
+        return reached[-1] if reached else None
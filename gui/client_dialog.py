@@ -0,0 +1,101 @@
+import tkinter as tk
+from tkinter import ttk, simpledialog, messagebox
+from datetime import datetime
+import customtkinter as ctk
+
+
+class ClientDialog(tk.Toplevel):
+    """
+    Lists the clients from the registry index with their cached totals
+    (no client database is opened to fill the list) and opens the chosen one.
+    """
+
+    def __init__(self, parent, clients, current, on_open):
+        super().__init__(parent)
+        self.clients = clients
+        self.current = current
+        self.on_open = on_open
+
+        self.title("Clients")
+        self.geometry("760x460")
+        self.configure(bg="#040f21")
+
+        root_frame = ctk.CTkFrame(self, fg_color="#040f21", corner_radius=12)
+        root_frame.pack(fill="both", expand=True, padx=24, pady=18)
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Clients",
+            font=("Segoe UI", 18, "bold"),
+            text_color="#ffffff"
+        ).pack(anchor="w", pady=(0, 10))
+
+        columns = ("name", "income", "expense", "opened")
+        self.tree = ttk.Treeview(root_frame, columns=columns, show="headings")
+        for col, heading, width, anchor in (
+            ("name", "Client", 240, "w"),
+            ("income", f"Income {datetime.now().year}", 150, "e"),
+            ("expense", f"Expenses {datetime.now().year}", 150, "e"),
+            ("opened", "Last Opened", 150, "center"),
+        ):
+            self.tree.heading(col, text=heading)
+            self.tree.column(col, width=width, anchor=anchor)
+        self.tree.pack(fill="both", expand=True)
+        self.tree.bind("<Double-1>", lambda e: self.open_selected())
+
+        btns = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        btns.pack(fill="x", pady=(10, 0))
+
+        ctk.CTkButton(
+            btns, text="Open", height=36, fg_color="#3d77d4", hover_color="#040f21",
+            border_color="#3d77d4", border_width=2, command=self.open_selected
+        ).pack(side="left", padx=(0, 10))
+
+        ctk.CTkButton(
+            btns, text="New Client…", height=36, fg_color="#2b3545", hover_color="#246ae3",
+            command=self.new_client
+        ).pack(side="left", padx=(0, 10))
+
+        ctk.CTkButton(
+            btns, text="Close", height=36, fg_color="#b81c1c", hover_color="#040f21",
+            border_color="#b81c1c", border_width=2, command=self.destroy
+        ).pack(side="left")
+
+        self.populate()
+
+        self.transient(parent)
+        self.lift()
+        self.focus_force()
+
+    def populate(self):
+        self.tree.delete(*self.tree.get_children())
+        year = datetime.now().year
+
+        for slug, entry in self.clients.list_clients():
+            summary = entry.get("summary")
+            if summary and summary["year"] == year:
+                income, expense = f"₱{summary['gross_income']:,.2f}", f"₱{summary['gross_expense']:,.2f}"
+            else:
+                income = expense = "—"
+            opened = (entry.get("last_opened") or "")[:10]
+            name = entry["name"] + ("  (open)" if slug == self.current else "")
+            self.tree.insert("", "end", iid=slug, values=(name, income, expense, opened))
+
+        if self.tree.exists(self.current):
+            self.tree.selection_set(self.current)
+
+    def new_client(self):
+        name = simpledialog.askstring("New Client", "Client name:", parent=self)
+        if not name or not name.strip():
+            return
+        slug = self.clients.add_client(name)
+        self.populate()
+        self.tree.selection_set(slug)
+
+    def open_selected(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("No Selection", "Please select a client.", parent=self)
+            return
+        self.destroy()
+        self.on_open(selected[0])
@@ -0,0 +1,203 @@
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+import customtkinter as ctk
+
+from core import diagnostics
+
+POLL_MS = 200
+SLOW_QUERIES_SHOWN = 50
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024 or unit == "GB":
+            return f"{count:,.0f} {unit}" if unit == "B" else f"{count:,.1f} {unit}"
+        count /= 1024
+
+
+class DiagnosticsDialog(tk.Toplevel):
+    """
+    What support needs to know about a slow installation: database size and
+    layout, rows per table and year, indexes, recent slow queries and backup
+    timings, with ANALYZE / PRAGMA optimize / VACUUM one click away.
+    """
+
+    def __init__(self, parent, storage):
+        super().__init__(parent)
+        self.storage = storage
+        self.worker = None
+        self.result = None
+
+        self.title("Diagnostics")
+        self.geometry("960x640")
+        self.configure(bg="#040f21")
+
+        root_frame = ctk.CTkFrame(self, fg_color="#040f21", corner_radius=12)
+        root_frame.pack(fill="both", expand=True, padx=24, pady=18)
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Database diagnostics",
+            font=("Segoe UI", 18, "bold"),
+            text_color="#ffffff"
+        ).pack(anchor="w")
+
+        self.summary_label = ctk.CTkLabel(root_frame, text="", text_color="#b6c2d4", font=("Segoe UI", 12),
+                                          wraplength=900, justify="left")
+        self.summary_label.pack(anchor="w", pady=(2, 10))
+
+        # ---------------- TABLES ----------------
+        notebook = ttk.Notebook(root_frame)
+        notebook.pack(fill="both", expand=True)
+
+        self.tables_table = self.build_table(notebook, "Tables", [("table", "Table", 260), ("rows", "Rows", 120)])
+        self.years_table = self.build_table(
+            notebook, "Rows by year", [("year", "Year", 100), ("income", "Income", 120), ("expense", "Expense", 120)]
+        )
+        self.index_table = self.build_table(
+            notebook, "Indexes",
+            [("table", "Table", 140), ("name", "Index", 240), ("columns", "Columns", 240), ("origin", "Kind", 120)]
+        )
+        self.slow_table = self.build_table(
+            notebook, "Slow queries",
+            [("at", "Time", 150), ("ms", "ms", 70), ("rows", "Rows", 70), ("sql", "Statement", 380),
+             ("plan", "Plan", 300)]
+        )
+        self.backup_table = self.build_table(
+            notebook, "Backups",
+            [("at", "Finished", 170), ("name", "Backup", 200), ("seconds", "Seconds", 100)]
+        )
+
+        # ---------------- MAINTENANCE ----------------
+        actions = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        actions.pack(fill="x", pady=(12, 0))
+
+        self.status_label = ctk.CTkLabel(actions, text="", text_color="#b6c2d4", font=("Segoe UI", 12))
+        self.status_label.pack(side="left")
+
+        self.buttons = []
+        for text, action in (("VACUUM", "vacuum"), ("Optimize", "optimize"), ("ANALYZE", "analyze")):
+            button = ctk.CTkButton(
+                actions, text=text, width=100, height=30,
+                fg_color="#3d77d4", hover_color="#040f21",
+                border_color="#3d77d4", border_width=2,
+                command=lambda a=action: self.run_action(a)
+            )
+            button.pack(side="right", padx=(8, 0))
+            self.buttons.append(button)
+
+        refresh = ctk.CTkButton(
+            actions, text="Refresh", width=90, height=30,
+            fg_color="#2b3545", hover_color="#246ae3",
+            command=self.refresh
+        )
+        refresh.pack(side="right", padx=(8, 0))
+        self.buttons.append(refresh)
+
+        if self.storage.db_file is None:
+            # An in-memory database has no file for another connection to open
+            for button in self.buttons[:-1]:
+                button.configure(state="disabled")
+
+        self.refresh()
+
+    def build_table(self, notebook, title, columns):
+        frame = tk.Frame(notebook, bg="#040f21")
+        notebook.add(frame, text=title)
+
+        table = ttk.Treeview(frame, columns=[key for key, _, _ in columns], show="headings")
+        for key, heading, width in columns:
+            table.heading(key, text=heading)
+            table.column(key, width=width, anchor="w")
+        table.pack(side="left", fill="both", expand=True)
+
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+        scrollbar.pack(side="right", fill="y")
+        table.configure(yscrollcommand=scrollbar.set)
+        return table
+
+    def fill(self, table, rows):
+        table.delete(*table.get_children())
+        for row in rows:
+            table.insert("", "end", values=row)
+
+    # ================= DATA =================
+    def refresh(self):
+        info = diagnostics.file_info(self.storage)
+        cache = diagnostics.cache_info(self.storage, info)
+
+        self.summary_label.configure(text=(
+            f"{info['path']}\n"
+            f"Database {format_bytes(info['db_bytes'])} (WAL {format_bytes(info['wal_bytes'])}), "
+            f"{info['page_count']:,} pages of {info['page_size']:,} bytes, "
+            f"{info['free_pages']:,} free. Journal: {info['journal_mode']}, auto-vacuum: {info['auto_vacuum']}, "
+            f"statistics: {'yes' if info['analyzed'] else 'never analyzed'}.\n"
+            f"Page cache {format_bytes(cache['cache_bytes'])} holds about {cache['coverage']:.0%} of the database "
+            f"(SQLite does not report cache hit ratios to Python)."
+        ))
+
+        self.fill(self.tables_table, [(table, f"{rows:,}") for table, rows in diagnostics.table_counts(self.storage)])
+        self.fill(self.years_table, [
+            (year, f"{income:,}", f"{expense:,}") for year, income, expense in diagnostics.year_counts(self.storage)
+        ])
+        self.fill(self.index_table, [
+            (index["table"], index["name"], index["columns"], index["origin"])
+            for index in diagnostics.index_list(self.storage)
+        ])
+        self.fill(self.slow_table, [
+            (entry["at"], f"{entry['ms']:,.1f}", f"{entry['rows']:,}", entry["sql"], "; ".join(entry["plan"]))
+            for entry in diagnostics.slow_queries(SLOW_QUERIES_SHOWN)
+        ])
+        self.fill(self.backup_table, [
+            (run["finished_at"].replace("T", " "), run["name"], f"{run['seconds']:.3f}")
+            for run in diagnostics.backup_timings()
+        ])
+
+    # ================= MAINTENANCE =================
+    def run_action(self, action):
+        if self.worker is not None:
+            return
+        if action == "vacuum" and not messagebox.askyesno(
+            "VACUUM",
+            "VACUUM rewrites the whole database file and can take a while on large books. Continue?",
+            parent=self
+        ):
+            return
+
+        for button in self.buttons:
+            button.configure(state="disabled")
+        self.status_label.configure(text=f"Running {action}…")
+
+        # On its own connection in a thread, so the window keeps painting
+        def work():
+            try:
+                self.result = diagnostics.run_maintenance(self.storage.db_file, action)
+            except Exception as e:
+                self.result = {"action": action, "error": str(e)}
+
+        self.result = None
+        self.worker = threading.Thread(target=work, daemon=True)
+        self.worker.start()
+        self.after(POLL_MS, self.poll_action)
+
+    def poll_action(self):
+        if self.worker.is_alive():
+            self.after(POLL_MS, self.poll_action)
+            return
+        self.worker = None
+        if not self.winfo_exists():
+            return
+
+        for button in self.buttons:
+            button.configure(state="normal")
+
+        result = self.result
+        if "error" in result:
+            self.status_label.configure(text=f"{result['action']} failed: {result['error']}")
+            return
+        self.status_label.configure(text=(
+            f"{result['action']} took {result['seconds']:.2f}s; "
+            f"file {format_bytes(result['bytes_before'])} → {format_bytes(result['bytes_after'])}"
+        ))
+        self.refresh()
@@ -4,12 +4,14 @@ from datetime import date, datetime
 from tkcalendar import DateEntry
 import customtkinter as ctk
 from core.storage import StorageManager
+from core.duplicates import DuplicateDetector
 
 
 class ExpenseForm(tk.Toplevel):
-    def __init__(self, parent, storage: StorageManager, row_data=None, refresh_callback=None):
+    def __init__(self, parent, storage: StorageManager, row_data=None, refresh_callback=None, notify=None):
         super().__init__(parent)
         self.parent = parent
+        self.notify = notify
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
@@ -300,13 +302,35 @@ class ExpenseForm(tk.Toplevel):
             "expense_paid": expense_paid
         }
 
+        # Warn before the same transaction is recorded twice
+        matches = DuplicateDetector(self.storage).find(
+            "expense",
+            record_date,
+            gross_expense,
+            data["description"],
+            exclude_id=self.row_data["id"] if self.row_data else None
+        )
+        if matches:
+            match = matches[0]
+            if not messagebox.askyesno(
+                "Possible Duplicate",
+                f"A similar expense is already recorded:\n\n"
+                f"{match['date']} · ₱{match['gross_expense']:,.2f} · {match.get('description') or '(no description)'}\n\n"
+                "Save this entry anyway?",
+                parent=self
+            ):
+                return
+
         if self.row_data:
             new_id = self.row_data["id"]
             self.storage.update_expense(new_id, data)
         else:
             new_id = self.storage.add_expense(data)
 
-        messagebox.showinfo("Saved", "Expense recorded successfully ✅")
+        if self.notify:
+            self.notify("Saved", "Expense recorded successfully ✅", level="success")
+        else:
+            messagebox.showinfo("Saved", "Expense recorded successfully ✅")
         if self.refresh_callback:
             try:
                 self.refresh_callback(new_id)
@@ -0,0 +1,200 @@
+import tkinter as tk
+from tkinter import filedialog
+import customtkinter as ctk
+
+from core.importer import ImportJob, CsvImportError
+
+
+class ImportDialog(tk.Toplevel):
+    """
+    Imports a bank-statement / spreadsheet CSV. The import runs in chunks on
+    the event loop so the progress bar stays live and Cancel works; the main
+    window is refreshed and backed up once, when it finishes.
+    """
+
+    def __init__(self, parent, storage, journal, on_complete):
+        super().__init__(parent)
+        self.storage = storage
+        self.journal = journal
+        self.on_complete = on_complete
+        self.job = None
+
+        self.title("Import CSV")
+        self.geometry("560x420")
+        self.resizable(False, False)
+        self.configure(bg="#040f21")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        root_frame = ctk.CTkFrame(self, fg_color="#040f21", corner_radius=12)
+        root_frame.pack(fill="both", expand=True, padx=30, pady=20)
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Import records from CSV",
+            font=("Segoe UI", 18, "bold"),
+            text_color="#ffffff"
+        ).pack(anchor="w")
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Needs Date (YYYY-MM-DD) and Amount columns; Description, CWT/WT and ATC are optional.",
+            font=("Segoe UI", 12),
+            text_color="#b6c2d4",
+            wraplength=480,
+            justify="left"
+        ).pack(anchor="w", pady=(2, 14))
+
+        # ---------------- RECORD TYPE ----------------
+        self.kind_var = tk.StringVar(value="income")
+        kinds = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        kinds.pack(anchor="w", pady=(0, 10))
+        ctk.CTkRadioButton(kinds, text="Income", variable=self.kind_var, value="income",
+                           text_color="#fff").pack(side="left", padx=(0, 20))
+        ctk.CTkRadioButton(kinds, text="Expense", variable=self.kind_var, value="expense",
+                           text_color="#fff").pack(side="left")
+
+        # ---------------- FILE ----------------
+        file_row = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        file_row.pack(fill="x", pady=(0, 10))
+
+        self.path_var = tk.StringVar()
+        ctk.CTkEntry(
+            file_row,
+            textvariable=self.path_var,
+            fg_color="#1f2a38",
+            text_color="white",
+            placeholder_text="Choose a CSV file",
+            corner_radius=8,
+            border_width=2,
+            border_color="#365580",
+            height=30
+        ).pack(side="left", fill="x", expand=True)
+
+        ctk.CTkButton(
+            file_row, text="Browse…", width=90, height=30,
+            fg_color="#2b3545", hover_color="#246ae3",
+            command=self.choose_file
+        ).pack(side="left", padx=(8, 0))
+
+        self.skip_duplicates_var = tk.BooleanVar(value=True)
+        ctk.CTkCheckBox(
+            root_frame,
+            text="Skip records that are already recorded",
+            variable=self.skip_duplicates_var,
+            text_color="#fff"
+        ).pack(anchor="w", pady=(0, 14))
+
+        # ---------------- PROGRESS ----------------
+        self.progress_bar = ctk.CTkProgressBar(root_frame)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x")
+
+        self.status_label = ctk.CTkLabel(root_frame, text="", text_color="#b6c2d4", font=("Segoe UI", 12),
+                                         wraplength=480, justify="left")
+        self.status_label.pack(anchor="w", pady=(6, 0))
+
+        # ---------------- BUTTONS ----------------
+        btns = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        btns.pack(fill="x", side="bottom", pady=(10, 0))
+
+        self.start_btn = ctk.CTkButton(
+            btns, text="Import", height=36, fg_color="#3d77d4", hover_color="#040f21",
+            border_color="#3d77d4", border_width=2, command=self.start
+        )
+        self.start_btn.pack(side="left", padx=(0, 10))
+
+        self.cancel_btn = ctk.CTkButton(
+            btns, text="Close", height=36, fg_color="#b81c1c", hover_color="#040f21",
+            border_color="#b81c1c", border_width=2, command=self.on_close
+        )
+        self.cancel_btn.pack(side="left")
+
+        self.transient(parent)
+        self.lift()
+        self.focus_force()
+        # Modal: the import holds a transaction open on the shared connection
+        # across after() callbacks, so a save or delete in the main window
+        # would commit part of it (and join its undo group)
+        self.grab_set()
+
+    def choose_file(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Select CSV File",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if path:
+            self.path_var.set(path)
+
+    # ================= RUN =================
+    def start(self):
+        path = self.path_var.get().strip()
+        if not path:
+            self.status_label.configure(text="Choose a file first.")
+            return
+
+        self.job = ImportJob(
+            self.storage,
+            path,
+            self.kind_var.get(),
+            journal=self.journal,
+            skip_duplicates=self.skip_duplicates_var.get()
+        )
+        self.start_btn.configure(state="disabled")
+        self.cancel_btn.configure(text="Cancel")
+        self.after(1, self.step)
+
+    def step(self):
+        try:
+            more = self.job.step()
+        except (CsvImportError, OSError, UnicodeDecodeError) as e:
+            self.finish(error=str(e))
+            return
+        except Exception as e:  # e.g. sqlite3 errors; the job has rolled back
+            self.finish(error=f"{type(e).__name__}: {e}")
+            return
+
+        self.progress_bar.set(self.job.progress)
+        self.status_label.configure(
+            text=f"Imported {self.job.inserted:,} · duplicates skipped {self.job.duplicates:,} "
+                 f"· errors {len(self.job.errors):,}"
+        )
+
+        if more:
+            self.after(1, self.step)
+        else:
+            self.finish()
+
+    def finish(self, error=None):
+        job = self.job
+        self.start_btn.configure(state="normal")
+        self.cancel_btn.configure(text="Close")
+
+        if error:
+            self.status_label.configure(text=f"Import failed, nothing was saved: {error}")
+            self.job = None
+            return
+
+        lines = [
+            f"Imported {job.inserted:,} record(s). "
+            f"Skipped {job.duplicates:,} duplicate(s) and {len(job.errors):,} invalid line(s)."
+        ]
+        for line_no, message in job.errors[:8]:
+            lines.append(f"Line {line_no}: {message}")
+        if len(job.errors) > 8:
+            lines.append(f"… and {len(job.errors) - 8:,} more")
+        self.status_label.configure(text="\n".join(lines))
+
+        if job.inserted:
+            self.on_complete(job.record_type, job)
+        self.job = None
+
+    def on_close(self):
+        if self.job and not self.job.done:
+            self.job.cancel()
+            self.status_label.configure(text="Import cancelled, nothing was saved.")
+            self.start_btn.configure(state="normal")
+            self.cancel_btn.configure(text="Close")
+            self.job = None
+            return
+        self.destroy()
@@ -5,12 +5,14 @@ from datetime import date, datetime
 from tkcalendar import DateEntry
 import customtkinter as ctk
 from core.storage import StorageManager
+from core.duplicates import DuplicateDetector
 
 
 class IncomeForm(tk.Toplevel):
-    def __init__(self, parent, storage: StorageManager, row_data=None, refresh_callback=None):
+    def __init__(self, parent, storage: StorageManager, row_data=None, refresh_callback=None, notify=None):
         super().__init__(parent)
         self.parent = parent
+        self.notify = notify
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
@@ -310,13 +312,35 @@ class IncomeForm(tk.Toplevel):
             "income_received": income_received
         }
 
+        # Warn before the same transaction is recorded twice
+        matches = DuplicateDetector(self.storage).find(
+            "income",
+            record_date,
+            gross_income,
+            data["description"],
+            exclude_id=self.row_data["id"] if self.row_data else None
+        )
+        if matches:
+            match = matches[0]
+            if not messagebox.askyesno(
+                "Possible Duplicate",
+                f"A similar income is already recorded:\n\n"
+                f"{match['date']} · ₱{match['gross_income']:,.2f} · {match.get('description') or '(no description)'}\n\n"
+                "Save this entry anyway?",
+                parent=self
+            ):
+                return
+
         if self.row_data:
             new_id = self.row_data["id"]
             self.storage.update_income(new_id, data)
         else:
             new_id = self.storage.add_income(data)
 
-        messagebox.showinfo("Saved", "Income recorded successfully ✅")
+        if self.notify:
+            self.notify("Saved", "Income recorded successfully ✅", level="success")
+        else:
+            messagebox.showinfo("Saved", "Income recorded successfully ✅")
 
         if self.refresh_callback:
             try:
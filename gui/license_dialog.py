@@ -3,11 +3,9 @@ from tkinter import filedialog, messagebox
 import json
 from datetime import date
 import shutil
-from core.license_manager import verify_license, LICENSE_DIR
+from core.license_manager import verify_license, ensure_license_dir, LICENSE_DIR
 import os
 
-os.makedirs(LICENSE_DIR, exist_ok=True)
-
 
 class LicenseDialog(tk.Toplevel):
     def __init__(self, parent, on_success):
@@ -59,6 +57,8 @@ class LicenseDialog(tk.Toplevel):
 
             valid, msg = verify_license(license_data)
             if valid:
+                ensure_license_dir()
+
                 # Remove old licenses
                 for f in os.listdir(LICENSE_DIR):
                     if f.startswith("license_") and f.endswith(".json"):
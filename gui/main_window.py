@@ -8,35 +8,86 @@ from tkinter import ttk, messagebox
 import customtkinter as ctk
 
 # Core modules
-from core.storage import StorageManager
 from core.backup import backup_income, backup_expense, backup_summary
 from core.license_manager import check_license
+from core.journal import UndoJournal
+from core.projection import project_year
+from core.tax import VAT_THRESHOLD
+from core.vat_monitor import VatThresholdMonitor
 
 # GUI modules
-from gui.setup_wizard import SetupWizard
-from gui.income_form import IncomeForm
-from gui.expense_form import ExpenseForm
+# Forms and dialogs are imported where they are opened so startup only pays
+# for what the first paint needs (tkcalendar in particular is slow to import).
 from gui.reports_tab import ReportsTab
-from gui.license_dialog import LicenseDialog
+from gui.notifications import NotificationCenter
+from gui.search_box import SearchBox
+from gui.watchdog import install_watchdog
 
 # Local modules
 from .reminders import check_filing_reminders
 
 
+# Rows shown per page in the income/expense tables
+PAGE_SIZE = 200
+
+
+def run_backups(storage, app_state, backup_dir, record_types, summary_years):
+    if "income" in record_types:
+        backup_income(storage, backup_dir)
+    if "expense" in record_types:
+        backup_expense(storage, backup_dir)
+    for year in summary_years:
+        backup_summary(storage, app_state, year, backup_dir)
+
+
 # ================== MAIN WINDOW ==================
 class MainWindow:
-    def __init__(self, root, app_state):
+    def __init__(self, root, app_state, storage, clients=None, pool=None):
         self.root = root
         self.app_state = app_state
-        self.storage = StorageManager()
-        self.undo_stack = []
+        # Opened by the caller (see NonVatTaxTracker.start), so the window
+        # works on whichever database it is given
+        self.storage = storage
+
+        # Multi-client mode: registry of client folders and their open databases
+        self.clients = clients
+        self.pool = pool
+        self.client = clients.active if clients else None
+        self.backup_dir = clients.paths(self.client)["backup_dir"] if clients else None
+
+        # Backups run on a read connection off the Tk thread (see schedule_backup);
+        # the service is started by the first one
+        self.storage_service = None
+        self.backup_future = None
+        self.pending_backup = {"types": set(), "years": set()}
+
+        self.journal = UndoJournal(self.storage)
+        self.vat_monitor = VatThresholdMonitor(
+            self.storage, tiers=[pct / 100 for pct in app_state.vat_warning_tiers]
+        )
+
+        # Sorting, range filters and paging per table (applied in SQL)
+        self.table_state = {
+            kind: {
+                "order_by": "date",
+                "descending": False,
+                "page": 0,
+                "amount_min": None,
+                "amount_max": None,
+                "atcs": None,
+            }
+            for kind in ("income", "expense")
+        }
 
         # ================== CTK GLOBAL ==================
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
         # ================== WINDOW ==================
-        self.root.title("Non-VAT Income & Expense Tax Tracker")
+        title = "Non-VAT Income & Expense Tax Tracker"
+        if self.clients and len(self.clients.index["clients"]) > 1:
+            title += f" — {self.clients.name(self.client)}"
+        self.root.title(title)
         # self.root.state("zoomed")
         # self.root.attributes("-fullscreen", True)
         self.root.configure(bg="#040f21")
@@ -89,6 +140,10 @@ class MainWindow:
         )
         self.subtitle_label.pack(anchor="w", pady=(3, 0))
 
+        # ================== SEARCH ==================
+        self.search_box = SearchBox(self.header, self.root, self.storage, on_select=self.show_record)
+        self.search_box.pack(side="right", padx=30, pady=10)
+
         # ================== CONTENT ==================
         self.content = ctk.CTkFrame(
             self.main_container,
@@ -156,11 +211,22 @@ class MainWindow:
             relief=[("active", "flat")]
         )
 
-        self.root.bind_all("<FocusIn>", lambda e: self.root.focus_set())
+        self.root.bind_all("<FocusIn>", self.on_focus_in)
+
+        # ================== NOTIFICATIONS ==================
+        # Toasts instead of modal boxes so saving never waits for a click
+        self.notifications = NotificationCenter(self.root)
 
         # ================== MENU ==================
         self.build_menu()
 
+        # ================== UI WATCHDOG ==================
+        # Always measuring; Ctrl+Shift+D shows the hidden Diagnostics menu
+        self.watchdog = install_watchdog(self.root)
+        self.diagnostics_menu = None
+        self.root.bind_all("<Control-Shift-D>", self.toggle_diagnostics_menu)
+        self.root.bind_all("<Control-Shift-d>", self.toggle_diagnostics_menu)
+
         # ================== APP FLOW ==================
         self.tracking_enabled = False
 
@@ -179,6 +245,15 @@ class MainWindow:
 
         self.update_ui_state()
 
+    def on_focus_in(self, event):
+        # Keep focus rings off tables and buttons, but let text entries and
+        # the search results take keyboard focus
+        if isinstance(event.widget, (tk.Entry, ttk.Entry)):
+            return
+        if str(event.widget).startswith(str(self.search_box.panel)):
+            return
+        self.root.focus_set()
+
     def lock_treeview(self, tree):
         if not tree:
             return
@@ -192,7 +267,7 @@ class MainWindow:
 
     def safe_check_filing_reminders(self):
         try:
-            check_filing_reminders()
+            check_filing_reminders(notify=self.notifications.notify)
         except tk.TclError:
             pass
 
@@ -236,8 +311,35 @@ class MainWindow:
             activeforeground="#111"
         )
         profile_menu.add_command(label="Edit Profile", command=self.open_edit_profile)
+        profile_menu.add_command(label="Compare Tax Options…", command=self.open_tax_options)
         menubar.add_cascade(label="Profile", menu=profile_menu)
 
+        # RECORDS MENU
+        records_menu = tk.Menu(
+            menubar,
+            tearoff=0,
+            bg="#fff",
+            fg="#111",
+            activebackground="#fff",
+            activeforeground="#111"
+        )
+        records_menu.add_command(label="Import CSV…", command=self.open_import_dialog)
+        records_menu.add_command(label="Reconcile Bank Statement…", command=self.open_reconciliation_dialog)
+        menubar.add_cascade(label="Records", menu=records_menu)
+
+        # CLIENTS MENU
+        if self.clients:
+            clients_menu = tk.Menu(
+                menubar,
+                tearoff=0,
+                bg="#fff",
+                fg="#111",
+                activebackground="#fff",
+                activeforeground="#111"
+            )
+            clients_menu.add_command(label="Switch Client…", command=self.open_client_switcher)
+            menubar.add_cascade(label="Clients", menu=clients_menu)
+
         # ABOUT MENU
         about_menu = tk.Menu(
             menubar,
@@ -248,11 +350,49 @@ class MainWindow:
             activeforeground="#111"
         )
         about_menu.add_command(label="About", command=self.open_about)
+        about_menu.add_command(label="Diagnostics…", command=self.open_diagnostics)
         menubar.add_cascade(label="About", menu=about_menu)
 
         # Link menubar to root
+        self.menubar = menubar
         self.root.config(menu=menubar)
 
+    def toggle_diagnostics_menu(self, event=None):
+        if self.diagnostics_menu is not None:
+            self.menubar.delete("Diagnostics")
+            self.diagnostics_menu = None
+            return
+
+        self.diagnostics_menu = tk.Menu(
+            self.menubar,
+            tearoff=0,
+            bg="#fff",
+            fg="#111",
+            activebackground="#fff",
+            activeforeground="#111"
+        )
+        self.diagnostics_menu.add_command(label="UI Responsiveness…", command=self.open_responsiveness)
+        self.diagnostics_menu.add_command(label="Export UI Metrics…", command=self.export_ui_metrics)
+        self.menubar.add_cascade(label="Diagnostics", menu=self.diagnostics_menu)
+
+    def open_responsiveness(self):
+        from gui.responsiveness_dialog import ResponsivenessDialog
+        ResponsivenessDialog(self.root, self.watchdog)
+
+    def export_ui_metrics(self):
+        from tkinter import filedialog
+
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export UI metrics",
+            defaultextension=".json",
+            initialfile=f"ui_metrics_{datetime.now():%Y%m%d_%H%M%S}.json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if path:
+            self.watchdog.export(path)
+            self.notifications.notify("Diagnostics", f"UI metrics saved to {path}", level="success")
+
     # ================= LICENSE =================
     def on_license_success(self):
         messagebox.showinfo("License Activated", "License imported and activated!")
@@ -264,6 +404,72 @@ class MainWindow:
         from gui.about_dialog import AboutDialog
         AboutDialog(self.root)
 
+    def open_diagnostics(self):
+        from gui.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog(self.root, self.storage)
+
+    # ================= IMPORT =================
+    def open_import_dialog(self):
+        if not self.tracking_enabled:
+            self.notifications.notify("Import", "Import a license to add records.", level="warning")
+            return
+
+        from gui.import_dialog import ImportDialog
+
+        def on_complete(record_type, job):
+            # One refresh and one backup for the whole import
+            if record_type == "income":
+                self.vat_monitor.reconcile()
+            self.refresh_after_change({record_type})
+            self.notifications.notify(
+                "Import Complete",
+                f"Imported {job.inserted:,} {record_type} record(s).",
+                level="success"
+            )
+
+        ImportDialog(self.root, self.storage, self.journal, on_complete=on_complete)
+
+    # ================= CLIENTS =================
+    def open_client_switcher(self):
+        from gui.client_dialog import ClientDialog
+
+        # Refresh this client's cached totals so the list is current
+        self.clients.update_summary(self.client, self.storage)
+        ClientDialog(self.root, self.clients, self.client, on_open=self.switch_client)
+
+    def switch_client(self, slug):
+        if slug == self.client:
+            return
+
+        self.clients.update_summary(self.client, self.storage)
+        self.clients.set_active(slug)
+        app_state = self.clients.load_state(slug)
+        storage = self.pool.get(slug)
+
+        # Tear this window down; the next client gets a fresh one on the same root
+        self.notifications.clear()
+        if self.storage_service is not None:
+            self.storage_service.close(wait=False)  # queued backups still finish
+        self.search_box.panel.destroy()
+        self.main_container.destroy()
+        self.root.config(menu="")
+
+        root, clients, pool = self.root, self.clients, self.pool
+
+        def launch_main():
+            root.deiconify()
+            MainWindow(root, app_state, storage=storage, clients=clients, pool=pool)
+
+        if not app_state.is_configured:
+            from gui.setup_wizard import SetupWizard
+            SetupWizard(root=root, parent=root, app_state=app_state, on_complete=launch_main)
+        else:
+            launch_main()
+
+    def open_reconciliation_dialog(self):
+        from gui.reconciliation_dialog import ReconciliationDialog
+        ReconciliationDialog(self.root, self.storage, on_select=self.show_record)
+
     # ================= TABS =================
     def build_tabs(self):
         # Notebook (layout only)
@@ -340,7 +546,7 @@ class MainWindow:
                 self.income_quarter_dropdown.configure(state="normal")
             # only call load_income_table if table exists
             if hasattr(self, "income_table"):
-                self.load_income_table()  # refresh table whenever dropdown changes
+                self.reload_table("income")  # refresh table whenever dropdown changes
 
         # ---------------- VIEW DROPDOWN ----------------
         self.income_view_dropdown = ctk.CTkOptionMenu(
@@ -358,11 +564,7 @@ class MainWindow:
         self.income_view_dropdown.pack(side="left", padx=(0, 8))
 
         # ---------------- YEAR DROPDOWN ----------------
-        years = [r["year"] for r in self.storage.cursor.execute("""
-            SELECT DISTINCT strftime('%Y', date) AS year
-            FROM income
-            ORDER BY year DESC
-        """).fetchall()]
+        years = [str(year) for year in self.storage.get_years("income")]
 
         current_year = str(date.today().year)
         if current_year not in years:
@@ -380,8 +582,8 @@ class MainWindow:
             dropdown_hover_color="#246ae3",
             text_color="#ffffff"
         )
-        self.income_year_var.trace_add("write", lambda *args: self.load_income_table() if hasattr(self,
-                                                                                                  "income_table") else None)
+        self.income_year_var.trace_add("write", lambda *args: self.reload_table("income") if hasattr(self,
+                                                                                                    "income_table") else None)
         self.income_year_dropdown.pack(side="left", padx=8)
 
         # ---------------- QUARTER DROPDOWN ----------------
@@ -397,10 +599,13 @@ class MainWindow:
             dropdown_hover_color="#246ae3",
             text_color="#ffffff"
         )
-        self.income_quarter_var.trace_add("write", lambda *args: self.load_income_table() if hasattr(self,
-                                                                                                     "income_table") else None)
+        self.income_quarter_var.trace_add("write", lambda *args: self.reload_table("income") if hasattr(self,
+                                                                                                       "income_table") else None)
         self.income_quarter_dropdown.pack(side="left", padx=8)
 
+        # ---------------- RANGE FILTERS ----------------
+        self.build_range_filters(controls, "income")
+
         # ---------------- INITIALIZE QUARTER STATE ----------------
         # only call if table exists
         if hasattr(self, "income_table"):
@@ -468,6 +673,20 @@ class MainWindow:
         )
         self.undo_income_btn.pack(side="left", padx=10, pady=8)
 
+        self.redo_income_btn = ctk.CTkButton(
+            btns,
+            text="Redo",
+            height=BTN_HEIGHT,
+            corner_radius=BTN_RADIUS,
+            fg_color="#2042a1",
+            hover_color="#040f21",
+            text_color="#fff",
+            border_color="#2042a1",
+            border_width=2,
+            command=self.redo_action
+        )
+        self.redo_income_btn.pack(side="left", padx=10, pady=8)
+
         # ================= TABLE CARD =================
         self.income_table_card = ctk.CTkFrame(
             income_root,
@@ -485,13 +704,20 @@ class MainWindow:
             show="headings",
         )
 
-        # Set initial column headings and minimal config
+        # Set initial column headings and minimal config (click a heading to sort)
         for col in columns:
-            self.income_table.heading(col, text=col.replace("_", " ").title())
+            self.income_table.heading(
+                col,
+                text=col.replace("_", " ").title(),
+                command=lambda c=col: self.sort_table("income", c)
+            )
             self.income_table.column(col, anchor="center", stretch=False, width=140)
 
         self.income_table.pack(fill="both", expand=True, padx=5, pady=5)
 
+        self.build_pager(income_root, "income")
+        self.update_sort_headings("income")
+
         self.load_income_table()  # Your existing method to populate data
 
         # Adjust column widths initially and on resize
@@ -595,6 +821,14 @@ class MainWindow:
         )
         self.expense_quarter_dropdown.pack(side="left", padx=8)
 
+        # Reload whenever a dropdown changes (once the table exists)
+        for var in (self.expense_view_var, self.expense_year_var, self.expense_quarter_var):
+            var.trace_add("write", lambda *args: self.update_expense_quarter_state() if hasattr(self,
+                                                                                               "expense_table") else None)
+
+        # ---------------- RANGE FILTERS ----------------
+        self.build_range_filters(controls, "expense")
+
         # ================= ACTION BUTTONS =================
         btns = ctk.CTkFrame(expense_root, fg_color="#040f21")
         btns.pack(fill="x", padx=16, pady=(0, 10))
@@ -657,6 +891,20 @@ class MainWindow:
         )
         self.undo_expense_btn.pack(side="left", padx=10, pady=8)
 
+        self.redo_expense_btn = ctk.CTkButton(
+            btns,
+            text="Redo",
+            height=BTN_HEIGHT,
+            corner_radius=BTN_RADIUS,
+            fg_color="#2042a1",
+            hover_color="#040f21",
+            text_color="#fff",
+            border_color="#2042a1",
+            border_width=2,
+            command=self.redo_action
+        )
+        self.redo_expense_btn.pack(side="left", padx=10, pady=8)
+
         # ================= TABLE CARD =================
         self.expense_table_card = ctk.CTkFrame(
             expense_root,
@@ -674,13 +922,20 @@ class MainWindow:
             show="headings"
         )
 
-        # Set initial column headings and minimal config
+        # Set initial column headings and minimal config (click a heading to sort)
         for col in columns:
-            self.expense_table.heading(col, text=col.replace("_", " ").title())
+            self.expense_table.heading(
+                col,
+                text=col.replace("_", " ").title(),
+                command=lambda c=col: self.sort_table("expense", c)
+            )
             self.expense_table.column(col, anchor="center", stretch=False, width=140)
 
         self.expense_table.pack(fill="both", expand=True, padx=5, pady=5)
 
+        self.build_pager(expense_root, "expense")
+        self.update_sort_headings("expense")
+
         self.load_expense_table()  # Your existing method to populate data
 
         # Adjust column widths initially and on resize
@@ -708,12 +963,7 @@ class MainWindow:
     # ================= LOAD TABLES =================
     def update_income_years_dropdown(self):
         """Refresh the year dropdown based on actual income data."""
-        # Get all distinct years in the income table
-        years = [row["year"] for row in self.storage.cursor.execute("""
-            SELECT DISTINCT strftime('%Y', date) AS year
-            FROM income
-            ORDER BY year DESC
-        """).fetchall()]
+        years = [str(year) for year in self.storage.get_years("income")]
 
         current_year = str(date.today().year)
         if current_year not in years:
@@ -726,48 +976,67 @@ class MainWindow:
         if self.income_year_var.get() not in years:
             self.income_year_var.set(current_year)
 
+    def update_expense_years_dropdown(self):
+        """Refresh the year dropdown based on actual expense data."""
+        years = [str(year) for year in self.storage.get_years("expense")]
+
+        current_year = str(date.today().year)
+        if current_year not in years:
+            years.insert(0, current_year)
+
+        self.expense_year_dropdown.configure(values=years)
+
+        if self.expense_year_var.get() not in years:
+            self.expense_year_var.set(current_year)
+
+    def query_table_page(self, kind, year_var, view_var, quarter_var):
+        """Counts and fetches the current page of a table; filtering, sorting and paging run in SQL."""
+        state = self.table_state[kind]
+        filters = {
+            "year": int(year_var.get()),
+            "quarter": quarter_var.get() if view_var.get() == "Quarter" else None,
+            "amount_min": state["amount_min"],
+            "amount_max": state["amount_max"],
+            "atcs": state["atcs"],
+        }
+
+        if kind == "income":
+            total = self.storage.count_income(**filters)
+            get_page = self.storage.get_income_page
+        else:
+            total = self.storage.count_expense(**filters)
+            get_page = self.storage.get_expense_page
+
+        # Stay on a page that exists (e.g. after deleting the last rows)
+        last_page = max(0, (total - 1) // PAGE_SIZE)
+        state["page"] = min(state["page"], last_page)
+
+        rows = get_page(
+            **filters,
+            order_by=state["order_by"],
+            descending=state["descending"],
+            limit=PAGE_SIZE,
+            offset=state["page"] * PAGE_SIZE
+        )
+        self.update_pager(kind, total)
+        return rows
+
     def load_income_table(self):
         self.update_income_years_dropdown()
 
         # Clear table
-        for row in self.income_table.get_children():
-            self.income_table.delete(row)
-
-        all_incomes = self.storage.get_all_income()
-
-        # ----------------- Year filter -----------------
-        years = sorted({int(rec["date"][:4]) for rec in all_incomes})
-        if not years:
-            years = [date.today().year]
-        self.income_year_dropdown['values'] = years
-
-        selected_year = self.income_year_var.get()
-        if selected_year not in map(str, years):
-            selected_year = str(years[-1])
-            self.income_year_var.set(selected_year)
-
-        filtered_incomes = [inc for inc in all_incomes if inc["date"].startswith(selected_year)]
-
-        # ----------------- Quarter filter -----------------
-        if self.income_view_var.get() == "Quarter":
-            quarter = self.income_quarter_var.get()
-            month_start = {"Q1": 1, "Q2": 4, "Q3": 7, "Q4": 10}[quarter]
-            month_end = month_start + 2
-            filtered_incomes = [
-                inc for inc in filtered_incomes
-                if month_start <= int(inc["date"][5:7]) <= month_end
-            ]
-        # No state changes here — handled in update_income_quarter_state()
+        self.income_table.delete(*self.income_table.get_children())
+
+        incomes = self.query_table_page(
+            "income", self.income_year_var, self.income_view_var, self.income_quarter_var
+        )
 
         # ----------------- Populate table -----------------
-        for income in filtered_incomes:
-            iid = str(income["id"])
-            if iid in self.income_table.get_children():  # remove duplicate if exists
-                self.income_table.delete(iid)
+        for income in incomes:
             self.income_table.insert(
                 "",
                 "end",
-                iid=iid,
+                iid=str(income["id"]),
                 values=(
                     income["date"],
                     f"₱{income['gross_income']:,.2f}",
@@ -779,45 +1048,21 @@ class MainWindow:
             )
 
     def load_expense_table(self):
+        self.update_expense_years_dropdown()
+
         # Clear table
-        for row in self.expense_table.get_children():
-            self.expense_table.delete(row)
-
-        all_expenses = self.storage.get_all_expense()
-
-        # ----------------- Year filter -----------------
-        years = sorted({int(rec["date"][:4]) for rec in all_expenses})
-        if not years:
-            years = [date.today().year]
-        self.expense_year_dropdown['values'] = years
-
-        selected_year = self.expense_year_var.get()
-        if selected_year not in map(str, years):
-            selected_year = str(years[-1])
-            self.expense_year_var.set(selected_year)
-
-        filtered_expenses = [exp for exp in all_expenses if exp["date"].startswith(selected_year)]
-
-        # ----------------- Quarter filter -----------------
-        if self.expense_view_var.get() == "Quarter":
-            quarter = self.expense_quarter_var.get()
-            month_start = {"Q1": 1, "Q2": 4, "Q3": 7, "Q4": 10}[quarter]
-            month_end = month_start + 2
-            filtered_expenses = [
-                exp for exp in filtered_expenses
-                if month_start <= int(exp["date"][5:7]) <= month_end
-            ]
-        # No state changes here — handled in update_expense_quarter_state()
+        self.expense_table.delete(*self.expense_table.get_children())
+
+        expenses = self.query_table_page(
+            "expense", self.expense_year_var, self.expense_view_var, self.expense_quarter_var
+        )
 
         # ----------------- Populate table -----------------
-        for expense in filtered_expenses:
-            iid = str(expense["id"])
-            if iid in self.expense_table.get_children():  # remove duplicate if exists
-                self.expense_table.delete(iid)
+        for expense in expenses:
             self.expense_table.insert(
                 "",
                 "end",
-                iid=iid,
+                iid=str(expense["id"]),
                 values=(
                     expense["date"],
                     f"₱{expense['gross_expense']:,.2f}",
@@ -828,42 +1073,284 @@ class MainWindow:
                 )
             )
 
+    def reload_table(self, kind):
+        """Filters changed: go back to the first page and reload."""
+        self.table_state[kind]["page"] = 0
+        if kind == "income":
+            self.load_income_table()
+        else:
+            self.load_expense_table()
+
+    def show_record(self, record_type, record_id):
+        """Open the tab, year and page that contain a record and select it (used by search)."""
+        position = self.storage.get_record_position(record_type, record_id)
+        if position is None:
+            self.notifications.notify("Search", "That record no longer exists.")
+            return
+        year, index = position
+
+        if record_type == "income":
+            tab, table = self.income_tab, self.income_table
+            view_var, year_var = self.income_view_var, self.income_year_var
+        else:
+            tab, table = self.expense_tab, self.expense_table
+            view_var, year_var = self.expense_view_var, self.expense_year_var
+
+        self.tabs.select(tab)
+
+        # Whole year in date order, no range filters, so the position is exact
+        state = self.table_state[record_type]
+        for var in (state["min_var"], state["max_var"], state["atc_var"]):
+            var.set("")
+        state["amount_min"] = state["amount_max"] = state["atcs"] = None
+        state["order_by"], state["descending"] = "date", False
+        self.update_sort_headings(record_type)
+        view_var.set("Annual")
+        year_var.set(str(year))
+
+        state["page"] = index // PAGE_SIZE
+        if record_type == "income":
+            self.load_income_table()
+        else:
+            self.load_expense_table()
+
+        iid = str(record_id)
+        if table.exists(iid):
+            table.selection_set(iid)
+            table.see(iid)
+
+    # ================= SORTING / FILTERS / PAGING =================
+    def sort_table(self, kind, column):
+        state = self.table_state[kind]
+        if state["order_by"] == column:
+            state["descending"] = not state["descending"]
+        else:
+            state["order_by"] = column
+            state["descending"] = False
+
+        self.update_sort_headings(kind)
+        self.reload_table(kind)
+
+    def update_sort_headings(self, kind):
+        table = self.income_table if kind == "income" else self.expense_table
+        state = self.table_state[kind]
+
+        for col in table["columns"]:
+            text = col.replace("_", " ").title()
+            if col == state["order_by"]:
+                text += " ▼" if state["descending"] else " ▲"
+            table.heading(col, text=text)
+
+    def build_range_filters(self, parent, kind):
+        state = self.table_state[kind]
+        state["min_var"] = tk.StringVar()
+        state["max_var"] = tk.StringVar()
+        state["atc_var"] = tk.StringVar()
+
+        entry_style = dict(
+            fg_color="#1f2a38",
+            text_color="white",
+            corner_radius=8,
+            border_width=2,
+            border_color="#365580",
+            height=28
+        )
+
+        ctk.CTkEntry(
+            parent, textvariable=state["min_var"], width=110, placeholder_text="Amount from", **entry_style
+        ).pack(side="left", padx=(24, 4))
+        ctk.CTkEntry(
+            parent, textvariable=state["max_var"], width=110, placeholder_text="Amount to", **entry_style
+        ).pack(side="left", padx=4)
+        ctk.CTkEntry(
+            parent, textvariable=state["atc_var"], width=160, placeholder_text="ATC (e.g. WI010, WC010)", **entry_style
+        ).pack(side="left", padx=4)
+
+        ctk.CTkButton(
+            parent,
+            text="Filter",
+            width=70,
+            height=28,
+            fg_color="#2b3545",
+            hover_color="#246ae3",
+            command=lambda: self.apply_range_filters(kind)
+        ).pack(side="left", padx=4)
+
+        ctk.CTkButton(
+            parent,
+            text="Clear",
+            width=70,
+            height=28,
+            fg_color="#2b3545",
+            hover_color="#246ae3",
+            command=lambda: self.clear_range_filters(kind)
+        ).pack(side="left", padx=4)
+
+    def apply_range_filters(self, kind):
+        state = self.table_state[kind]
+
+        try:
+            amounts = [
+                float(var.get().replace(",", "")) if var.get().strip() else None
+                for var in (state["min_var"], state["max_var"])
+            ]
+        except ValueError:
+            self.notifications.notify("Filter", "Amounts must be numbers.", level="error")
+            return
+
+        state["amount_min"], state["amount_max"] = amounts
+        atcs = [code.strip() for code in state["atc_var"].get().split(",") if code.strip()]
+        state["atcs"] = atcs or None
+        self.reload_table(kind)
+
+    def clear_range_filters(self, kind):
+        state = self.table_state[kind]
+        for var in (state["min_var"], state["max_var"], state["atc_var"]):
+            var.set("")
+        state["amount_min"] = state["amount_max"] = state["atcs"] = None
+        self.reload_table(kind)
+
+    def build_pager(self, parent, kind):
+        state = self.table_state[kind]
+
+        pager = ctk.CTkFrame(parent, fg_color="#040f21")
+        pager.pack(fill="x", padx=16, pady=(0, 10))
+
+        ctk.CTkButton(
+            pager,
+            text="◀ Prev",
+            width=80,
+            height=28,
+            fg_color="#2b3545",
+            hover_color="#246ae3",
+            command=lambda: self.change_page(kind, -1)
+        ).pack(side="left")
+
+        state["page_label"] = ctk.CTkLabel(pager, text="", text_color="#b6c2d4", font=("Segoe UI", 12))
+        state["page_label"].pack(side="left", padx=12)
+
+        ctk.CTkButton(
+            pager,
+            text="Next ▶",
+            width=80,
+            height=28,
+            fg_color="#2b3545",
+            hover_color="#246ae3",
+            command=lambda: self.change_page(kind, 1)
+        ).pack(side="left")
+
+    def update_pager(self, kind, total):
+        state = self.table_state[kind]
+        state["total"] = total
+        if "page_label" not in state:
+            return  # pager is built right after the first load
+
+        pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+        state["page_label"].configure(text=f"Page {state['page'] + 1} of {pages}  ·  {total:,} records")
+
+    def change_page(self, kind, step):
+        state = self.table_state[kind]
+        pages = max(1, (state.get("total", 0) + PAGE_SIZE - 1) // PAGE_SIZE)
+        page = min(max(0, state["page"] + step), pages - 1)
+        if page == state["page"]:
+            return
+
+        state["page"] = page
+        if kind == "income":
+            self.load_income_table()
+        else:
+            self.load_expense_table()
+
     # ================= QUARTER STATE =================
     def update_income_quarter_state(self):
         if self.income_view_var.get() == "Annual":
-            #self.income_quarter_label.grid_forget()  # Hide "Quarter" label
             self.income_quarter_dropdown.configure(state="disabled")
         else:
-            self.income_quarter_label.grid(row=0, column=4, padx=10)  # Show "Quarter" label
-            self.income_quarter_dropdown.configure(state="readonly")
-        self.load_income_table()
+            self.income_quarter_dropdown.configure(state="normal")
+        self.reload_table("income")
 
     def update_expense_quarter_state(self):
         if self.expense_view_var.get() == "Annual":
-            # self.expense_quarter_label.grid_forget()  # Hide "Quarter" label
             self.expense_quarter_dropdown.configure(state="disabled")
         else:
-            self.expense_quarter_label.grid(row=0, column=4, padx=10)  # Show "Quarter" label
-            self.expense_quarter_dropdown.configure(state="readonly")
-        self.load_expense_table()
+            self.expense_quarter_dropdown.configure(state="normal")
+        self.reload_table("expense")
 
     # ================= ADD / EDIT / DELETE / UNDO =================
-    def add_income(self):
-        def on_save(new_id):
-            self.undo_stack.append({"action": "add", "type": "income", "record_id": new_id, "old_data": None})
+    def refresh_after_change(self, record_types):
+        """Reload and back up only what changed (record_types: {"income", "expense"})."""
+        if "income" in record_types:
             self.load_income_table()
-            backup_income(self.storage)
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            self.reports_tab.load_report_years()
-            self.reports_tab.refresh()
+        if "expense" in record_types:
+            self.load_expense_table()
+
+        self.schedule_backup(record_types, [datetime.now().year])
+        self.reports_tab.invalidate_years()
+        self.reports_tab.load_report_years()
+        self.reports_tab.refresh()
 
-            # --- new: check VAT threshold immediately ---
+        # Only income counts toward the VAT threshold
+        if "income" in record_types:
             self.check_vat_threshold()
-            # --- optional: check filing reminders ---
-            self.safe_check_filing_reminders()
+        # --- optional: check filing reminders ---
+        self.safe_check_filing_reminders()
+
+    # ================= BACKUPS =================
+    def schedule_backup(self, record_types, summary_years):
+        """
+        Backs up the CSVs of record_types and the summaries of summary_years
+        on a read connection, off the Tk thread. Requests made while a backup
+        is running are merged into one run after it, so a file is never
+        written by two threads at once.
+        """
+        self.pending_backup["types"].update(record_types)
+        self.pending_backup["years"].update(summary_years)
+
+        if self.storage.db_file is None:
+            # An in-memory database cannot be opened by another connection
+            self.run_pending_backup_here()
+        elif self.backup_future is None:
+            self.start_backup()
+
+    def take_pending_backup(self):
+        pending = self.pending_backup
+        self.pending_backup = {"types": set(), "years": set()}
+        return pending["types"], sorted(pending["years"])
+
+    def run_pending_backup_here(self):
+        record_types, years = self.take_pending_backup()
+        run_backups(self.storage, self.app_state, self.backup_dir, record_types, years)
+
+    def start_backup(self):
+        from core.storage_service import StorageService, call_when_done
+
+        if self.storage_service is None:
+            self.storage_service = StorageService(self.storage.db_file)
+        record_types, years = self.take_pending_backup()
+        self.backup_future = self.storage_service.read(
+            run_backups, self.app_state, self.backup_dir, record_types, years
+        )
+        call_when_done(self.root, self.backup_future, self.backup_finished, on_error=self.backup_failed)
+
+    def backup_finished(self, _result=None):
+        self.backup_future = None
+        if self.pending_backup["types"] or self.pending_backup["years"]:
+            self.start_backup()
+
+    def backup_failed(self, error):
+        self.notifications.notify("Backup", f"Backup failed: {error}", level="error", key="backup-failed")
+        self.backup_finished()
+
+    def add_income(self):
+        from gui.income_form import IncomeForm
+
+        def on_save(new_id):
+            self.journal.record("income", "add", new_id)
+            self.vat_monitor.apply(new=self.storage.get_income(new_id))
+            self.refresh_after_change({"income"})
 
         self.root.withdraw()
-        IncomeForm(self.root, self.storage, refresh_callback=on_save)
+        IncomeForm(self.root, self.storage, refresh_callback=on_save, notify=self.notifications.notify)
         # IncomeForm(self.root, self.storage, refresh_callback=on_save).wait_window()
 
     def edit_selected_income(self):
@@ -872,62 +1359,49 @@ class MainWindow:
             messagebox.showwarning("No Selection", "Please select a record to edit.")
             return
         record_id = int(selected[0])
-        record = next(i for i in self.storage.get_all_income() if i["id"] == record_id)
+        record = self.storage.get_income(record_id)
         before_edit = record.copy()
 
         def on_save(updated_id):
-            self.undo_stack.append({"action": "edit", "type": "income", "record_id": updated_id, "old_data": before_edit})
-            self.load_income_table()
-            backup_income(self.storage)
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            self.reports_tab.load_report_years()
-            self.reports_tab.refresh()
+            after_edit = self.storage.get_income(updated_id)
+            self.journal.record("income", "edit", updated_id, old=before_edit, new=after_edit)
+            self.vat_monitor.apply(old=before_edit, new=after_edit)
+            self.refresh_after_change({"income"})
 
-            # --- new: check VAT threshold immediately ---
-            self.check_vat_threshold()
-            # --- optional: check filing reminders ---
-            self.safe_check_filing_reminders()
+        from gui.income_form import IncomeForm
 
         self.root.withdraw()
-        IncomeForm(self.root, self.storage, record, refresh_callback=on_save)
+        IncomeForm(self.root, self.storage, record, refresh_callback=on_save, notify=self.notifications.notify)
 
     def delete_selected_income(self):
         selected = self.income_table.selection()
         if not selected:
             messagebox.showwarning("No Selection", "Please select a record to delete.")
             return
-        record_id = int(selected[0])
-        record = next(i for i in self.storage.get_all_income() if i["id"] == record_id)
 
-        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this income record?"):
-            self.undo_stack.append({"action": "delete", "type": "income", "record_id": None, "old_data": record})
-            self.storage.delete_income(record_id)
-            self.load_income_table()
-            backup_income(self.storage)
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            self.reports_tab.load_report_years()
-            self.reports_tab.refresh()
-            # --- new: check VAT threshold immediately ---
-            self.check_vat_threshold()
-            # --- optional: check filing reminders ---
-            self.safe_check_filing_reminders()
+        prompt = (
+            "Are you sure you want to delete this income record?" if len(selected) == 1
+            else f"Are you sure you want to delete these {len(selected)} income records?"
+        )
+        if messagebox.askyesno("Confirm Delete", prompt):
+            # All selected rows are one undo step
+            with self.journal.group():
+                for iid in selected:
+                    record = self.storage.get_income(int(iid))
+                    self.storage.delete_income(record["id"])
+                    self.journal.record("income", "delete", record["id"], old=record)
+                    self.vat_monitor.apply(old=record)
+            self.refresh_after_change({"income"})
 
     def add_expense(self):
-        def on_save(new_id):
-            self.undo_stack.append({"action": "add", "type": "expense", "record_id": new_id, "old_data": None})
-            self.load_expense_table()
-            backup_expense(self.storage)
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            self.reports_tab.load_report_years()
-            self.reports_tab.refresh()
+        from gui.expense_form import ExpenseForm
 
-            # --- new: check VAT threshold immediately ---
-            self.check_vat_threshold()
-            # --- optional: check filing reminders ---
-            self.safe_check_filing_reminders()
+        def on_save(new_id):
+            self.journal.record("expense", "add", new_id)
+            self.refresh_after_change({"expense"})
 
         self.root.withdraw()
-        ExpenseForm(self.root, self.storage, refresh_callback=on_save)
+        ExpenseForm(self.root, self.storage, refresh_callback=on_save, notify=self.notifications.notify)
         # ExpenseForm(self.root, self.storage, refresh_callback=on_save).wait_window()
 
     def edit_selected_expense(self):
@@ -936,89 +1410,54 @@ class MainWindow:
             messagebox.showwarning("No Selection", "Please select a record to edit.")
             return
         record_id = int(selected[0])
-        record = next(i for i in self.storage.get_all_expense() if i["id"] == record_id)
+        record = self.storage.get_expense(record_id)
         before_edit = record.copy()
 
         def on_save(updated_id):
-            self.undo_stack.append({"action": "edit", "type": "expense", "record_id": updated_id, "old_data": before_edit})
-            self.load_expense_table()
-            backup_expense(self.storage)
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            self.reports_tab.load_report_years()
-            self.reports_tab.refresh()
+            self.journal.record("expense", "edit", updated_id, old=before_edit, new=self.storage.get_expense(updated_id))
+            self.refresh_after_change({"expense"})
 
-            # --- new: check VAT threshold immediately ---
-            self.check_vat_threshold()
-            # --- optional: check filing reminders ---
-            self.safe_check_filing_reminders()
+        from gui.expense_form import ExpenseForm
 
         self.root.withdraw()
-        ExpenseForm(self.root, self.storage, record, refresh_callback=on_save)
+        ExpenseForm(self.root, self.storage, record, refresh_callback=on_save, notify=self.notifications.notify)
 
     def delete_selected_expense(self):
         selected = self.expense_table.selection()
         if not selected:
             messagebox.showwarning("No Selection", "Please select a record to delete.")
             return
-        record_id = int(selected[0])
-        record = next(i for i in self.storage.get_all_expense() if i["id"] == record_id)
 
-        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this expense record?"):
-            self.undo_stack.append({"action": "delete", "type": "expense", "record_id": None, "old_data": record})
-            self.storage.delete_expense(record_id)
-            self.load_expense_table()
-            backup_expense(self.storage)
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            self.reports_tab.load_report_years()
-            self.reports_tab.refresh()
-            # --- new: check VAT threshold immediately ---
-            self.check_vat_threshold()
-            # --- optional: check filing reminders ---
-            self.safe_check_filing_reminders()
+        prompt = (
+            "Are you sure you want to delete this expense record?" if len(selected) == 1
+            else f"Are you sure you want to delete these {len(selected)} expense records?"
+        )
+        if messagebox.askyesno("Confirm Delete", prompt):
+            # All selected rows are one undo step
+            with self.journal.group():
+                for iid in selected:
+                    record = self.storage.get_expense(int(iid))
+                    self.storage.delete_expense(record["id"])
+                    self.journal.record("expense", "delete", record["id"], old=record)
+            self.refresh_after_change({"expense"})
 
     def undo_action(self):
-        if not self.undo_stack:
-            messagebox.showinfo("Undo", "Nothing to undo.")
+        touched = self.journal.undo()
+        if not touched:
+            self.notifications.notify("Undo", "Nothing to undo.")
             return
-
-        last = self.undo_stack.pop()
-        action = last["action"]
-        rtype = last["type"]
-        rid = last.get("record_id")
-        old = last.get("old_data")
-
-        if action == "add":
-            if rtype == "income":
-                self.storage.delete_income(rid)
-                self.load_income_table()
-            else:
-                self.storage.delete_expense(rid)
-                self.load_expense_table()
-        elif action == "delete":
-            if rtype == "income":
-                self.storage.restore_income(old)
-                self.load_income_table()
-            else:
-                self.storage.restore_expense(old)
-                self.load_expense_table()
-        elif action == "edit":
-            if rtype == "income":
-                self.storage.update_income(rid, old)
-                self.load_income_table()
-            else:
-                self.storage.update_expense(rid, old)
-                self.load_expense_table()
-
-        backup_income(self.storage)
-        backup_expense(self.storage)
-        current_year = datetime.now().year
-        backup_summary(self.storage, self.app_state, current_year)
-        self.reports_tab.load_report_years()
-        self.reports_tab.refresh()
-        # --- new: check VAT threshold immediately ---
-        self.check_vat_threshold()
-        # --- optional: check filing reminders ---
-        self.safe_check_filing_reminders()
+        if "income" in touched:
+            self.vat_monitor.reconcile()
+        self.refresh_after_change(touched)
+
+    def redo_action(self):
+        touched = self.journal.redo()
+        if not touched:
+            self.notifications.notify("Redo", "Nothing to redo.")
+            return
+        if "income" in touched:
+            self.vat_monitor.reconcile()
+        self.refresh_after_change(touched)
 
     # ================= LICENSE & PROFILE =================
     def check_existing_license(self):
@@ -1090,26 +1529,60 @@ class MainWindow:
 
     # VAT THRESHOLD NOTIF
     def check_vat_threshold(self):
-        current_year = datetime.now().year
-        gross_income = self.storage.get_year_gross_income(current_year)
-
-        if gross_income >= 3_000_000:
-            messagebox.showwarning(
+        # Running total kept by the monitor; no query unless it is due to reconcile
+        tier = self.vat_monitor.current_tier()
+        current_year = self.vat_monitor.year
+        gross_income = self.vat_monitor.total
+
+        if tier is not None and tier >= 1.0:
+            # Shown once per year per session window instead of after every save
+            self.notifications.notify(
                 "⚠ VAT Threshold Reached",
                 "Your recorded gross sales have reached ₱3,000,000 "
-                f"for the year {current_year}.\n\n"
-                "Under BIR rules, businesses that exceed this threshold "
-                "are required to register as VAT.\n\n"
-                "This system is designed for NON-VAT businesses only.\n\n"
-                "You may continue viewing past records, but new entries "
-                "may no longer reflect correct tax computations.\n\n"
-                "We strongly recommend consulting a licensed accountant "
-                "or BIR officer to guide your VAT registration and compliance."
+                f"for the year {current_year}. Businesses above this threshold "
+                "are required to register as VAT; this system is designed for "
+                "NON-VAT businesses only. Please consult a licensed accountant "
+                "or BIR officer about VAT registration.",
+                level="error",
+                key=f"vat:{current_year}",
+                duration_ms=15000
+            )
+            return
+
+        if tier is not None:
+            self.notifications.notify(
+                "VAT Threshold Approaching",
+                f"Your recorded gross sales for {current_year} are ₱{gross_income:,.2f}, "
+                f"{gross_income / VAT_THRESHOLD:.0%} of the ₱3,000,000 VAT threshold.",
+                level="warning",
+                key=f"vat:{current_year}:{tier:.2f}",
+                duration_ms=10000
+            )
+            return
+
+        # Early warning: projected to cross the threshold later this year.
+        # Only right after the monitor re-read the total, not on every save.
+        if self.vat_monitor.writes:
+            return
+        projection = project_year(self.storage, self.app_state, current_year)
+        crossing = projection["vat_crossing"]
+        if crossing:
+            self.notifications.notify(
+                "VAT Threshold Ahead",
+                f"At your current pace, gross sales for {current_year} will reach "
+                f"₱3,000,000 around {crossing:%B %d} (projected year-end: "
+                f"₱{projection['gross_income']:,.2f}). Plan for VAT registration "
+                "before you cross it.",
+                level="warning",
+                key=f"vat-projection:{current_year}",
+                duration_ms=10000
             )
 
     def show_license_popup(self):
         """Open license import dialog."""
 
+        from gui.license_dialog import LicenseDialog
+
         def on_success():
             self.enable_features()  # enable features after successful import
 
@@ -1122,8 +1595,8 @@ class MainWindow:
 
         # Enable buttons safely
         for btn_name in [
-            "add_income_btn", "edit_income_btn", "delete_income_btn", "undo_income_btn",
-            "add_expense_btn", "edit_expense_btn", "delete_expense_btn", "undo_expense_btn"
+            "add_income_btn", "edit_income_btn", "delete_income_btn", "undo_income_btn", "redo_income_btn",
+            "add_expense_btn", "edit_expense_btn", "delete_expense_btn", "undo_expense_btn", "redo_expense_btn"
         ]:
             if hasattr(self, btn_name):
                 getattr(self, btn_name).configure(state="normal")
@@ -1134,23 +1607,37 @@ class MainWindow:
 
     def open_license_dialog(self):
         # print("MENU CLICKED")
+        from gui.license_dialog import LicenseDialog
+
         LicenseDialog(self.root, on_success=self.on_license_success)
 
+    def open_tax_options(self):
+        from gui.tax_options_dialog import TaxOptionsDialog
+        TaxOptionsDialog(self.root, self.storage, self.app_state)
+
     #PROFILE
     def open_edit_profile(self):
+        from gui.setup_wizard import SetupWizard
+
+        # Past years keep the election they were filed under; the edit
+        # applies to the current year (and any later years on record)
+        current_year = datetime.now().year
+        record_years = set(self.storage.get_record_years()) | {current_year}
+        self.app_state.pin_years(year for year in record_years if year < current_year)
+        before = self.app_state.profile_for(current_year)
+
         def profile_updated():
             messagebox.showinfo("Profile Updated", "Your profile has been updated successfully.")
 
-            # Refresh summary and tables immediately
-            self.reports_tab.refresh()  # update reports/summary
-            self.load_income_table()  # reload income table if needed
-            self.load_expense_table()  # reload expense table if needed
+            if self.app_state.profile_for(current_year) == before:
+                return
 
-            # Trigger backups
-            from core.backup import backup_summary, backup_income, backup_expense
-            backup_summary(self.storage, self.app_state, datetime.now().year)
-            backup_income(self.storage)
-            backup_expense(self.storage)
+            # Records and their backups do not depend on the profile; only
+            # the tax figures of the years using it change
+            affected = self.app_state.years_using_current_profile(sorted(record_years))
+            self.reports_tab.invalidate_years(affected)
+            self.reports_tab.refresh()
+            self.schedule_backup((), affected)
 
         wizard = SetupWizard(
             root=self.root,
@@ -1172,7 +1659,9 @@ class MainWindow:
 
         for btn in [
             self.add_income_btn, self.edit_income_btn, self.delete_income_btn, self.undo_income_btn,
-            self.add_expense_btn, self.edit_expense_btn, self.delete_expense_btn, self.undo_expense_btn
+            self.redo_income_btn,
+            self.add_expense_btn, self.edit_expense_btn, self.delete_expense_btn, self.undo_expense_btn,
+            self.redo_expense_btn
         ]:
             btn.configure(state=state)
 
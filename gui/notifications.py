@@ -0,0 +1,158 @@
+import time
+from collections import deque
+
+import customtkinter as ctk
+
+LEVEL_COLORS = {
+    "info": "#2042a1",
+    "success": "#1f7a4d",
+    "warning": "#b7791f",
+    "error": "#ab3226",
+}
+
+
+class NotificationCenter:
+    """
+    Non-blocking toast notifications stacked in the bottom-right corner of the
+    main window. Replaces modal message boxes on hot paths (saving, undo,
+    threshold checks) so rapid data entry never has to stop for a click.
+
+    - Identical toasts that are already on screen or waiting are coalesced.
+    - Toasts with a `key` are shown at most once per `dedupe_seconds`.
+    - At most `max_visible` toasts are on screen, at most `max_queue` wait,
+      and new ones appear no faster than one per `min_interval_ms`.
+    """
+
+    def __init__(self, root, max_visible=3, max_queue=20, duration_ms=4000,
+                 min_interval_ms=300, dedupe_seconds=1800):
+        self.root = root
+        self.max_visible = max_visible
+        self.max_queue = max_queue
+        self.duration_ms = duration_ms
+        self.min_interval_ms = min_interval_ms
+        self.dedupe_seconds = dedupe_seconds
+
+        self.queue = deque()
+        self.visible = []
+        self.last_seen = {}
+        self.last_shown_at = 0.0
+        self.pump_job = None
+
+    # ================= PUBLIC =================
+    def notify(self, title, message, level="info", key=None, duration_ms=None) -> bool:
+        """Queue a toast. Returns False if it was dropped as a repeat."""
+        now = time.monotonic()
+
+        if key is not None:
+            last = self.last_seen.get(key)
+            if last is not None and now - last < self.dedupe_seconds:
+                return False
+            self.last_seen[key] = now
+
+        # Coalesce with the same toast if it is still on screen or waiting
+        for toast in self.visible:
+            if toast["title"] == title and toast["message"] == message:
+                self._restart_timer(toast)
+                return False
+        for pending in self.queue:
+            if pending["title"] == title and pending["message"] == message:
+                return False
+
+        if len(self.queue) >= self.max_queue:
+            self.queue.popleft()  # oldest pending toast is the least relevant
+
+        self.queue.append({
+            "title": title,
+            "message": message,
+            "level": level,
+            "duration_ms": duration_ms or self.duration_ms,
+        })
+        if self.pump_job is None:
+            self._pump()
+        return True
+
+    def clear(self):
+        self.queue.clear()
+        for toast in list(self.visible):
+            self._dismiss(toast)
+
+    # ================= INTERNALS =================
+    def _pump(self):
+        self.pump_job = None
+        if not self.queue or len(self.visible) >= self.max_visible:
+            return
+
+        wait_ms = int(self.min_interval_ms - (time.monotonic() - self.last_shown_at) * 1000)
+        if wait_ms > 0:
+            self.pump_job = self.root.after(wait_ms, self._pump)
+            return
+
+        self._show(self.queue.popleft())
+        if self.queue:
+            self.pump_job = self.root.after(self.min_interval_ms, self._pump)
+
+    def _show(self, toast):
+        color = LEVEL_COLORS.get(toast["level"], LEVEL_COLORS["info"])
+
+        frame = ctk.CTkFrame(
+            self.root,
+            fg_color="#111827",
+            corner_radius=10,
+            border_width=2,
+            border_color=color
+        )
+
+        ctk.CTkLabel(
+            frame,
+            text=toast["title"],
+            font=("Segoe UI", 13, "bold"),
+            text_color="#ffffff",
+            anchor="w"
+        ).pack(fill="x", padx=14, pady=(10, 0))
+
+        ctk.CTkLabel(
+            frame,
+            text=toast["message"],
+            font=("Segoe UI", 12),
+            text_color="#b6c2d4",
+            wraplength=320,
+            justify="left",
+            anchor="w"
+        ).pack(fill="x", padx=14, pady=(2, 10))
+
+        toast["frame"] = frame
+        toast["job"] = None
+
+        # Click anywhere on the toast to dismiss it
+        for widget in [frame] + frame.winfo_children():
+            widget.bind("<Button-1>", lambda e, t=toast: self._dismiss(t))
+
+        self.visible.append(toast)
+        self.last_shown_at = time.monotonic()
+        self._restart_timer(toast)
+        self._restack()
+
+    def _restart_timer(self, toast):
+        if toast.get("job"):
+            self.root.after_cancel(toast["job"])
+        toast["job"] = self.root.after(toast["duration_ms"], lambda: self._dismiss(toast))
+
+    def _dismiss(self, toast):
+        if toast not in self.visible:
+            return
+        if toast.get("job"):
+            self.root.after_cancel(toast["job"])
+        self.visible.remove(toast)
+        toast["frame"].destroy()
+        self._restack()
+        if self.pump_job is None:
+            self._pump()
+
+    def _restack(self):
+        self.root.update_idletasks()
+        offset = 20
+        for toast in reversed(self.visible):
+            frame = toast["frame"]
+            frame.place(relx=1.0, rely=1.0, anchor="se", x=-20, y=-offset)
+            frame.lift()
+            offset += frame.winfo_reqheight() + 10
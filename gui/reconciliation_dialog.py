@@ -0,0 +1,177 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+import customtkinter as ctk
+
+from core.importer import CsvImportError
+from core.reconciliation import Reconciler
+
+
+class ReconciliationDialog(tk.Toplevel):
+    """
+    Matches a bank statement against the recorded income and expenses and
+    lists what did not match: statement lines with no record (missing
+    entries) and records in the statement period with no line.
+    Double-clicking a record opens it in the main window.
+    """
+
+    def __init__(self, parent, storage, on_select):
+        super().__init__(parent)
+        self.reconciler = Reconciler(storage)
+        self.on_select = on_select
+        self.unmatched_records = []
+
+        self.title("Reconcile Bank Statement")
+        self.geometry("860x560")
+        self.configure(bg="#040f21")
+
+        root_frame = ctk.CTkFrame(self, fg_color="#040f21", corner_radius=12)
+        root_frame.pack(fill="both", expand=True, padx=24, pady=18)
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Reconcile bank statement",
+            font=("Segoe UI", 18, "bold"),
+            text_color="#ffffff"
+        ).pack(anchor="w")
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Needs a Date (YYYY-MM-DD) column and either Amount (negative = money out) "
+                 "or Credit/Debit columns. Credits are matched to income, debits to expenses.",
+            font=("Segoe UI", 12),
+            text_color="#b6c2d4",
+            wraplength=800,
+            justify="left"
+        ).pack(anchor="w", pady=(2, 12))
+
+        # ---------------- FILE ----------------
+        file_row = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        file_row.pack(fill="x", pady=(0, 10))
+
+        self.path_var = tk.StringVar()
+        ctk.CTkEntry(
+            file_row,
+            textvariable=self.path_var,
+            fg_color="#1f2a38",
+            text_color="white",
+            placeholder_text="Choose a statement CSV",
+            corner_radius=8,
+            border_width=2,
+            border_color="#365580",
+            height=30
+        ).pack(side="left", fill="x", expand=True)
+
+        ctk.CTkButton(
+            file_row, text="Browse…", width=90, height=30,
+            fg_color="#2b3545", hover_color="#246ae3",
+            command=self.choose_file
+        ).pack(side="left", padx=(8, 0))
+
+        ctk.CTkButton(
+            file_row, text="Reconcile", width=100, height=30,
+            fg_color="#3d77d4", hover_color="#040f21",
+            border_color="#3d77d4", border_width=2,
+            command=self.run
+        ).pack(side="left", padx=(8, 0))
+
+        self.status_label = ctk.CTkLabel(root_frame, text="", text_color="#b6c2d4", font=("Segoe UI", 12),
+                                         wraplength=800, justify="left")
+        self.status_label.pack(anchor="w", pady=(0, 8))
+
+        # ---------------- RESULTS ----------------
+        notebook = ttk.Notebook(root_frame)
+        notebook.pack(fill="both", expand=True)
+
+        lines_tab = ttk.Frame(notebook)
+        records_tab = ttk.Frame(notebook)
+        notebook.add(lines_tab, text="Not recorded")
+        notebook.add(records_tab, text="Not on statement")
+
+        self.lines_tree = self.build_tree(lines_tab, (
+            ("line", "Line", 60, "center"),
+            ("date", "Date", 100, "center"),
+            ("type", "Type", 90, "center"),
+            ("amount", "Amount", 130, "e"),
+            ("description", "Description", 400, "w"),
+        ))
+        self.records_tree = self.build_tree(records_tab, (
+            ("type", "Type", 90, "center"),
+            ("date", "Date", 100, "center"),
+            ("gross", "Gross", 130, "e"),
+            ("net", "Net", 130, "e"),
+            ("description", "Description", 330, "w"),
+        ))
+        self.records_tree.bind("<Double-1>", lambda e: self.open_selected_record())
+
+        self.transient(parent)
+        self.lift()
+        self.focus_force()
+
+    def build_tree(self, parent, columns):
+        tree = ttk.Treeview(parent, columns=[c[0] for c in columns], show="headings")
+        for col, heading, width, anchor in columns:
+            tree.heading(col, text=heading)
+            tree.column(col, width=width, anchor=anchor)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        return tree
+
+    def choose_file(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Select Statement CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if path:
+            self.path_var.set(path)
+
+    # ================= RUN =================
+    def run(self):
+        path = self.path_var.get().strip()
+        if not path:
+            self.status_label.configure(text="Choose a file first.")
+            return
+
+        try:
+            result = self.reconciler.reconcile_file(path)
+        except (CsvImportError, OSError, UnicodeDecodeError) as e:
+            self.status_label.configure(text=f"Could not read the statement: {e}")
+            return
+
+        self.lines_tree.delete(*self.lines_tree.get_children())
+        for line in result["unmatched_lines"]:
+            self.lines_tree.insert("", "end", values=(
+                line["line_no"],
+                line["date"],
+                line["record_type"].title(),
+                f"₱{line['amount']:,.2f}",
+                line["description"]
+            ))
+
+        self.unmatched_records = result["unmatched_records"]
+        self.records_tree.delete(*self.records_tree.get_children())
+        for index, rec in enumerate(self.unmatched_records):
+            self.records_tree.insert("", "end", iid=str(index), values=(
+                rec["record_type"].title(),
+                rec["date"],
+                f"₱{rec['gross']:,.2f}",
+                f"₱{rec['net'] or 0:,.2f}",
+                rec.get("description") or ""
+            ))
+
+        status = (
+            f"Matched {len(result['matched']):,} line(s). "
+            f"{len(result['unmatched_lines']):,} statement line(s) not recorded, "
+            f"{len(self.unmatched_records):,} record(s) not on the statement."
+        )
+        if result["errors"]:
+            status += f" Skipped {len(result['errors']):,} unreadable line(s)."
+        self.status_label.configure(text=status)
+
+    def open_selected_record(self):
+        selected = self.records_tree.selection()
+        if selected:
+            rec = self.unmatched_records[int(selected[0])]
+            self.on_select(rec["record_type"], rec["id"])
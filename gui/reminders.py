@@ -23,7 +23,12 @@ def get_filing_deadlines(year: int):
 # Advance notice in days
 ADVANCE_DAYS = 7
 
-def check_filing_reminders():
+def check_filing_reminders(notify=None):
+    """
+    Warns about filings due within ADVANCE_DAYS.
+    With `notify` (NotificationCenter.notify) each deadline becomes a toast that
+    is shown once per session window; without it, falls back to message boxes.
+    """
     today = date.today()
     deadlines = get_filing_deadlines(today.year)
 
@@ -31,6 +36,17 @@ def check_filing_reminders():
         days_remaining = (deadline - today).days
 
         if 0 <= days_remaining <= ADVANCE_DAYS:
+            if notify:
+                notify(
+                    "Tax Filing Reminder",
+                    f"{filing_name} is due {deadline:%B %d, %Y} "
+                    f"({days_remaining} day(s) remaining).",
+                    level="warning",
+                    key=f"filing:{filing_name}:{deadline.isoformat()}",
+                    duration_ms=8000
+                )
+                continue
+
             messagebox.showwarning(
                 "Tax Filing Reminder",
                 f"⚠ TAX FILING REMINDER\n\n"
@@ -2,9 +2,15 @@ import tkinter as tk
 from tkinter import ttk
 import customtkinter as ctk
 from core.storage import StorageManager
+from core.tax import TAX_EXEMPTION, graduated_tax
+from core.projection import project_year
+from core.sensitivity import tax_curve, breakpoints, marginal_rate
 from datetime import datetime
 
-TAX_EXEMPTION = 250_000
+# Sensitivity curve: extra income/expense from 0 to SENSITIVITY_RANGE
+SENSITIVITY_RANGE = 1_000_000
+SENSITIVITY_POINTS = 200
+SENSITIVITY_CACHE_SIZE = 32
 
 
 class ReportsTab(ctk.CTkFrame):
@@ -146,22 +152,47 @@ class ReportsTab(ctk.CTkFrame):
         # Pack with padding so the border is visible
         self.tree.pack(fill="both", expand=True, padx=4, pady=4)
 
+        # ================= SENSITIVITY =================
+        sensitivity_card = ctk.CTkFrame(self, fg_color="#111827", corner_radius=12)
+        sensitivity_card.pack(fill="x", padx=10, pady=(0, 10))
+
+        sensitivity_header = ctk.CTkFrame(sensitivity_card, fg_color="transparent")
+        sensitivity_header.pack(fill="x", padx=15, pady=(10, 0))
+
+        ctk.CTkLabel(
+            sensitivity_header, text="Tax on additional", text_color="#9CA3AF", font=("Segoe UI", 12)
+        ).pack(side="left")
+
+        self.sensitivity_dimension = tk.StringVar(value="Income")
+        ctk.CTkSegmentedButton(
+            sensitivity_header,
+            values=["Income", "Expense"],
+            variable=self.sensitivity_dimension,
+            command=lambda v: self.draw_sensitivity()
+        ).pack(side="left", padx=10)
+
+        self.sensitivity_label = ctk.CTkLabel(
+            sensitivity_header, text="", text_color="#fff", font=("Segoe UI", 12)
+        )
+        self.sensitivity_label.pack(side="right")
+
+        self.sensitivity_canvas = tk.Canvas(sensitivity_card, height=160, bg="#111827", highlightthickness=0)
+        self.sensitivity_canvas.pack(fill="x", padx=15, pady=(4, 10))
+        self.sensitivity_canvas.bind("<Configure>", lambda e: self.draw_sensitivity())
+
+        self.sensitivity_inputs = None
+        self.sensitivity_cache = {}  # (inputs, dimension, width) -> computed curve
+        self.sensitivity_drawn = None
+
+        # Per-year results that only change with records or that year's profile
+        self.projection_cache = {}
+
         self.update_quarter_state()
         self.refresh()
 
     # ================= YEARS =================
     def load_report_years(self):
-        rows = self.storage.cursor.execute("""
-            SELECT DISTINCT strftime('%Y', date) as year
-            FROM (
-                SELECT date FROM income
-                UNION ALL
-                SELECT date FROM expense
-            )
-            ORDER BY year DESC
-        """).fetchall()
-
-        years = [r["year"] for r in rows]
+        years = [str(year) for year in self.storage.get_record_years()]
         current_year = str(datetime.now().year)
 
         if current_year not in years:
@@ -184,34 +215,34 @@ class ReportsTab(ctk.CTkFrame):
             # self.quarter_label.grid()
         self.refresh()
 
+    # ================= CACHES =================
+    def invalidate_years(self, years=None):
+        """Drop cached per-year results (all years when `years` is None)."""
+        if years is None:
+            self.projection_cache.clear()
+            return
+        for year in years:
+            self.projection_cache.pop(year, None)
+
     # ================= GRADUATED TAX =================
     def calculate_graduated_tax(self, taxable_income):
-        if taxable_income <= 250_000:
-            return 0.0
-        elif taxable_income <= 400_000:
-            return (taxable_income - 250_000) * 0.20
-        elif taxable_income <= 800_000:
-            return 30_000 + (taxable_income - 400_000) * 0.25
-        elif taxable_income <= 2_000_000:
-            return 130_000 + (taxable_income - 800_000) * 0.30
-        elif taxable_income <= 8_000_000:
-            return 490_000 + (taxable_income - 2_000_000) * 0.32
-        else:
-            return 2_410_000 + (taxable_income - 8_000_000) * 0.35
+        return graduated_tax(taxable_income)
 
     # ================= REFRESH =================
     def refresh(self):
         for row in self.tree.get_children():
             self.tree.delete(row)
 
-        earner_type = self.app_state.earner_type
-        tax_type = self.app_state.tax_type
-        deduction_type = self.app_state.deduction_type
-
         year = int(self.selected_year.get())
         mode = self.report_mode.get()
         quarter = self.selected_quarter.get()
 
+        # Each year is computed under the election filed for it
+        profile = self.app_state.profile_for(year)
+        earner_type = profile.earner_type
+        tax_type = profile.tax_type
+        deduction_type = profile.deduction_type
+
         # ---------------- CUMULATIVE SUMMARY ----------------
         summary_annual = self.storage.get_annual_summary(year)
         gross_income_cumulative = summary_annual["gross_income"]
@@ -321,5 +352,111 @@ class ReportsTab(ctk.CTkFrame):
             ("Withholding Tax on Expenses (1601EQ / 1601FQ)", f"₱{expense_wt_cumulative:,.2f}")
         ]
 
+        # ---------------- YEAR-END PROJECTION ----------------
+        if year == datetime.now().year:
+            projection = self.projection_cache.get(year)
+            if projection is None:
+                projection = project_year(self.storage, self.app_state, year)
+                self.projection_cache[year] = projection
+            crossing = projection["vat_crossing"]
+
+            rows.append(("", ""))
+            rows.append(("── YEAR-END PROJECTION ──", ""))
+            rows += [
+                ("Model", "Seasonal average" if projection["model"] == "seasonal" else "Linear run rate"),
+                ("Projected Gross Income", f"₱{projection['gross_income']:,.2f}"),
+                ("Projected Expenses", f"₱{projection['gross_expense']:,.2f}"),
+                ("Projected Income Tax Due", f"₱{projection['tax_due']:,.2f}"),
+            ]
+            if tax_type != "8_percent":
+                rows.append(("Projected Percentage Tax (3%)", f"₱{projection['percentage_tax']:,.2f}"))
+            rows.append((
+                "VAT Threshold (₱3,000,000)",
+                f"Reached around {crossing:%b %d, %Y}" if crossing else "Not expected this year"
+            ))
+
         for field, value in rows:
             self.tree.insert("", "end", values=(field, value))
+
+        # Sensitivity uses the year-to-date figures in both views
+        self.sensitivity_inputs = (
+            gross_income_cumulative, gross_expense_cumulative, tax_type, earner_type, deduction_type
+        )
+        self.draw_sensitivity()
+
+    # ================= SENSITIVITY =================
+    def compute_sensitivity(self, dimension, width, height):
+        """Curve coordinates, breakpoints and the headline for the current inputs."""
+        inputs = self.sensitivity_inputs
+        step = SENSITIVITY_RANGE / SENSITIVITY_POINTS
+        curve = tax_curve(*inputs, [i * step for i in range(SENSITIVITY_POINTS + 1)], dimension)
+
+        # Expenses lower the tax: plot the amount saved so both curves rise
+        sign = -1 if dimension == "expense" else 1
+        values = [sign * extra for _, _, extra in curve]
+        top = max(max(values), 1.0)
+
+        left, right, pad_y = 70, width - 10, 18
+        plot_h = height - 2 * pad_y
+
+        def x_at(delta):
+            return left + delta / SENSITIVITY_RANGE * (right - left)
+
+        coords = []
+        for (delta, _, _), value in zip(curve, values):
+            coords += [x_at(delta), pad_y + plot_h * (1 - value / top)]
+
+        marks = [(x_at(delta), label) for delta, label in breakpoints(*inputs, SENSITIVITY_RANGE, dimension)]
+
+        next_100k = tax_curve(*inputs, [100_000], dimension)[0][2]
+        rate = marginal_rate(*inputs, dimension)
+        if dimension == "expense":
+            headline = f"Next ₱100,000 of expenses saves ₱{-next_100k:,.2f} (marginal {-rate:.0%})"
+        else:
+            headline = f"Next ₱100,000 of income costs ₱{next_100k:,.2f} in tax (marginal {rate:.0%})"
+
+        return {"coords": coords, "marks": marks, "top": top, "left": left, "right": right,
+                "pad_y": pad_y, "plot_h": plot_h, "headline": headline}
+
+    def draw_sensitivity(self):
+        if self.sensitivity_inputs is None:
+            return
+
+        canvas = self.sensitivity_canvas
+        width, height = canvas.winfo_width(), int(canvas.cget("height"))
+        if width < 200:
+            return  # not laid out yet; <Configure> draws it
+
+        dimension = self.sensitivity_dimension.get().lower()
+        key = (self.sensitivity_inputs, dimension, width)
+        if key == self.sensitivity_drawn:
+            return
+
+        drawing = self.sensitivity_cache.get(key)
+        if drawing is None:
+            drawing = self.compute_sensitivity(dimension, width, height)
+            if len(self.sensitivity_cache) >= SENSITIVITY_CACHE_SIZE:
+                self.sensitivity_cache.pop(next(iter(self.sensitivity_cache)))
+            self.sensitivity_cache[key] = drawing
+
+        canvas.delete("all")
+        left, right = drawing["left"], drawing["right"]
+        pad_y, plot_h = drawing["pad_y"], drawing["plot_h"]
+
+        canvas.create_line(left, pad_y + plot_h, right, pad_y + plot_h, fill="#4B5563")
+        for i in range(5):
+            x = left + (right - left) * i / 4
+            canvas.create_text(x, pad_y + plot_h + 10, text=f"+₱{SENSITIVITY_RANGE * i / 4 / 1000:,.0f}k",
+                               fill="#9CA3AF", font=("Segoe UI", 9))
+        canvas.create_text(left - 8, pad_y, text=f"₱{drawing['top']:,.0f}", anchor="e",
+                           fill="#9CA3AF", font=("Segoe UI", 9))
+        canvas.create_text(left - 8, pad_y + plot_h, text="₱0", anchor="e",
+                           fill="#9CA3AF", font=("Segoe UI", 9))
+
+        for x, label in drawing["marks"]:
+            canvas.create_line(x, pad_y, x, pad_y + plot_h, fill="#6B7280", dash=(3, 3))
+            canvas.create_text(x + 4, pad_y, text=label, anchor="nw", fill="#9CA3AF", font=("Segoe UI", 8))
+
+        canvas.create_line(*drawing["coords"], fill="#3d77d4", width=2)
+        self.sensitivity_label.configure(text=drawing["headline"])
+        self.sensitivity_drawn = key
@@ -0,0 +1,137 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+from datetime import datetime
+import customtkinter as ctk
+
+# Histogram bar width (characters) for the fullest bucket
+BAR_WIDTH = 40
+
+REFRESH_MS = 1000
+
+
+class ResponsivenessDialog(tk.Toplevel):
+    """
+    The UI watchdog's figures: how late the event loop's heartbeats were,
+    which handlers caused the stalls, and the latest stalls. Refreshes every
+    second while open.
+    """
+
+    def __init__(self, parent, watchdog):
+        super().__init__(parent)
+        self.watchdog = watchdog
+
+        self.title("UI Responsiveness")
+        self.geometry("900x640")
+        self.configure(bg="#040f21")
+
+        root_frame = ctk.CTkFrame(self, fg_color="#040f21", corner_radius=12)
+        root_frame.pack(fill="both", expand=True, padx=24, pady=18)
+
+        ctk.CTkLabel(
+            root_frame,
+            text="UI responsiveness",
+            font=("Segoe UI", 18, "bold"),
+            text_color="#ffffff"
+        ).pack(anchor="w")
+
+        self.summary_label = ctk.CTkLabel(root_frame, text="", text_color="#b6c2d4", font=("Segoe UI", 12),
+                                          justify="left")
+        self.summary_label.pack(anchor="w", pady=(2, 10))
+
+        # ---------------- TABLES ----------------
+        notebook = ttk.Notebook(root_frame)
+        notebook.pack(fill="both", expand=True)
+
+        self.histogram_table = self.build_table(
+            notebook, "Heartbeat lateness",
+            [("bucket", "Lateness", 140), ("count", "Heartbeats", 110), ("bar", "", 420)]
+        )
+        self.handler_table = self.build_table(
+            notebook, "Stalls by handler",
+            [("handler", "Handler", 260), ("stalls", "Stalls", 70), ("total", "Total ms", 90),
+             ("max", "Worst ms", 90), ("chain", "Call chain (worst)", 320)]
+        )
+        self.stall_table = self.build_table(
+            notebook, "Recent stalls",
+            [("at", "Time", 150), ("ms", "ms", 80), ("handler", "Handler", 260), ("chain", "Call chain", 340)]
+        )
+
+        # ---------------- BUTTONS ----------------
+        buttons = ctk.CTkFrame(root_frame, fg_color="#040f21")
+        buttons.pack(fill="x", pady=(12, 0))
+
+        ctk.CTkButton(
+            buttons, text="Export…", width=100, height=30,
+            fg_color="#3d77d4", hover_color="#040f21",
+            border_color="#3d77d4", border_width=2,
+            command=self.export
+        ).pack(side="right")
+
+        ctk.CTkButton(
+            buttons, text="Reset", width=90, height=30,
+            fg_color="#2b3545", hover_color="#246ae3",
+            command=self.reset
+        ).pack(side="right", padx=(0, 8))
+
+        self.refresh()
+
+    def build_table(self, notebook, title, columns):
+        frame = tk.Frame(notebook, bg="#040f21")
+        notebook.add(frame, text=title)
+
+        table = ttk.Treeview(frame, columns=[key for key, _, _ in columns], show="headings")
+        for key, heading, width in columns:
+            table.heading(key, text=heading)
+            table.column(key, width=width, anchor="w")
+        table.pack(side="left", fill="both", expand=True)
+
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+        scrollbar.pack(side="right", fill="y")
+        table.configure(yscrollcommand=scrollbar.set)
+        return table
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        report = self.watchdog.snapshot()
+
+        stalls = sum(item["stalls"] for item in report["handlers"])
+        self.summary_label.configure(
+            text=f"Heartbeat every {report['interval_ms']} ms since {report['started_at']} "
+                 f"({report['beats']:,} beats). Stalls of {report['threshold_ms']} ms or more: {stalls:,}."
+        )
+
+        most = max((bucket["count"] for bucket in report["histogram"]), default=0) or 1
+        self.fill(self.histogram_table, [
+            (bucket["bucket"], f"{bucket['count']:,}", "█" * round(BAR_WIDTH * bucket["count"] / most))
+            for bucket in report["histogram"]
+        ])
+        self.fill(self.handler_table, [
+            (item["handler"], item["stalls"], f"{item['total_ms']:,.0f}", f"{item['max_ms']:,.0f}", item["chain"])
+            for item in report["handlers"]
+        ])
+        self.fill(self.stall_table, [
+            (stall["at"].replace("T", " "), f"{stall['ms']:,.0f}", stall["handler"], stall["chain"])
+            for stall in reversed(report["recent_stalls"])
+        ])
+
+        self.after(REFRESH_MS, self.refresh)
+
+    def fill(self, table, rows):
+        table.delete(*table.get_children())
+        for row in rows:
+            table.insert("", "end", values=row)
+
+    def reset(self):
+        self.watchdog.reset()
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export UI metrics",
+            defaultextension=".json",
+            initialfile=f"ui_metrics_{datetime.now():%Y%m%d_%H%M%S}.json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if path:
+            self.watchdog.export(path)
@@ -0,0 +1,136 @@
+import tkinter as tk
+from tkinter import ttk
+import customtkinter as ctk
+
+# Wait this long after the last keystroke before querying
+SEARCH_DELAY_MS = 120
+
+
+class SearchBox(ctk.CTkFrame):
+    """
+    Search entry for the main window header. Runs a prefix full-text search
+    as you type and shows the matches in a drop-down list; picking one calls
+    on_select(record_type, record_id).
+    """
+
+    def __init__(self, parent, root, storage, on_select):
+        super().__init__(parent, fg_color="#040f21")
+
+        self.root = root
+        self.storage = storage
+        self.on_select = on_select
+        self.search_job = None
+        self.results = []
+
+        self.query_var = tk.StringVar()
+        self.entry = ctk.CTkEntry(
+            self,
+            textvariable=self.query_var,
+            width=360,
+            height=34,
+            fg_color="#1f2a38",
+            text_color="white",
+            placeholder_text="Search descriptions or ATC…",
+            corner_radius=8,
+            border_width=2,
+            border_color="#365580"
+        )
+        self.entry.pack()
+
+        self.entry.bind("<KeyRelease>", self.on_key)
+        self.entry.bind("<Escape>", lambda e: self.hide_results())
+        self.entry.bind("<Down>", lambda e: self.focus_results())
+        self.entry.bind("<Return>", lambda e: self.pick_first())
+
+        # ================= RESULTS DROP-DOWN =================
+        self.panel = ctk.CTkFrame(
+            self.root,
+            fg_color="#111827",
+            corner_radius=8,
+            border_width=2,
+            border_color="#246ae3"
+        )
+
+        columns = ("type", "date", "amount", "description", "atc")
+        self.tree = ttk.Treeview(self.panel, columns=columns, show="headings", height=10)
+        for col, width, anchor in (
+            ("type", 80, "center"),
+            ("date", 100, "center"),
+            ("amount", 120, "e"),
+            ("description", 320, "w"),
+            ("atc", 80, "center"),
+        ):
+            self.tree.heading(col, text=col.title())
+            self.tree.column(col, width=width, anchor=anchor, stretch=False)
+        self.tree.pack(fill="both", expand=True, padx=4, pady=4)
+
+        self.tree.bind("<Double-1>", lambda e: self.pick_selected())
+        self.tree.bind("<Return>", lambda e: self.pick_selected())
+        self.tree.bind("<Escape>", lambda e: self.hide_results())
+
+    # ================= SEARCH =================
+    def on_key(self, event):
+        if event.keysym in ("Escape", "Down", "Return", "Up"):
+            return
+        if self.search_job:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        text = self.query_var.get().strip()
+        if not text:
+            self.hide_results()
+            return
+
+        self.results = self.storage.search_records(text, limit=50)
+
+        self.tree.delete(*self.tree.get_children())
+        for index, rec in enumerate(self.results):
+            self.tree.insert("", "end", iid=str(index), values=(
+                rec["record_type"].title(),
+                rec["date"],
+                f"₱{rec['amount']:,.2f}",
+                rec.get("description") or "",
+                rec.get("atc") or ""
+            ))
+
+        if not self.results:
+            self.tree.insert("", "end", values=("", "", "", "No matches", ""))
+        self.show_results()
+
+    # ================= DROP-DOWN =================
+    def show_results(self):
+        self.root.update_idletasks()
+        x = self.entry.winfo_rootx() - self.root.winfo_rootx()
+        y = self.entry.winfo_rooty() - self.root.winfo_rooty() + self.entry.winfo_height() + 4
+        width = 720
+        x = max(8, min(x, self.root.winfo_width() - width - 8))
+        self.panel.place(x=x, y=y, width=width, height=300)
+        self.panel.lift()
+
+    def hide_results(self):
+        self.panel.place_forget()
+
+    def focus_results(self):
+        children = self.tree.get_children()
+        if self.results and children:
+            self.tree.focus_set()
+            self.tree.selection_set(children[0])
+            self.tree.focus(children[0])
+
+    def pick_first(self):
+        if self.search_job:
+            self.after_cancel(self.search_job)
+            self.run_search()
+        if self.results:
+            self.pick(self.results[0])
+
+    def pick_selected(self):
+        selected = self.tree.selection()
+        if selected and self.results:
+            self.pick(self.results[int(selected[0])])
+
+    def pick(self, record):
+        self.hide_results()
+        self.on_select(record["record_type"], record["id"])
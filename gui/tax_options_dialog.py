@@ -0,0 +1,197 @@
+import tkinter as tk
+from tkinter import ttk
+from datetime import datetime
+import customtkinter as ctk
+
+from core.optimizer import (
+    OPTIONS, compare_years, remaining_quarter_scenarios, evaluate_grid,
+    break_even_expense_ratio,
+)
+
+# Heatmap: gross income 0..MAX_INCOME across, expense ratio 0..100% down
+MAX_INCOME = 3_500_000
+GRID_COLUMNS = 70
+GRID_ROWS = 40
+OPTION_COLORS = ("#3d77d4", "#16a34a", "#d97706")
+
+
+class TaxOptionsDialog(tk.Toplevel):
+    """
+    Compares the 8% flat rate with graduated rates (OSD or itemized) on each
+    year's recorded totals and on slow/expected/strong scenarios for the rest
+    of the current year, with a map of which election is cheapest for any
+    income and expense ratio.
+    """
+
+    def __init__(self, parent, storage, app_state):
+        super().__init__(parent)
+        self.storage = storage
+        self.app_state = app_state
+        self.year = datetime.now().year
+
+        self.title("Compare Tax Options")
+        self.geometry("980x720")
+        self.configure(bg="#040f21")
+
+        root_frame = ctk.CTkFrame(self, fg_color="#040f21", corner_radius=12)
+        root_frame.pack(fill="both", expand=True, padx=24, pady=18)
+
+        ctk.CTkLabel(
+            root_frame,
+            text="Compare tax options",
+            font=("Segoe UI", 18, "bold"),
+            text_color="#ffffff"
+        ).pack(anchor="w")
+
+        self.summary_label = ctk.CTkLabel(
+            root_frame, text="", font=("Segoe UI", 13), text_color="#b6c2d4",
+            wraplength=920, justify="left"
+        )
+        self.summary_label.pack(anchor="w", pady=(2, 10))
+
+        # ---------------- TABLE ----------------
+        columns = ("period", "income", "expense") + tuple(o["key"] for o in OPTIONS) + ("best",)
+        self.tree = ttk.Treeview(root_frame, columns=columns, show="headings", height=8)
+        headings = {
+            "period": ("Period", 150, "w"),
+            "income": ("Gross Income", 130, "e"),
+            "expense": ("Expenses", 130, "e"),
+            "best": ("Cheapest", 170, "w"),
+        }
+        for option in OPTIONS:
+            headings[option["key"]] = (option["label"], 130, "e")
+        for col in columns:
+            text, width, anchor = headings[col]
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor=anchor)
+        self.tree.pack(fill="x")
+
+        # ---------------- HEATMAP ----------------
+        ctk.CTkLabel(
+            root_frame,
+            text="Cheapest election by gross income (across) and expenses as a share of income (down)",
+            font=("Segoe UI", 12),
+            text_color="#b6c2d4"
+        ).pack(anchor="w", pady=(12, 4))
+
+        self.canvas = tk.Canvas(root_frame, height=330, bg="#040f21", highlightthickness=0)
+        self.canvas.pack(fill="x")
+
+        self.transient(parent)
+        self.lift()
+        self.focus_force()
+
+        self.populate()
+
+    # ================= DATA =================
+    def populate(self):
+        self.profile = self.app_state.profile_for(self.year)
+        years = self.storage.get_record_years()
+        if self.year not in years:
+            years.insert(0, self.year)
+
+        for year_result in compare_years(self.storage, self.app_state, years):
+            self.insert_row(str(year_result["year"]), year_result)
+
+        for scenario in remaining_quarter_scenarios(self.storage, self.app_state, self.year):
+            self.insert_row(f"{self.year} year-end ({scenario['name']})", scenario)
+
+        current = compare_years(self.storage, self.app_state, [self.year])[0]
+        self.show_summary(current)
+        self.draw_heatmap(current)
+
+    def insert_row(self, period, result):
+        totals = [
+            f"₱{r['total']:,.2f}" if r["eligible"] else "n/a"
+            for r in result["options"]
+        ]
+        self.tree.insert("", "end", values=(
+            period,
+            f"₱{result['gross_income']:,.2f}",
+            f"₱{result['gross_expense']:,.2f}",
+            *totals,
+            result["best"]["label"],
+        ))
+
+    def show_summary(self, current):
+        best = current["best"]
+        chosen = next(
+            (r for r in current["options"]
+             if r["tax_type"] == self.profile.tax_type
+             and (r["tax_type"] == "8_percent" or r["deduction_type"] == self.profile.deduction_type)),
+            None
+        )
+
+        text = f"Cheapest for {self.year} so far: {best['label']} (₱{best['total']:,.2f})."
+        if chosen and chosen["key"] != best["key"]:
+            text += f" Your current election costs ₱{chosen['total'] - best['total']:,.2f} more."
+
+        flat_ratio = current["break_even"]["flat"]
+        text += " Itemizing beats OSD when expenses exceed 40% of income"
+        if flat_ratio is not None:
+            text += f" and beats 8% when they exceed {flat_ratio:.0%}."
+        else:
+            text += "."
+        self.summary_label.configure(text=text)
+
+    # ================= HEATMAP =================
+    def draw_heatmap(self, current):
+        self.canvas.update_idletasks()
+        width = max(self.canvas.winfo_width(), 900)
+        left, top, bottom_margin, right_margin = 60, 10, 40, 170
+        plot_w = width - left - right_margin
+        plot_h = 330 - top - bottom_margin
+
+        incomes = [MAX_INCOME * (c + 0.5) / GRID_COLUMNS for c in range(GRID_COLUMNS)]
+        ratios = [(r + 0.5) / GRID_ROWS for r in range(GRID_ROWS)]
+        grid = evaluate_grid(incomes, ratios, self.profile.earner_type)
+
+        cell_w, cell_h = plot_w / GRID_COLUMNS, plot_h / GRID_ROWS
+        for r, row in enumerate(grid):
+            for c, best in enumerate(row):
+                x, y = left + c * cell_w, top + r * cell_h
+                self.canvas.create_rectangle(
+                    x, y, x + cell_w + 1, y + cell_h + 1, fill=OPTION_COLORS[best], width=0
+                )
+
+        # Break-even curve (itemized vs 8%)
+        points = []
+        for c, gross in enumerate(incomes):
+            ratio = break_even_expense_ratio(gross, self.profile.earner_type)["flat"]
+            if ratio is not None:
+                points += [left + (c + 0.5) * cell_w, top + ratio * plot_h]
+        if len(points) >= 4:
+            self.canvas.create_line(*points, fill="#ffffff", width=2, dash=(4, 2))
+
+        # Axes
+        for i in range(8):
+            amount = MAX_INCOME * i / 7
+            x = left + plot_w * i / 7
+            self.canvas.create_text(x, top + plot_h + 14, text=f"₱{amount / 1_000_000:.1f}M",
+                                    fill="#b6c2d4", font=("Segoe UI", 9))
+        for i in range(5):
+            y = top + plot_h * i / 4
+            self.canvas.create_text(left - 10, y, text=f"{i * 25}%", anchor="e",
+                                    fill="#b6c2d4", font=("Segoe UI", 9))
+
+        # This year's position
+        gross, expense = current["gross_income"], current["gross_expense"]
+        if gross > 0:
+            x = left + min(gross, MAX_INCOME) / MAX_INCOME * plot_w
+            y = top + min(expense / gross, 1.0) * plot_h
+            self.canvas.create_oval(x - 6, y - 6, x + 6, y + 6, outline="#ffffff", width=3)
+
+        # Legend
+        legend_x = left + plot_w + 20
+        for i, option in enumerate(OPTIONS):
+            y = top + 10 + i * 26
+            self.canvas.create_rectangle(legend_x, y, legend_x + 16, y + 16, fill=OPTION_COLORS[i], width=0)
+            self.canvas.create_text(legend_x + 24, y + 8, text=option["label"], anchor="w",
+                                    fill="#ffffff", font=("Segoe UI", 10))
+        y = top + 10 + len(OPTIONS) * 26
+        self.canvas.create_line(legend_x, y + 8, legend_x + 16, y + 8, fill="#ffffff", width=2, dash=(4, 2))
+        self.canvas.create_text(legend_x + 24, y + 8, text="Itemized = 8%", anchor="w",
+                                fill="#ffffff", font=("Segoe UI", 10))
+        self.canvas.create_oval(legend_x + 2, y + 28, legend_x + 14, y + 40, outline="#ffffff", width=3)
+        self.canvas.create_text(legend_x + 24, y + 34, text=f"{self.year} so far", anchor="w",
+                                fill="#ffffff", font=("Segoe UI", 10))
@@ -0,0 +1,191 @@
+import json
+import platform
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+# How late each after() heartbeat fires is how long the UI could not respond
+HEARTBEAT_MS = 100
+STALL_MS = 200          # lateness recorded as a stall
+SAMPLE_MS = 25          # main-thread stack sampling period while a heartbeat is overdue
+MAX_STALLS = 200        # recent stalls kept
+MAX_PLAUSIBLE_MS = 60_000  # longer gaps are the machine sleeping, not a stall
+
+# Upper bounds (ms) of the lateness histogram buckets; the last one is open
+BUCKET_BOUNDS = [16, 33, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# Frames from these modules count as the app's own code
+APP_MODULES = ("gui.", "core.", "NonVatTaxTracker")
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
+def describe_stack(frame):
+    """(handler, chain) for the app frames on a stack, innermost handler first."""
+    chain = []
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(APP_MODULES) and module != __name__:
+            chain.append(frame_name(frame))
+        frame = frame.f_back
+    if not chain:
+        return "(Tk / library code)", ""
+    return chain[0], " > ".join(reversed(chain))
+
+
+def bucket_label(index):
+    if index == 0:
+        return f"< {BUCKET_BOUNDS[0]} ms"
+    if index == len(BUCKET_BOUNDS):
+        return f">= {BUCKET_BOUNDS[-1]} ms"
+    return f"{BUCKET_BOUNDS[index - 1]}–{BUCKET_BOUNDS[index]} ms"
+
+
+# ================== WATCHDOG ==================
+class UiWatchdog:
+    def __init__(self, root, interval_ms=HEARTBEAT_MS, threshold_ms=STALL_MS, sample_ms=SAMPLE_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.sample_ms = sample_ms
+        self.main_thread_id = threading.get_ident()  # Tk runs on the thread that created the root
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._expected = None   # perf_counter() when the next heartbeat is due
+        self._samples = Counter()
+        self._chains = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self.beats = 0
+            self.histogram = [0] * (len(BUCKET_BOUNDS) + 1)
+            self.handlers = {}  # handler -> {"stalls", "total_ms", "max_ms", "chain"}
+            self.stalls = deque(maxlen=MAX_STALLS)
+            self._samples.clear()
+            self._chains.clear()
+
+    def start(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._beat)
+        threading.Thread(target=self._sample_loop, name="ui-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ================== HEARTBEAT ==================
+    def _beat(self):
+        if self._stop.is_set():
+            return
+        now = time.perf_counter()
+        late_ms = (now - self._expected) * 1000
+
+        if late_ms < MAX_PLAUSIBLE_MS:
+            with self._lock:
+                self.beats += 1
+                index = 0
+                while index < len(BUCKET_BOUNDS) and late_ms >= BUCKET_BOUNDS[index]:
+                    index += 1
+                self.histogram[index] += 1
+                if late_ms >= self.threshold_ms:
+                    self._record_stall(late_ms)
+        with self._lock:
+            self._samples.clear()
+            self._chains.clear()
+
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        try:
+            self.root.after(self.interval_ms, self._beat)
+        except Exception:
+            pass  # root destroyed while closing
+
+    def _record_stall(self, late_ms):
+        # Called with the lock held; the samples cover this stall only
+        if self._samples:
+            handler, samples = self._samples.most_common(1)[0]
+            chain = self._chains.get(handler, "")
+        else:
+            handler, samples, chain = "(not sampled)", 0, ""
+
+        entry = self.handlers.setdefault(handler, {"stalls": 0, "total_ms": 0.0, "max_ms": 0.0, "chain": chain})
+        entry["stalls"] += 1
+        entry["total_ms"] += late_ms
+        if late_ms > entry["max_ms"]:
+            entry["max_ms"] = late_ms
+            entry["chain"] = chain
+
+        self.stalls.append({
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(late_ms, 1),
+            "handler": handler,
+            "chain": chain,
+            "samples": samples,
+        })
+
+    # ================== SAMPLER ==================
+    def _sample_loop(self):
+        # Only looks at the stack while a heartbeat is overdue, so an idle or
+        # responsive UI costs one timestamp comparison per SAMPLE_MS
+        half_threshold = self.threshold_ms / 2000
+        while not self._stop.wait(self.sample_ms / 1000):
+            expected = self._expected
+            if expected is None or time.perf_counter() - expected < half_threshold:
+                continue
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            handler, chain = describe_stack(frame)
+            with self._lock:
+                self._samples[handler] += 1
+                self._chains[handler] = chain
+
+    # ================== REPORT ==================
+    def snapshot(self):
+        with self._lock:
+            handlers = sorted(
+                ({"handler": name, **entry} for name, entry in self.handlers.items()),
+                key=lambda item: item["total_ms"],
+                reverse=True
+            )
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "uptime_seconds": round((datetime.now() - self.started_at).total_seconds(), 1),
+                "interval_ms": self.interval_ms,
+                "threshold_ms": self.threshold_ms,
+                "beats": self.beats,
+                "histogram": [
+                    {"bucket": bucket_label(i), "count": count} for i, count in enumerate(self.histogram)
+                ],
+                "handlers": [
+                    {**item, "total_ms": round(item["total_ms"], 1), "max_ms": round(item["max_ms"], 1)}
+                    for item in handlers
+                ],
+                "recent_stalls": list(self.stalls),
+            }
+
+    def export(self, path):
+        report = self.snapshot()
+        report["environment"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tk": str(self.root.tk.call("info", "patchlevel")),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def install_watchdog(root) -> UiWatchdog:
+    """The root's watchdog, started on first use; client switches keep the same one."""
+    watchdog = getattr(root, "_ui_watchdog", None)
+    if watchdog is None:
+        watchdog = UiWatchdog(root)
+        watchdog.start()
+        root._ui_watchdog = watchdog
+    return watchdog
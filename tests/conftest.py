@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.synthetic import build_ledger
+from core.storage import StorageManager
+
+LEDGER_YEAR = 2025
+
+
+@pytest.fixture(scope="session", params=["analyzed", "fresh"])
+def storage(request, tmp_path_factory):
+    """
+    A StorageManager over a small synthetic ledger ending in LEDGER_YEAR.
+    "analyzed" has sqlite_stat1 (as after ANALYZE / PRAGMA optimize),
+    "fresh" has none, so the planner falls back to its default estimates.
+    """
+    path = str(tmp_path_factory.mktemp(request.param) / "records.db")
+    build_ledger(path, 3000, seed=1, last_year=LEDGER_YEAR)
+    if request.param == "fresh":
+        conn = StorageManager(db_path=path).conn
+        conn.execute("DROP TABLE IF EXISTS sqlite_stat1")
+        conn.commit()
+        conn.close()
+
+    manager = StorageManager(db_path=path)
+    yield manager
+    manager.conn.close()
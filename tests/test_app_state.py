@@ -0,0 +1,43 @@
+from core.app_state import AppState, TaxProfile
+
+
+def load(path):
+    app_state = AppState(state_file=str(path))
+    app_state.load()
+    return app_state
+
+
+def test_pinned_years_keep_their_election_after_a_change(tmp_path):
+    path = tmp_path / "app_state.json"
+    app_state = AppState(state_file=str(path))
+    app_state.update_profile("sole", "8_percent")
+
+    # Switching to graduated from 2026: the years already on record stay on 8%
+    app_state.pin_years([2024, 2025])
+    app_state.update_profile("sole", "graduated", "osd")
+
+    reloaded = load(path)
+    assert reloaded.profile_for(2024) == TaxProfile("sole", "8_percent")
+    assert reloaded.profile_for(2025) == TaxProfile("sole", "8_percent")
+    assert reloaded.profile_for(2026) == TaxProfile("sole", "graduated", "osd")
+    assert reloaded.years_using_current_profile([2024, 2025, 2026, 2027]) == [2026, 2027]
+
+
+def test_pinning_never_overwrites_an_earlier_pin(tmp_path):
+    app_state = AppState(state_file=str(tmp_path / "app_state.json"))
+    app_state.update_profile("mixed", "8_percent")
+    app_state.pin_years([2024])
+    app_state.update_profile("mixed", "graduated", "itemized")
+    app_state.pin_years([2024, 2025])
+
+    assert app_state.profile_for(2024) == TaxProfile("mixed", "8_percent")
+    assert app_state.profile_for(2025) == TaxProfile("mixed", "graduated", "itemized")
+
+
+def test_nothing_is_pinned_before_setup(tmp_path):
+    path = tmp_path / "app_state.json"
+    app_state = AppState(state_file=str(path))
+    app_state.pin_years([2025])
+
+    assert app_state.profiles == {}
+    assert not path.exists()
@@ -0,0 +1,128 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core import async_storage
+from core.async_storage import AsyncStorage
+from core.cli import summarize, summarize_async
+from core.app_state import AppState
+from core.storage import StorageManager
+from core.storage_service import StorageService
+
+INCOME = {
+    "date": "2025-03-15",
+    "gross_income": 1000.0,
+    "description": "Client ABC",
+    "cwt": 50.0,
+    "atc": "WI010",
+    "income_received": 950.0,
+}
+
+
+def books_file(tmp_path, name="records.db", rows=3):
+    path = str(tmp_path / name)
+    StorageManager(db_path=path).bulk_add_income([INCOME] * rows)
+    return path
+
+
+def test_queries_and_bulk_writes(tmp_path):
+    async def main():
+        async with AsyncStorage(books_file(tmp_path)) as books:
+            ids = await books.bulk_add_income([INCOME] * 5)
+            annual, count, page = await asyncio.gather(
+                books.get_annual_summary(2025),
+                books.count_income(year=2025),
+                books.get_income_page(year=2025, limit=2),
+            )
+            record = await books.get_income(ids[0])
+        return ids, annual, count, page, record
+
+    ids, annual, count, page, record = asyncio.run(main())
+    assert len(ids) == 5
+    assert annual["gross_income"] == 8000.0
+    assert count == 8 and len(page) == 2
+    assert record["description"] == "Client ABC"
+
+
+def test_concurrency_is_bounded(tmp_path):
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_count(storage):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return storage.count_income()
+
+    async def main():
+        async with AsyncStorage(books_file(tmp_path), max_concurrency=2) as books:
+            return await asyncio.gather(*(books.read(slow_count) for _ in range(8)))
+
+    assert asyncio.run(main()) == [3] * 8
+    assert peak == 2
+
+
+def test_many_books_share_one_executor(tmp_path):
+    paths = [books_file(tmp_path, f"client{n}.db", rows=n) for n in range(1, 5)]
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    async def main():
+        shelves = [AsyncStorage(path, executor=executor) for path in paths]
+        try:
+            return await asyncio.gather(*(books.count_income() for books in shelves))
+        finally:
+            await asyncio.gather(*(books.close() for books in shelves))
+
+    assert asyncio.run(main()) == [1, 2, 3, 4]
+    executor.shutdown()
+
+
+def test_write_errors_reach_the_awaiter(tmp_path):
+    async def main():
+        async with AsyncStorage(books_file(tmp_path)) as books:
+            with pytest.raises(KeyError):
+                await books.write(lambda storage: {}["missing"])
+            return await books.count_income()
+
+    assert asyncio.run(main()) == 3
+
+
+def test_opening_leaves_the_loop_and_the_file_alone(tmp_path, monkeypatch):
+    path = books_file(tmp_path)
+    built_on = []
+
+    class RecordingService(StorageService):
+        def __init__(self, *args, **kwargs):
+            built_on.append(threading.current_thread())
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(async_storage, "StorageService", RecordingService)
+
+    async def main():
+        async with AsyncStorage(path) as books:
+            await asyncio.gather(books.get_annual_summary(2025), books.count_income())
+            return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert len(built_on) == 1 and built_on[0] is not loop_thread
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+def test_async_summary_matches_summarize(tmp_path):
+    path = books_file(tmp_path)
+    app_state = AppState(state_file=str(tmp_path / "app_state.json"))
+
+    async def main():
+        async with AsyncStorage(path) as books:
+            return await summarize_async(books, app_state, 2025, "Q1")
+
+    assert asyncio.run(main()) == summarize(StorageManager(db_path=path), app_state, 2025, "Q1")
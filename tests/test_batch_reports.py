@@ -0,0 +1,61 @@
+import csv
+import re
+import sqlite3
+
+import pytest
+
+from core.app_state import AppState
+from core.batch_reports import MONEY_COLUMNS, client_report, run, write_csv
+from core.storage import StorageManager
+
+
+def income(day, amount):
+    return {"date": day, "gross_income": amount, "description": "Client ABC", "cwt": 0.0,
+            "atc": "WI010", "income_received": amount}
+
+
+@pytest.fixture
+def client_dir(tmp_path):
+    StorageManager(db_path=str(tmp_path / "records.db")).bulk_add_income(
+        [income("2025-02-10", 400000.0), income("2025-05-10", 400000.0)]
+    )
+    AppState(state_file=str(tmp_path / "app_state.json")).update_profile("sole", "8_percent")
+    return tmp_path
+
+
+def job(folder):
+    return ("client", str(folder / "records.db"), str(folder / "app_state.json"), 2025)
+
+
+def test_report_leaves_the_books_untouched(client_dir):
+    path = client_dir / "records.db"
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version = 0")     # as if made by an older version
+    conn.close()
+    before = path.read_bytes()
+
+    rows, _ = client_report(job(client_dir))
+
+    assert [row["period"] for row in rows] == ["Q1", "Q2", "Q3", "Q4", "Annual"]
+    assert path.read_bytes() == before
+
+
+def test_quarterly_rows(client_dir):
+    rows, _ = client_report(job(client_dir))
+    payable = [row["income_tax_payable"] for row in rows]
+    # 8% over the 250,000 exemption, year to date, less what earlier quarters paid
+    assert payable == pytest.approx([12000.0, 32000.0, 0.0, None, 0.0])
+
+
+def test_csv_money_has_two_decimals(client_dir, tmp_path):
+    rows, _ = run([job(client_dir)], workers=1)
+    path = tmp_path / "report.csv"
+    write_csv(str(path), rows)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        written = list(csv.DictReader(f))
+    q3 = written[2]
+    assert q3["gross_income"] == q3["expense_wt"] == "0.00"     # no records that quarter
+    assert written[3]["income_tax_payable"] == ""                # settled on the annual return
+    for row in written:
+        assert all(row[column] == "" or re.fullmatch(r"\d+\.\d\d", row[column]) for column in MONEY_COLUMNS)
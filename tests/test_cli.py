@@ -0,0 +1,133 @@
+import json
+import sys
+
+import pytest
+
+from core.app_state import AppState
+from core.batch_reports import client_report
+from core import clients
+from core.cli import main
+from core.storage import StorageManager
+
+
+def income(day, amount, description="Client ABC"):
+    return {"date": day, "gross_income": amount, "description": description, "cwt": 0.0,
+            "atc": "WI010", "income_received": amount}
+
+
+def expense(day, amount, description="Supplies"):
+    return {"date": day, "gross_expense": amount, "description": description, "wt": 0.0,
+            "atc": "", "expense_paid": amount}
+
+
+@pytest.fixture
+def books(tmp_path):
+    storage = StorageManager(db_path=str(tmp_path / "records.db"))
+    storage.bulk_add_income(
+        # Same day, amount and description, and a run of near-identical entries:
+        # all real records that the duplicate checks would have dropped
+        [income("2025-01-15", 1000.0)] * 3
+        + [income(f"2025-02-{day:02d}", 500.0 + day % 2, "Daily sales") for day in range(1, 29)]
+        + [income("2024-12-31", 2500.0)]
+    )
+    storage.bulk_add_expense([expense("2025-03-01", 300.0)] * 2)
+    return storage
+
+
+def totals(storage):
+    return (storage.count_income(), storage.count_expense(),
+            storage.get_annual_summary(2025)["gross_income"], storage.get_annual_summary(2024)["gross_income"])
+
+
+def test_backup_and_restore_round_trip(books, tmp_path, capsys):
+    data_dir = str(tmp_path)
+    assert main(["--data-dir", data_dir, "backup"]) == 0
+
+    restored_db = str(tmp_path / "restored.db")
+    assert main(["--data-dir", data_dir, "--db", restored_db, "restore"]) == 0
+    restored = StorageManager(db_path=restored_db)
+    assert totals(restored) == totals(books)
+    assert [row["id"] for row in restored.get_all_income()] == [row["id"] for row in books.get_all_income()]
+    assert "Restored 34 record(s)" in capsys.readouterr().out
+
+    # Restoring again finds every id already present
+    assert main(["--data-dir", data_dir, "--db", restored_db, "restore"]) == 0
+    assert totals(StorageManager(db_path=restored_db)) == totals(books)
+    assert "Restored 0 record(s)" in capsys.readouterr().out
+
+
+def test_restore_fills_in_deleted_records(books, tmp_path):
+    data_dir = str(tmp_path)
+    main(["--data-dir", data_dir, "backup"])
+    books.delete_income(books.get_all_income()[0]["id"])
+
+    main(["--data-dir", data_dir, "restore"])
+    assert books.count_income() == 32
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="older fromisoformat only takes YYYY-MM-DD")
+def test_add_stores_yyyy_mm_dd(tmp_path):
+    db = str(tmp_path / "records.db")
+    assert main(["--data-dir", str(tmp_path), "--db", db,
+                 "add", "income", "--date", "20250315", "--gross", "1000"]) == 0
+
+    storage = StorageManager(db_path=db)
+    assert storage.get_all_income()[0]["date"] == "2025-03-15"
+    assert storage.count_income(year=2025, quarter="Q1") == 1
+
+
+def eight_percent_books(data_dir):
+    storage = StorageManager(db_path=str(data_dir / "records.db"))
+    storage.bulk_add_income([income(f"2025-{month:02d}-10", 400000.0) for month in (2, 5, 8)])
+    AppState(state_file=str(data_dir / "app_state.json")).update_profile("sole", "8_percent")
+    return storage
+
+
+def summary_json(capsys, data_dir, *options):
+    capsys.readouterr()
+    assert main(["--data-dir", str(data_dir), "summary", "--year", "2025", "--json", *options]) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+def test_quarter_summary_is_the_1701q_figure(tmp_path, capsys):
+    eight_percent_books(tmp_path)
+    q2 = summary_json(capsys, tmp_path, "--quarter", "Q2")
+
+    # 8% of (800,000 - 250,000) to the end of Q2, less Q1's 12,000
+    assert q2["income_tax_due"] == pytest.approx(44000.0)
+    assert q2["income_tax_paid_prior"] == pytest.approx(12000.0)
+    assert q2["income_tax_payable"] == pytest.approx(32000.0)
+    assert q2["gross_income_quarter"] == 400000.0
+
+
+def test_summary_agrees_with_batch_reports(tmp_path, capsys):
+    eight_percent_books(tmp_path)
+    rows, _ = client_report(("client", str(tmp_path / "records.db"), str(tmp_path / "app_state.json"), 2025))
+    payable = {row["period"]: row["income_tax_payable"] for row in rows}
+
+    for quarter in ("Q1", "Q2", "Q3"):
+        result = summary_json(capsys, tmp_path, "--quarter", quarter)
+        assert result["income_tax_payable"] == pytest.approx(payable[quarter])
+    annual = summary_json(capsys, tmp_path)
+    assert annual["income_tax_payable"] == pytest.approx(payable["Annual"])
+
+
+@pytest.mark.parametrize("quarter", [[], ["--quarter", "Q2"]])
+def test_all_clients_summary_matches_the_single_client_one(tmp_path, capsys, monkeypatch, quarter):
+    registry = clients.ClientRegistry(index_file=str(tmp_path / "clients" / "index.json"))
+    monkeypatch.setattr(clients, "ClientRegistry",
+                        lambda default_db=None: type(registry)(registry.index_file, default_db))
+    folder = tmp_path / "clients" / registry.add_client("Acme")
+    eight_percent_books(folder)
+
+    single = summary_json(capsys, folder, *quarter)
+    capsys.readouterr()
+    # No default books (--db points nowhere), so only Acme is summarized
+    assert main(["--db", str(tmp_path / "none.db"), "summary", "--year", "2025", "--json", "--all-clients",
+                 *quarter]) == 0
+    assert json.loads(capsys.readouterr().out) == {"default": None, "acme": single}
+
+
+def test_add_rejects_bad_dates(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["--data-dir", str(tmp_path), "add", "income", "--date", "15/03/2025", "--gross", "1000"])
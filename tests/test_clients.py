@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+from core.clients import DEFAULT_CLIENT, ClientRegistry, StoragePool, slugify
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ClientRegistry(index_file=str(tmp_path / "clients" / "index.json"),
+                          default_db=str(tmp_path / "records.db"))
+
+
+def test_slugify():
+    assert slugify("  Dela Cruz & Sons, Inc. ") == "dela-cruz-sons-inc"
+    assert slugify("!!!") == "client"
+
+
+def test_clients_get_unique_slugs_and_their_own_folders(registry, tmp_path):
+    first, second = registry.add_client("Acme"), registry.add_client("ACME")
+    assert (first, second) == ("acme", "acme-2")
+    assert registry.paths(second)["db"] == str(tmp_path / "clients" / "acme-2" / "records.db")
+    assert registry.paths(DEFAULT_CLIENT)["db"] == str(tmp_path / "records.db")
+
+    reloaded = ClientRegistry(index_file=registry.index_file)
+    assert [slug for slug, _ in reloaded.list_clients()] == ["acme", "acme-2", DEFAULT_CLIENT]
+    assert reloaded.active == DEFAULT_CLIENT
+
+
+def test_cached_summary(registry):
+    slug = registry.add_client("Acme")
+    storage = StoragePool(registry).get(slug)
+    storage.add_income({"date": "2025-01-10", "gross_income": 1000.0, "description": "", "cwt": 0.0,
+                        "atc": "", "income_received": 1000.0})
+    registry.update_summary(slug, storage, year=2025)
+
+    summary = ClientRegistry(index_file=registry.index_file).index["clients"][slug]["summary"]
+    assert (summary["year"], summary["gross_income"]) == (2025, 1000.0)
+
+
+def test_pool_reuses_and_evicts_the_least_recently_used(registry):
+    slugs = [registry.add_client(name) for name in ("A", "B", "C")]
+    pool = StoragePool(registry, max_open=2)
+
+    a = pool.get(slugs[0])
+    b = pool.get(slugs[1])
+    assert pool.get(slugs[0]) is a          # reused, and now the most recent
+    pool.get(slugs[2])                      # evicts B
+
+    assert list(pool.open) == [slugs[0], slugs[2]]
+    with pytest.raises(sqlite3.ProgrammingError):
+        b.conn.execute("SELECT 1")
+    a.conn.execute("SELECT 1")
+
+    pool.close_all()
+    assert pool.open == {}
+    with pytest.raises(sqlite3.ProgrammingError):
+        a.conn.execute("SELECT 1")
@@ -0,0 +1,80 @@
+import pytest
+
+from core.duplicates import DuplicateDetector, normalize_description
+from core.importer import ImportJob
+from core.storage import StorageManager
+
+HEADER = "Date,Gross Income,Description\n"
+
+
+def income(day, amount=1000.0, description="Client ABC"):
+    return {"date": day, "gross_income": amount, "description": description, "cwt": 0.0,
+            "atc": "", "income_received": amount}
+
+
+def import_lines(storage, tmp_path, lines, chunk_size):
+    path = tmp_path / "statement.csv"
+    path.write_text(HEADER + "".join(line + "\n" for line in lines), encoding="utf-8")
+    return ImportJob(storage, str(path), "income", chunk_size=chunk_size).run()
+
+
+@pytest.fixture
+def storage():
+    return StorageManager(db_path=":memory:")
+
+
+def test_normalize_description():
+    assert normalize_description("  Payment - ACME Corp. #123 ") == "payment acme corp 123"
+    assert normalize_description("Café") == normalize_description("cafe")
+
+
+@pytest.mark.parametrize("day, amount, description, found", [
+    ("2025-03-15", 1000.0, "client abc", True),
+    ("2025-03-18", 1000.5, "Client  ABC.", True),
+    ("2025-03-19", 1000.0, "Client ABC", False),   # outside the date window
+    ("2025-03-15", 1001.5, "Client ABC", False),   # outside the amount tolerance
+    ("2025-03-15", 1000.0, "Client XYZ", False),
+])
+def test_fuzzy_window_on_manual_entry(storage, day, amount, description, found):
+    storage.add_income(income("2025-03-15"))
+    assert DuplicateDetector(storage).is_duplicate("income", day, amount, description) is found
+
+
+def test_editing_a_record_does_not_match_itself(storage):
+    record_id = storage.add_income(income("2025-03-15"))
+    detector = DuplicateDetector(storage)
+    assert not detector.is_duplicate("income", "2025-03-15", 1000.0, "Client ABC", exclude_id=record_id)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_exact_repeats_in_a_file_are_flagged_whatever_the_chunking(storage, tmp_path, chunk_size):
+    job = import_lines(storage, tmp_path, [
+        "2025-03-15,1000,Client ABC",
+        "2025-03-15,1000,client abc.",
+        "2025-03-15,1000,Client ABC",
+    ], chunk_size)
+    assert (job.inserted, job.duplicates) == (1, 2)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_recurring_lines_in_a_file_are_kept_whatever_the_chunking(storage, tmp_path, chunk_size):
+    # Close in date and amount, but not the same line: the ledger's fuzzy
+    # window only applies to what was recorded before the import
+    job = import_lines(storage, tmp_path, [
+        "2025-03-15,1000,Daily sales",
+        "2025-03-16,1000,Daily sales",
+        "2025-03-17,1000.50,Daily sales",
+        "2025-03-18,1000,Daily sales",
+    ], chunk_size)
+    assert (job.inserted, job.duplicates) == (4, 0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_lines_already_in_the_ledger_are_flagged(storage, tmp_path, chunk_size):
+    storage.add_income(income("2025-03-15"))
+    job = import_lines(storage, tmp_path, [
+        "2025-03-17,1000.50,Client ABC",   # fuzzy match of the recorded entry
+        "2025-04-15,1000,Client ABC",
+    ], chunk_size)
+    assert (job.inserted, job.duplicates) == (1, 1)
+    assert storage.count_income() == 2
@@ -0,0 +1,118 @@
+import sqlite3
+import sys
+
+import pytest
+
+from core.importer import CsvImportError, ImportJob, parse_amount, parse_date
+from core.journal import UndoJournal
+from core.storage import StorageManager
+
+HEADER = "Date,Gross Income,Description,CWT\n"
+
+
+def write_csv(tmp_path, text, name="statement.csv"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def run_import(storage, path, record_type="income", **options):
+    return ImportJob(storage, path, record_type, **options).run()
+
+
+@pytest.fixture
+def storage():
+    return StorageManager(db_path=":memory:")
+
+
+def test_imports_valid_rows(storage, tmp_path):
+    path = write_csv(tmp_path, HEADER + "2025-01-15,1000,Client A,50\n2025-02-01,2000,Client B,\n")
+    job = run_import(storage, path)
+
+    assert (job.inserted, job.errors) == (2, [])
+    rows = storage.get_all_income()
+    assert [row["income_received"] for row in rows] == [950.0, 2000.0]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="older fromisoformat only takes YYYY-MM-DD")
+@pytest.mark.parametrize("text", ["20250115", "2025-W03-3"])
+def test_other_iso_date_forms_are_stored_as_yyyy_mm_dd(storage, tmp_path, text):
+    path = write_csv(tmp_path, HEADER + f"{text},1000,Client A,0\n")
+    assert run_import(storage, path).inserted == 1
+
+    assert storage.get_all_income()[0]["date"] == "2025-01-15"
+    assert storage.get_annual_summary(2025)["gross_income"] == 1000.0
+    assert storage.count_income(year=2025, quarter="Q1") == 1
+
+
+@pytest.mark.parametrize("text, message", [
+    ("15/01/2025,1000,A,0", "Invalid date"),
+    ("2025-01-15,abc,A,0", "Amounts must be numbers"),
+    ("2025-01-15,0,A,0", "greater than 0"),
+    ("2025-01-15,1000,A,1500", "Withholding tax"),
+])
+def test_invalid_lines_are_reported_and_skipped(storage, tmp_path, text, message):
+    path = write_csv(tmp_path, HEADER + "2025-01-14,500,Good,0\n" + text + "\n")
+    job = run_import(storage, path)
+
+    assert job.inserted == 1
+    assert len(job.errors) == 1
+    line_no, error = job.errors[0]
+    assert line_no == 3 and message in error
+
+
+def test_bank_statement_headers_and_amount_formats(storage, tmp_path):
+    path = write_csv(tmp_path, (
+        "Posting Date;Particulars;Withdrawal\n"
+        '2025-03-01;Rent;"₱12,500.00"\n'
+        "2025-03-02;Refund;(100)\n"
+    ))
+    job = run_import(storage, path, "expense")
+
+    assert job.inserted == 1
+    assert storage.get_all_expense()[0]["gross_expense"] == 12500.0
+    assert "greater than 0" in job.errors[0][1]
+
+
+def test_missing_amount_column(storage, tmp_path):
+    path = write_csv(tmp_path, "Date,Description\n2025-01-15,Client A\n")
+    with pytest.raises(CsvImportError):
+        run_import(storage, path)
+
+
+def test_cancel_rolls_back_everything(storage, tmp_path):
+    lines = "".join(f"2025-01-{day % 28 + 1:02d},{100 + day},Client {day},0\n" for day in range(50))
+    path = write_csv(tmp_path, HEADER + lines)
+    job = ImportJob(storage, path, "income", journal=UndoJournal(storage), chunk_size=10)
+
+    assert job.step() and job.step()
+    job.cancel()
+
+    assert job.cancelled and job.inserted == 0
+    assert storage.count_income() == 0
+
+
+def test_database_error_rolls_back_and_raises(storage, tmp_path, monkeypatch):
+    lines = "".join(f"2025-01-{day % 28 + 1:02d},{100 + day},Client {day},0\n" for day in range(30))
+    path = write_csv(tmp_path, HEADER + lines)
+    job = ImportJob(storage, path, "income", journal=UndoJournal(storage), chunk_size=10)
+    assert job.step()
+
+    def fail(rows, commit=True):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(storage, "bulk_add_income", fail)
+    with pytest.raises(sqlite3.OperationalError):
+        job.step()
+
+    assert job.done and not job.step()
+    assert storage.count_income() == 0
+    assert not storage.conn.in_transaction
+
+
+def test_parse_helpers():
+    assert parse_amount("PHP 1,234.50") == 1234.5
+    assert parse_amount("") == 0.0
+    assert parse_date(" 2025-01-15 ") == "2025-01-15"
+    with pytest.raises(ValueError):
+        parse_date("01/15/2025")
@@ -0,0 +1,131 @@
+import pytest
+
+from core.journal import UndoJournal
+from core.storage import StorageManager
+
+INCOME = {
+    "date": "2025-03-15",
+    "gross_income": 1000.0,
+    "description": "Client ABC",
+    "cwt": 50.0,
+    "atc": "WI010",
+    "income_received": 950.0,
+}
+
+
+@pytest.fixture
+def storage():
+    return StorageManager(db_path=":memory:")
+
+
+@pytest.fixture
+def journal(storage):
+    return UndoJournal(storage)
+
+
+def add(storage, journal, **changes):
+    record_id = storage.add_income(dict(INCOME, **changes))
+    journal.record("income", "add", record_id)
+    return record_id
+
+
+def test_undo_and_redo_an_add(storage, journal):
+    record_id = add(storage, journal)
+    before = storage.get_income(record_id)
+
+    assert journal.undo() == {"income"}
+    assert storage.get_income(record_id) is None
+    assert journal.redo() == {"income"}
+    assert storage.get_income(record_id) == before
+    assert not journal.can_redo()
+
+
+def test_edit_keeps_only_changed_fields(storage, journal):
+    record_id = add(storage, journal)
+    old = storage.get_income(record_id)
+    new = dict(old, description="Client XYZ")
+    storage.update_income(record_id, new)
+    journal.record("income", "edit", record_id, old=old, new=new)
+
+    diff = storage.conn.execute(
+        "SELECT diff FROM undo_journal WHERE action = 'edit'"
+    ).fetchone()[0]
+    assert diff == '{"description": ["Client ABC", "Client XYZ"]}'
+
+    journal.undo()
+    assert storage.get_income(record_id)["description"] == "Client ABC"
+    journal.redo()
+    assert storage.get_income(record_id)["description"] == "Client XYZ"
+
+
+def test_saving_without_changes_records_nothing(storage, journal):
+    record_id = storage.add_income(INCOME)
+    row = storage.get_income(record_id)
+    journal.record("income", "edit", record_id, old=row, new=dict(row))
+    assert not journal.can_undo()
+
+
+def test_undone_delete_restores_the_identical_row(storage, journal):
+    record_id = storage.add_income(INCOME)
+    row = storage.get_income(record_id)
+    storage.delete_income(record_id)
+    journal.record("income", "delete", record_id, old=row)
+
+    journal.undo()
+    assert storage.get_income(record_id) == row
+
+
+def test_a_group_undoes_as_one_action(storage, journal):
+    ids = storage.bulk_add_income([INCOME] * 4)
+    rows = [storage.get_income(record_id) for record_id in ids]
+    with journal.group():
+        for record_id in ids:
+            storage.delete_income(record_id)
+        journal.record_many("income", "delete", rows)
+
+    journal.undo()
+    assert storage.count_income() == 4
+    assert not journal.can_undo()
+
+
+def test_a_new_action_clears_redo(storage, journal):
+    add(storage, journal)
+    journal.undo()
+    assert journal.can_redo()
+
+    add(storage, journal, description="Other")
+    assert not journal.can_redo()
+
+
+def test_history_is_a_bounded_ring(storage):
+    journal = UndoJournal(storage, capacity=3)
+    for n in range(10):
+        add(storage, journal, gross_income=1000.0 + n)
+
+    undone = 0
+    while journal.undo():
+        undone += 1
+    assert undone == 3
+    assert storage.count_income() == 7
+
+
+def test_aborted_group_leaves_no_history(storage, journal):
+    journal.begin_group()
+    ids = storage.bulk_add_income([INCOME] * 3, commit=False)
+    journal.record_many("income", "add", [{"id": record_id} for record_id in ids])
+    storage.conn.rollback()
+    journal.abort_group()
+
+    assert not journal.can_undo()
+    assert storage.count_income() == 0
+
+
+def test_history_survives_a_restart(tmp_path):
+    path = str(tmp_path / "records.db")
+    storage = StorageManager(db_path=path)
+    add(storage, UndoJournal(storage))
+    storage.conn.close()
+
+    reopened = StorageManager(db_path=path)
+    assert UndoJournal(reopened).undo() == {"income"}
+    assert reopened.count_income() == 0
@@ -0,0 +1,56 @@
+import pytest
+
+from core.optimizer import (
+    OPTIONS, break_even_expense_ratio, cheapest_option, evaluate_grid, evaluate_options, inverse_graduated_tax,
+)
+from core.tax import VAT_THRESHOLD, graduated_tax
+
+INCOMES = [150_000, 400_000, 700_000, 1_000_000, 1_500_000, 2_500_000, 3_000_000]
+
+
+def itemized_beats_flat(gross_income, ratio, earner_type):
+    totals = {r["key"]: r["total"] for r in evaluate_options(gross_income, gross_income * ratio, earner_type)}
+    return totals["itemized"] <= totals["8_percent"] + 1e-6
+
+
+def test_eight_percent_is_only_eligible_up_to_the_vat_threshold():
+    at_threshold = {r["key"]: r for r in evaluate_options(VAT_THRESHOLD, 0, "sole")}
+    over = {r["key"]: r for r in evaluate_options(VAT_THRESHOLD + 1, 0, "sole")}
+
+    assert at_threshold["8_percent"]["eligible"] and not over["8_percent"]["eligible"]
+    assert over["8_percent"]["total"] < over["osd"]["total"]     # cheapest on paper, but not allowed
+    assert cheapest_option(list(over.values()))["key"] == "osd"
+    assert break_even_expense_ratio(VAT_THRESHOLD + 1, "sole")["flat"] is None
+
+
+@pytest.mark.parametrize("tax", [0, 1, 29_999.5, 30_000, 130_000, 490_000, 2_410_000, 3_000_000])
+def test_inverse_graduated_tax_round_trips(tax):
+    assert graduated_tax(inverse_graduated_tax(tax)) == pytest.approx(tax)
+    assert inverse_graduated_tax(0) == 250_000
+
+
+@pytest.mark.parametrize("earner_type", ["sole", "mixed"])
+@pytest.mark.parametrize("gross_income", INCOMES)
+def test_break_even_ratio_matches_a_brute_force_search(gross_income, earner_type):
+    # Smallest expense ratio, in steps of 0.0001, where itemized costs no more than 8%
+    steps = 10_000
+    brute = next((n / steps for n in range(steps + 1)
+                  if itemized_beats_flat(gross_income, n / steps, earner_type)), None)
+    ratio = break_even_expense_ratio(gross_income, earner_type)
+
+    assert ratio["osd"] == 0.40
+    if brute is None:
+        assert ratio["flat"] is None
+    else:
+        assert ratio["flat"] == pytest.approx(brute, abs=1 / steps)
+
+
+@pytest.mark.parametrize("earner_type", ["sole", "mixed"])
+def test_grid_agrees_with_the_single_point_evaluation(earner_type):
+    incomes = INCOMES + [VAT_THRESHOLD + 500_000]
+    ratios = [0.0, 0.2, 0.4, 0.55, 0.7, 0.9]
+    grid = evaluate_grid(incomes, ratios, earner_type)
+    for row, ratio in zip(grid, ratios):
+        for index, gross in zip(row, incomes):
+            best = cheapest_option(evaluate_options(gross, gross * ratio, earner_type))
+            assert OPTIONS[index]["key"] == best["key"], (gross, ratio)
@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from core.app_state import AppState
+from core.projection import (
+    elapsed_months, project_linear, project_seasonal, project_series, project_year, seasonal_shares,
+    threshold_crossing,
+)
+from core.storage import StorageManager
+
+
+def test_elapsed_months():
+    assert elapsed_months(2024, date(2025, 2, 1)) == [1.0] * 12
+    assert elapsed_months(2026, date(2025, 2, 1)) == [0.0] * 12
+    assert elapsed_months(2025, date(2025, 2, 14)) == [1.0, 0.5] + [0.0] * 10
+
+
+def test_linear_extends_the_daily_rate():
+    # 100 a day through June 30
+    actual = [100.0 * d for d in (31, 28, 31, 30, 31, 30)] + [0.0] * 6
+    projected = project_linear(actual, elapsed_months(2025, date(2025, 6, 30)), 2025)
+    assert sum(projected) == pytest.approx(36_500.0)
+    assert projected[:6] == actual[:6]
+
+
+def test_seasonal_fills_the_year_in_the_usual_proportions():
+    # Half of every year is earned in December
+    history = [[10.0] * 11 + [110.0], [0.0] * 12, [20.0] * 11 + [220.0]]
+    shares = seasonal_shares(history)
+    assert shares[11] == pytest.approx(0.5)
+
+    actual = [50.0] * 11 + [0.0]
+    projected = project_seasonal(actual, elapsed_months(2025, date(2025, 11, 30)), shares)
+    assert sum(projected) == pytest.approx(1100.0)
+    assert project_series(actual, [1.0] * 12, 2025, history=[[0.0] * 12])[0] == "linear"
+
+
+def test_threshold_crossing_is_interpolated_within_the_month():
+    assert threshold_crossing([1_200_000.0] * 12, 2025) == date(2025, 3, 16)
+    assert threshold_crossing([1_000_000.0] * 3 + [0.0] * 9, 2025) == date(2025, 3, 31)
+    assert threshold_crossing([100_000.0] * 12, 2025) is None
+
+
+def test_project_year(tmp_path):
+    storage = StorageManager(db_path=":memory:")
+    storage.bulk_add_income([
+        {"date": f"2025-{month:02d}-15", "gross_income": 600_000.0, "description": "", "cwt": 0.0,
+         "atc": "", "income_received": 600_000.0}
+        for month in range(1, 7)
+    ])
+    app_state = AppState(state_file=str(tmp_path / "app_state.json"))
+    app_state.update_profile("sole", "graduated", "osd")
+
+    projection = project_year(storage, app_state, 2025, as_of=date(2025, 6, 30))
+
+    assert projection["model"] == "linear"     # no history
+    assert projection["ytd_income"] == 3_600_000.0
+    assert projection["gross_income"] == pytest.approx(3_600_000.0 * 365 / 181)
+    assert projection["vat_crossing"] == date(2025, 5, 31)
+    assert projection["percentage_tax"] == pytest.approx(projection["gross_income"] * 0.03)
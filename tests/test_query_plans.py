@@ -0,0 +1,155 @@
+import os
+import re
+
+import pytest
+
+from tests.conftest import LEDGER_YEAR
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Plan steps that are not table scans: constant rows, the FTS index and CTEs
+NOT_A_TABLE = re.compile(r"^SCAN (CONSTANT ROW|\w+ VIRTUAL TABLE|years\b)")
+TABLE_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def table_scans(conn, sql):
+    """The plan steps of `sql` that read a whole table (or a whole index of it)."""
+    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    return [step for step in plan if TABLE_SCAN.match(step) and not NOT_A_TABLE.match(step)]
+
+
+def capture_statements(storage, fn):
+    """Runs fn(storage) and returns the income/expense statements it executed, parameters inlined."""
+    statements = []
+    storage.conn.set_trace_callback(statements.append)
+    try:
+        fn(storage)
+    finally:
+        storage.conn.set_trace_callback(None)
+    return [
+        sql for sql in statements
+        if re.search(r"\b(income|expense)\b", sql)
+        and sql.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE"))
+    ]
+
+
+def first_id(storage, table):
+    return storage.cursor.execute(f"SELECT MIN(id) FROM {table}").fetchone()[0]
+
+
+def delete_and_restore_income(storage):
+    record = storage.get_income(first_id(storage, "income"))
+    storage.delete_income(record["id"])
+    storage.restore_income(record)
+
+
+def update_expense_unchanged(storage):
+    record = storage.get_expense(first_id(storage, "expense"))
+    storage.update_expense(record["id"], record)
+
+
+# (name, call) for every filtered read/write; the year is always set, as in the GUI.
+# Each must SEARCH an index: strftime('%Y', date) = ? in a WHERE clause, say,
+# would silently bring back full table scans
+INDEXED_CALLS = [
+    ("get_quarter_summary", lambda s: [s.get_quarter_summary(LEDGER_YEAR, q) for q in ("Q1", "Q2", "Q3", "Q4")]),
+    ("get_annual_summary", lambda s: s.get_annual_summary(LEDGER_YEAR)),
+    ("get_year_gross_income", lambda s: s.get_year_gross_income(LEDGER_YEAR)),
+    ("get_years income", lambda s: s.get_years("income")),
+    ("get_years expense", lambda s: s.get_years("expense")),
+    ("get_record_years", lambda s: s.get_record_years()),
+    ("get_monthly_totals", lambda s: s.get_monthly_totals(LEDGER_YEAR - 2, LEDGER_YEAR)),
+    ("get_income_by_year", lambda s: s.get_income_by_year(LEDGER_YEAR)),
+    ("get_income_page by date", lambda s: s.get_income_page(year=LEDGER_YEAR, limit=50)),
+    ("get_income_page by quarter", lambda s: s.get_income_page(year=LEDGER_YEAR, quarter="Q3", limit=50, offset=50)),
+    ("get_income_page with amounts", lambda s: s.get_income_page(
+        year=LEDGER_YEAR, amount_min=1000, amount_max=20000, limit=50)),
+    ("get_income_page with atcs", lambda s: s.get_income_page(year=LEDGER_YEAR, atcs=["WI010", "WI157"], limit=50)),
+    ("get_expense_page sorted", lambda s: s.get_expense_page(
+        year=LEDGER_YEAR, order_by="gross_expense", descending=True, limit=50)),
+    ("count_income", lambda s: s.count_income(year=LEDGER_YEAR, quarter="Q1", atcs=["WI010"])),
+    ("count_expense", lambda s: s.count_expense(year=LEDGER_YEAR, amount_min=500)),
+    ("get_record_position", lambda s: s.get_record_position("income", first_id(s, "income"))),
+    ("get_records_in_window", lambda s: s.get_records_in_window(
+        "income", f"{LEDGER_YEAR}-03-10", f"{LEDGER_YEAR}-03-20", 9000, 11000)),
+    ("get_records_in_window before an id", lambda s: s.get_records_in_window(
+        "income", f"{LEDGER_YEAR}-03-10", f"{LEDGER_YEAR}-03-20", 9000, 11000, max_id=first_id(s, "income"))),
+    ("get_last_id", lambda s: s.get_last_id("expense")),
+    ("bulk_restore_income of a present id", lambda s: s.bulk_restore_income([s.get_income(first_id(s, "income"))])),
+    ("get_records_between", lambda s: s.get_records_between(
+        "expense", f"{LEDGER_YEAR}-06-01", f"{LEDGER_YEAR}-06-30")),
+    ("search_records", lambda s: s.search_records("acme inv")),
+    ("get_income", lambda s: s.get_income(first_id(s, "income"))),
+    ("delete/restore income", delete_and_restore_income),
+    ("update_expense", update_expense_unchanged),
+]
+
+# These read every row by design
+FULL_READS = [
+    ("get_all_income", lambda s: s.get_all_income()),
+    ("get_all_expense", lambda s: s.get_all_expense()),
+    ("get_income_summary", lambda s: s.get_income_summary()),
+    ("get_expense_summary", lambda s: s.get_expense_summary()),
+]
+
+
+@pytest.mark.parametrize("name, call", INDEXED_CALLS, ids=[name for name, _ in INDEXED_CALLS])
+def test_filtered_queries_search_an_index(storage, name, call):
+    statements = capture_statements(storage, call)
+    assert statements, f"{name} ran no income/expense query"
+
+    for sql in statements:
+        scans = table_scans(storage.conn, sql)
+        assert not scans, f"{name} scans a whole table: {scans}\n{sql}"
+
+
+@pytest.mark.parametrize("name, call", FULL_READS, ids=[name for name, _ in FULL_READS])
+def test_full_reads_still_run(storage, name, call):
+    # Not checked for scans, but kept here so a new storage method has to be
+    # placed in one list or the other
+    assert capture_statements(storage, call)
+
+
+def test_every_public_storage_method_is_covered(storage):
+    covered = {
+        "get_quarter_summary", "get_annual_summary", "get_year_gross_income", "get_years",
+        "get_record_years", "get_monthly_totals", "get_income_by_year", "get_income_page",
+        "get_expense_page", "count_income", "count_expense", "get_record_position",
+        "get_records_in_window", "get_last_id", "bulk_restore_income", "get_records_between", "search_records",
+        "get_income",
+        "get_expense", "delete_income", "restore_income", "update_expense",
+        "get_all_income", "get_all_expense", "get_income_summary", "get_expense_summary",
+    }
+    # Inserts, DDL and methods whose WHERE is the same as a covered one
+    not_queries = {
+        "add_income", "add_expense", "bulk_add_income", "bulk_add_expense", "bulk_restore_expense", "create_tables",
+        "migrate", "create_indexes", "create_search_index", "update_income", "delete_expense", "restore_expense",
+    }
+    public = {
+        name for name in dir(type(storage))
+        if not name.startswith("_") and callable(getattr(type(storage), name))
+    }
+    assert public - covered - not_queries == set()
+
+
+def test_year_filter_with_strftime_is_caught(storage):
+    # The checker itself: the pattern these tests exist to keep out
+    scans = table_scans(storage.conn, "SELECT * FROM income WHERE strftime('%Y', date) = '2025'")
+    assert scans and scans[0].startswith("SCAN income")
+
+
+def test_gui_runs_no_sql_of_its_own():
+    """
+    SQL belongs in StorageManager, where the tests above check its plans. The
+    year dropdowns used to query storage.cursor directly with strftime().
+    """
+    offenders = []
+    gui_dir = os.path.join(PROJECT_ROOT, "gui")
+    for name in sorted(os.listdir(gui_dir)):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(gui_dir, name), encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if re.search(r"storage\.(cursor|conn)\b|\.execute(many)?\(", line):
+                    offenders.append(f"gui/{name}:{line_no}: {line.strip()}")
+    assert not offenders, "\n".join(offenders)
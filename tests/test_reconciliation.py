@@ -0,0 +1,102 @@
+import pytest
+
+from core.importer import CsvImportError
+from core.reconciliation import Reconciler, load_statement
+from core.storage import StorageManager
+
+
+def income(day, gross, cwt=0.0, description="Client ABC"):
+    return {"date": day, "gross_income": gross, "description": description, "cwt": cwt,
+            "atc": "WI010", "income_received": gross - cwt}
+
+
+def expense(day, gross, description="Supplies"):
+    return {"date": day, "gross_expense": gross, "description": description, "wt": 0.0,
+            "atc": "", "expense_paid": gross}
+
+
+def line(day, amount, direction="in", line_no=2):
+    return {"line_no": line_no, "date": day, "amount": amount, "direction": direction, "description": ""}
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "statement.csv"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def storage():
+    return StorageManager(db_path=":memory:")
+
+
+def test_load_statement_with_credit_and_debit_columns(tmp_path):
+    path = write_csv(tmp_path, (
+        "Posting Date,Particulars,Debit,Credit\n"
+        "2025-03-01,Deposit,,\"9,500.00\"\n"
+        "2025-03-02,Rent,3000,\n"
+        "03/03/2025,Bad,,1\n"
+    ))
+    lines, errors = load_statement(path)
+
+    assert [(l["date"], l["amount"], l["direction"]) for l in lines] == [
+        ("2025-03-01", 9500.0, "in"), ("2025-03-02", 3000.0, "out")
+    ]
+    assert errors[0][0] == 4
+
+
+def test_load_statement_with_a_signed_amount(tmp_path):
+    lines, _ = load_statement(write_csv(tmp_path, "Date,Amount\n2025-03-01,-250\n2025-03-02,400\n"))
+    assert [(l["amount"], l["direction"]) for l in lines] == [(250.0, "out"), (400.0, "in")]
+
+
+def test_load_statement_needs_date_and_amount(tmp_path):
+    with pytest.raises(CsvImportError):
+        load_statement(write_csv(tmp_path, "Date,Description\n2025-03-01,x\n"))
+
+
+def test_matches_net_then_gross_within_the_window(storage):
+    net_id = storage.add_income(income("2025-03-01", 10000.0, cwt=500.0))   # received 9500
+    gross_id = storage.add_income(income("2025-03-10", 2000.0))
+    expense_id = storage.add_expense(expense("2025-03-05", 300.0))
+
+    result = Reconciler(storage).reconcile([
+        line("2025-03-03", 9500.0),
+        line("2025-03-12", 2000.0),
+        line("2025-03-05", 300.0, "out"),
+        line("2025-03-20", 2000.0),          # nothing left within 5 days
+    ])
+
+    matched = {(m["record_type"], m["record_id"]): m["date_diff"] for m in result["matched"]}
+    assert matched == {("income", net_id): -2, ("income", gross_id): -2, ("expense", expense_id): 0}
+    assert [l["date"] for l in result["unmatched_lines"]] == ["2025-03-20"]
+
+
+def test_each_record_is_matched_once_and_to_the_closest_line(storage):
+    near = storage.add_income(income("2025-03-04", 1000.0))
+    far = storage.add_income(income("2025-03-08", 1000.0))
+
+    result = Reconciler(storage).reconcile([line("2025-03-05", 1000.0), line("2025-03-05", 1000.0)])
+
+    assert [m["record_id"] for m in result["matched"]] == [near, far]
+    assert result["unmatched_lines"] == []
+
+
+def test_unmatched_records_inside_the_statement_period(storage):
+    storage.add_income(income("2025-03-01", 1000.0))
+    missing = storage.add_income(income("2025-03-15", 777.0))
+    storage.add_income(income("2025-05-01", 777.0))          # outside the period
+
+    result = Reconciler(storage).reconcile([line("2025-03-01", 1000.0), line("2025-03-31", 5.0)])
+    assert [r["id"] for r in result["unmatched_records"]] == [missing]
+
+
+def test_runs_are_saved(storage):
+    storage.add_income(income("2025-03-01", 1000.0))
+    reconciler = Reconciler(storage)
+    first = reconciler.reconcile([line("2025-03-01", 1000.0, line_no=2), line("2025-03-02", 5.0, line_no=3)])
+    second = reconciler.reconcile([line("2025-03-01", 1000.0)])
+
+    assert second["run_id"] == first["run_id"] + 1
+    assert [row["line_no"] for row in reconciler.get_run(first["run_id"])] == [2, 3]
+    assert [row["line_no"] for row in reconciler.get_run(first["run_id"], status="unmatched")] == [3]
@@ -0,0 +1,153 @@
+import pytest
+
+from core.storage import StorageManager
+
+INCOME = [
+    # date, gross, description, atc
+    ("2024-12-31", 900.0, "Year end", "WI010"),
+    ("2025-01-05", 1500.0, "client abc", "WI010"),
+    ("2025-02-10", 300.0, "Client XYZ", "wi011"),
+    ("2025-02-10", 300.0, "bank interest", None),
+    ("2025-03-31", 2500.0, "Consulting", "WC010"),
+    ("2025-04-01", 800.0, "Client ABC", "WI011"),
+    ("2025-06-15", 1500.0, "Zeta retainer", "WI010"),
+    ("2025-12-31", 50.0, "Café sales", "WC010"),
+]
+EXPENSE = [
+    ("2025-01-20", 400.0, "Rent", "WC120"),
+    ("2025-05-02", 120.0, "rent deposit", None),
+    ("2025-05-02", 2200.0, "Laptop", "WC120"),
+]
+
+
+def income(day, gross, description, atc):
+    return {"date": day, "gross_income": gross, "description": description, "cwt": gross * 0.05,
+            "atc": atc, "income_received": gross * 0.95}
+
+
+def expense(day, gross, description, atc):
+    return {"date": day, "gross_expense": gross, "description": description, "wt": 0.0,
+            "atc": atc, "expense_paid": gross}
+
+
+@pytest.fixture
+def storage():
+    storage = StorageManager(db_path=":memory:")
+    storage.bulk_add_income([income(*row) for row in INCOME])
+    storage.bulk_add_expense([expense(*row) for row in EXPENSE])
+    return storage
+
+
+def page(storage, record_type, **options):
+    return getattr(storage, f"get_{record_type}_page")(**options)
+
+
+def count(storage, record_type, **filters):
+    return getattr(storage, f"count_{record_type}")(**filters)
+
+
+def sort_key(row, column):
+    # NULLs first (SQLite's ascending order), text without case, ties by id
+    value = row[column]
+    return value is not None, value.lower() if isinstance(value, str) else value, row["id"]
+
+
+@pytest.mark.parametrize("record_type, amount", [("income", "gross_income"), ("expense", "gross_expense")])
+@pytest.mark.parametrize("descending", [False, True])
+def test_every_sort_column_orders_the_rows(storage, record_type, amount, descending):
+    columns = ("date", amount, "description", "atc", "cwt" if record_type == "income" else "wt")
+    for column in columns:
+        rows = page(storage, record_type, order_by=column, descending=descending)
+        expected = sorted(rows, key=lambda row: sort_key(row, column), reverse=descending)
+        assert [row["id"] for row in rows] == [row["id"] for row in expected], column
+
+
+def test_description_sort_ignores_case(storage):
+    descriptions = [row["description"] for row in page(storage, "income", order_by="description")]
+    assert descriptions[:4] == ["bank interest", "Café sales", "client abc", "Client ABC"]
+
+
+def test_unknown_sort_column_falls_back_to_date(storage):
+    rows = page(storage, "income", order_by="gross_income; DROP TABLE income")
+    assert [row["date"] for row in rows] == sorted(row[0] for row in INCOME)
+    assert storage.count_income() == len(INCOME)
+
+
+@pytest.mark.parametrize("filters, dates", [
+    ({"year": 2025}, ["2025-01-05", "2025-02-10", "2025-02-10", "2025-03-31", "2025-04-01", "2025-06-15",
+                      "2025-12-31"]),
+    ({"year": 2025, "quarter": "Q1"}, ["2025-01-05", "2025-02-10", "2025-02-10", "2025-03-31"]),
+    ({"year": 2025, "quarter": "Q4"}, ["2025-12-31"]),
+    ({"year": 2024}, ["2024-12-31"]),
+    ({"amount_min": 800.0, "amount_max": 1500.0}, ["2024-12-31", "2025-01-05", "2025-04-01", "2025-06-15"]),
+    ({"year": 2025, "amount_min": 2500.0}, ["2025-03-31"]),
+    ({"atcs": ["WI011"]}, ["2025-02-10", "2025-04-01"]),
+    ({"atcs": ["wc010", "WI010"], "year": 2025, "quarter": "Q1"}, ["2025-01-05", "2025-03-31"]),
+    ({"year": 2026}, []),
+])
+def test_filters_select_the_right_rows(storage, filters, dates):
+    rows = page(storage, "income", **filters)
+    assert [row["date"] for row in rows] == dates
+    assert count(storage, "income", **filters) == len(dates)
+
+
+def test_expense_filters(storage):
+    assert [row["description"] for row in page(storage, "expense", year=2025, quarter="Q2", atcs=["wc120"])] \
+        == ["Laptop"]
+    assert count(storage, "expense", amount_max=400.0) == 2
+
+
+def test_pages_slice_the_sorted_rows(storage):
+    everything = page(storage, "income", order_by="gross_income", descending=True)
+    pages = [page(storage, "income", order_by="gross_income", descending=True, limit=3, offset=offset)
+             for offset in (0, 3, 6)]
+    assert [len(p) for p in pages] == [3, 3, 2]
+    assert [row["id"] for p in pages for row in p] == [row["id"] for row in everything]
+
+
+def test_get_record_position_is_the_row_the_gui_pages_to(storage):
+    page_size = 2
+    for row in storage.get_all_income():
+        year, index = storage.get_record_position("income", row["id"])
+        # The GUI opens the year, date ascending, unfiltered, on page index // PAGE_SIZE
+        shown = storage.get_income_page(year=year, limit=page_size, offset=index // page_size * page_size)
+        assert shown[index % page_size]["id"] == row["id"]
+
+    removed = storage.get_all_expense()[0]["id"]
+    storage.delete_expense(removed)
+    assert storage.get_record_position("expense", removed) is None
+
+
+def search_ids(storage, text):
+    return [(row["record_type"], row["id"]) for row in storage.search_records(text)]
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_search_matches_word_prefixes(storage, fts):
+    storage.fts_enabled = storage.fts_enabled and fts
+    found = {row["description"] for row in storage.search_records("cli ab")}
+    assert found == {"client abc", "Client ABC"}
+    assert {row["description"] for row in storage.search_records("wc120")} == {"Rent", "Laptop"}
+    assert storage.search_records("  ") == []
+
+
+def test_search_lists_newest_first_and_stops_at_the_limit(storage):
+    rows = storage.search_records("rent", limit=2)
+    assert [(row["record_type"], row["date"]) for row in rows] == [("expense", "2025-05-02"),
+                                                                   ("expense", "2025-01-20")]
+    assert len(storage.search_records("w", limit=3)) == 3
+
+
+def test_search_index_follows_updates_and_deletes(storage):
+    if not storage.fts_enabled:
+        pytest.skip("this SQLite build has no FTS5")
+    record_id = storage.get_income_page(atcs=["WC010"], year=2025, quarter="Q1")[0]["id"]
+
+    storage.update_income(record_id, dict(storage.get_income(record_id), description="Audit fee"))
+    assert ("income", record_id) in search_ids(storage, "audit")
+    assert ("income", record_id) not in search_ids(storage, "consulting")
+
+    storage.delete_income(record_id)
+    assert search_ids(storage, "audit") == []
+    fts_rows = storage.conn.execute("SELECT COUNT(*) FROM income_fts WHERE income_fts MATCH 'audit'").fetchone()[0]
+    assert fts_rows == 0
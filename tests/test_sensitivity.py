@@ -0,0 +1,66 @@
+import pytest
+
+from core.sensitivity import breakpoints, tax_curve, total_tax
+
+PROFILES = [
+    ("8_percent", "sole", None),
+    ("8_percent", "mixed", None),
+    ("graduated", "sole", "osd"),
+    ("graduated", "sole", "itemized"),
+]
+DELTAS = [0, 1, 50_000, 149_999.5, 250_000, 1_000_000, 7_500_000]
+
+
+@pytest.mark.parametrize("tax_type, earner_type, deduction_type", PROFILES)
+@pytest.mark.parametrize("dimension", ["income", "expense"])
+@pytest.mark.parametrize("gross_income, gross_expense", [(0, 0), (200_000, 50_000), (1_200_000, 700_000)])
+def test_curve_matches_total_tax_at_every_point(tax_type, earner_type, deduction_type, dimension,
+                                                gross_income, gross_expense):
+    profile = (tax_type, earner_type, deduction_type)
+    base = total_tax(gross_income, gross_expense, *profile)
+    for delta, total, extra in tax_curve(gross_income, gross_expense, *profile, DELTAS, dimension):
+        income = gross_income + delta if dimension == "income" else gross_income
+        expense = gross_expense + delta if dimension == "expense" else gross_expense
+        assert total == pytest.approx(total_tax(income, expense, *profile))
+        assert extra == pytest.approx(total - base)
+
+
+def test_breakpoints_of_an_itemized_filer():
+    profile = ("graduated", "sole", "itemized")
+    # Taxable 500,000 today
+    assert breakpoints(600_000, 100_000, *profile, 3_000_000) == [
+        (300_000, "30% bracket starts"), (1_500_000, "32% bracket starts"), (2_400_000, "VAT threshold"),
+    ]
+    assert breakpoints(600_000, 100_000, *profile, 3_000_000, dimension="expense") == [
+        (100_000, "Drops below the 25% bracket"), (250_000, "Drops below the 20% bracket"),
+    ]
+
+
+def test_breakpoints_of_an_eight_percent_filer():
+    assert breakpoints(100_000, 0, "8_percent", "sole", None, 3_000_000) == [
+        (150_000, "₱250k exemption used up"), (2_900_000, "VAT threshold (8% no longer allowed)"),
+    ]
+    assert breakpoints(100_000, 0, "8_percent", "sole", None, 3_000_000, dimension="expense") == []
+
+
+@pytest.mark.parametrize("tax_type, earner_type, deduction_type", PROFILES)
+@pytest.mark.parametrize("dimension", ["income", "expense"])
+def test_the_marginal_rate_changes_at_each_breakpoint(tax_type, earner_type, deduction_type, dimension):
+    profile = (tax_type, earner_type, deduction_type)
+    gross_income, gross_expense = 300_000, 200_000
+
+    def slope(delta):
+        (_, before, _), (_, after, _) = tax_curve(gross_income, gross_expense, *profile,
+                                                  [delta - 1, delta + 1], dimension)
+        return (after - before) / 2
+
+    points = breakpoints(gross_income, gross_expense, *profile, 9_000_000, dimension)
+    # Crossing the VAT threshold changes what may be elected, not the rate
+    for delta, label in points:
+        if not label.startswith("VAT"):
+            assert slope(delta - 10) != pytest.approx(slope(delta + 10)), label
+    # and nothing changes in between
+    bounds = [0] + [delta for delta, _ in points] + [9_000_000]
+    for low, high in zip(bounds, bounds[1:]):
+        if high - low > 40:
+            assert slope(low + 20) == pytest.approx(slope(high - 20))
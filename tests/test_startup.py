@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.cold_start import PROJECT_ROOT, measure_import, parse_importtime, scratch_data_dir
+from core.app_state import AppState
+from core.paths import DATA_DIR_ENV
+
+# Imports the entry point and the core modules in a fresh interpreter and
+# reports any folder created on the way
+IMPORT_SIDE_EFFECTS = """
+import json, os
+created = []
+for name in ("makedirs", "mkdir"):
+    real = getattr(os, name)
+    def record(path, *args, _real=real, **kwargs):
+        created.append(str(path))
+        return _real(path, *args, **kwargs)
+    setattr(os, name, record)
+
+import NonVatTaxTracker
+import core.paths, core.storage, core.license_manager, core.clients, core.cli
+print(json.dumps(created))
+"""
+
+
+def test_importing_creates_no_folders():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SIDE_EFFECTS],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == []
+
+
+def test_entry_point_imports_no_gui_module_eagerly():
+    assert measure_import()["eager_heavy_modules"] == []
+
+
+def test_first_paint_runs_on_configured_scratch_books(tmp_path):
+    data_dir = scratch_data_dir(str(tmp_path))
+    app_state = AppState(state_file=os.path.join(data_dir, "app_state.json"))
+    app_state.load()
+    assert app_state.is_configured     # so no setup wizard waits for input
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import json, core.clients; print(json.dumps(core.clients.INDEX_FILE))"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60,
+        env=dict(os.environ, **{DATA_DIR_ENV: data_dir}),
+    )
+    assert json.loads(result.stdout) == os.path.join(data_dir, "clients", "index.json")
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   core.paths\n"
+        "import time:       900 |       1020 | NonVatTaxTracker\n"
+        "some other warning\n"
+    )
+    assert parse_importtime(stderr) == {"core.paths": (120, 120), "NonVatTaxTracker": (900, 1020)}
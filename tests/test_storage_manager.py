@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+
+from core import storage as storage_module
+from core.storage import StorageManager, database_file, default_db_path
+
+INCOME = {
+    "date": "2025-03-15",
+    "gross_income": 25000.0,
+    "description": "Client ABC",
+    "cwt": 1250.0,
+    "atc": "WI010",
+    "income_received": 23750.0,
+}
+
+
+def test_memory_databases_are_isolated():
+    first = StorageManager(db_path=":memory:")
+    second = StorageManager(db_path=":memory:")
+    first.add_income(INCOME)
+
+    assert first.count_income() == 1
+    assert second.count_income() == 0
+    assert first.db_file is None
+
+
+def test_two_files_side_by_side(tmp_path):
+    a = StorageManager(db_path=str(tmp_path / "a" / "records.db"))
+    b = StorageManager(db_path=str(tmp_path / "b" / "records.db"))
+    a.add_income(INCOME)
+
+    assert (a.count_income(), b.count_income()) == (1, 0)
+
+
+def test_read_only_uri(tmp_path):
+    path = tmp_path / "records.db"
+    StorageManager(db_path=str(path)).add_income(INCOME)
+
+    reader = StorageManager(db_path=f"file:{path}?mode=ro")
+    assert reader.get_annual_summary(2025)["gross_income"] == 25000.0
+    assert reader.db_file == str(path)
+    with pytest.raises(sqlite3.OperationalError):
+        reader.add_income(INCOME)
+
+
+def test_connect_options_and_pragmas(tmp_path):
+    storage = StorageManager(
+        db_path=str(tmp_path / "records.db"),
+        connect_options={"timeout": 1.5, "check_same_thread": False},
+        pragmas={"journal_mode": "WAL", "cache_size": -8000},
+    )
+    assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert storage.conn.execute("PRAGMA cache_size").fetchone()[0] == -8000
+
+
+@pytest.mark.parametrize("pragmas", [
+    {"user_version": 7},
+    {"journal_mode": "WAL; DROP TABLE income"},
+    {"cache_size": "-8000\n"},
+])
+def test_unsupported_pragmas_are_rejected(tmp_path, pragmas):
+    with pytest.raises(ValueError):
+        StorageManager(db_path=str(tmp_path / "records.db"), pragmas=pragmas)
+    assert not (tmp_path / "records.db").exists()
+
+
+def test_old_date_index_is_dropped_once(tmp_path):
+    path = str(tmp_path / "records.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE income (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, "
+                 "gross_income REAL NOT NULL, description TEXT, cwt REAL DEFAULT 0, atc TEXT, "
+                 "income_received REAL NOT NULL, created_at TEXT NOT NULL)")
+    conn.execute("CREATE INDEX idx_income_date ON income(date)")
+    conn.close()
+
+    storage = StorageManager(db_path=path)
+    index = "SELECT 1 FROM sqlite_master WHERE name = 'idx_income_date'"
+    assert storage.conn.execute(index).fetchone() is None
+    assert storage.conn.execute("PRAGMA user_version").fetchone()[0] == storage_module.SCHEMA_VERSION
+
+    # Opening a migrated file again leaves its indexes alone
+    storage.conn.execute("CREATE INDEX idx_income_date ON income(date)")
+    storage.conn.close()
+    assert StorageManager(db_path=path).conn.execute(index).fetchone() is not None
+
+
+def test_default_db_path_is_read_per_call(tmp_path, monkeypatch):
+    monkeypatch.delenv(storage_module.DB_ENV, raising=False)
+    assert default_db_path().endswith("records.db")
+
+    override = str(tmp_path / "elsewhere.db")
+    monkeypatch.setenv(storage_module.DB_ENV, override)
+    assert default_db_path() == override
+    assert StorageManager().db_path == override
+
+
+@pytest.mark.parametrize("db_path, expected", [
+    (":memory:", None),
+    ("file::memory:?cache=shared", None),
+    ("file:shared?mode=memory&cache=shared", None),
+    ("file:/data/books.db?mode=ro", "/data/books.db"),
+])
+def test_database_file(db_path, expected):
+    assert database_file(db_path) == expected
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+
+import pytest
+
+from core.storage import StorageManager
+from core.storage_service import StorageService
+
+INCOME = {
+    "date": "2025-03-15",
+    "gross_income": 1000.0,
+    "description": "Client ABC",
+    "cwt": 50.0,
+    "atc": "WI010",
+    "income_received": 950.0,
+}
+
+
+@pytest.fixture
+def service(tmp_path):
+    path = str(tmp_path / "records.db")
+    StorageManager(db_path=path).conn.close()
+    service = StorageService(path)
+    yield service
+    service.close()
+
+
+def test_switches_the_file_to_wal(service):
+    conn = sqlite3.connect(service.db_file)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_queued_writes_share_one_commit(service):
+    # Hold the writer on the first job so the rest queue up behind it
+    running, release = threading.Event(), threading.Event()
+    first = service.write(lambda storage: running.set() or release.wait(5))
+    assert running.wait(5)
+    futures = [service.write("add_income", dict(INCOME, gross_income=float(n))) for n in range(20)]
+    release.set()
+
+    ids = [future.result(timeout=5) for future in futures]
+    first.result(timeout=5)
+    assert len(set(ids)) == 20
+    assert service.batches == 2
+    assert service.read("count_income").result(timeout=5) == 20
+
+
+def test_failing_job_rolls_back_alone(service):
+    release = threading.Event()
+    service.write(lambda storage: release.wait(5))
+    good = service.write("add_income", INCOME)
+
+    def add_then_fail(storage):
+        storage.add_income(INCOME)
+        raise ValueError("bad row")
+
+    bad = service.write(add_then_fail)
+    also_good = service.write("add_income", INCOME)
+    release.set()
+
+    with pytest.raises(ValueError):
+        bad.result(timeout=5)
+    assert good.result(timeout=5) and also_good.result(timeout=5)
+    assert service.read("count_income").result(timeout=5) == 2
+
+
+def test_readers_see_committed_state_during_a_write(service):
+    service.write("add_income", INCOME).result(timeout=5)
+
+    inside = threading.Event()
+    release = threading.Event()
+
+    def slow_write(storage):
+        storage.add_income(INCOME)
+        inside.set()
+        release.wait(5)
+
+    pending = service.write(slow_write)
+    assert inside.wait(5)
+    # The uncommitted second row is invisible and the read does not wait for it
+    assert service.read("count_income").result(timeout=2) == 1
+    release.set()
+    pending.result(timeout=5)
+    assert service.read("count_income").result(timeout=5) == 2
+
+
+def test_readers_are_read_only(service):
+    with pytest.raises(sqlite3.OperationalError):
+        service.read("add_income", INCOME).result(timeout=5)
+
+
+def test_close_finishes_queued_writes(service):
+    futures = [service.write("add_income", INCOME) for _ in range(5)]
+    service.close()
+
+    assert all(future.done() for future in futures)
+    assert StorageManager(db_path=service.db_file).count_income() == 5
+    with pytest.raises(RuntimeError):
+        service.write("add_income", INCOME)
+
+
+def test_without_wal_the_file_is_left_alone(tmp_path):
+    path = str(tmp_path / "records.db")
+    StorageManager(db_path=path).add_income(INCOME)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version = 0")     # as if made by an older version
+
+    service = StorageService(path, wal=False)
+    try:
+        assert service.read("count_income").result(timeout=5) == 1
+        assert service.read("search_records", "abc").result(timeout=5)[0]["description"] == "Client ABC"
+    finally:
+        service.close()
+    # No journal mode switch, and the readers ran no schema setup or migration
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+
+
+def test_memory_database_is_refused():
+    with pytest.raises(ValueError):
+        StorageService(None)
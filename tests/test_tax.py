@@ -0,0 +1,48 @@
+import pytest
+
+from core.tax import GRADUATED_BRACKETS, graduated_tax, income_tax, percentage_tax
+
+
+@pytest.mark.parametrize("taxable, expected", [
+    (-5, 0.0),
+    (0, 0.0),
+    (250_000, 0.0),
+    (250_001, 0.20),
+    (400_000, 30_000.0),
+    (800_000, 130_000.0),
+    (2_000_000, 490_000.0),
+    (8_000_000, 2_410_000.0),
+    (8_000_100, 2_410_035.0),
+])
+def test_graduated_tax_at_the_bracket_bounds(taxable, expected):
+    assert graduated_tax(taxable) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("lower, base, rate", GRADUATED_BRACKETS[1:])
+def test_graduated_tax_is_continuous_across_each_bound(lower, base, rate):
+    assert graduated_tax(lower - 0.01) == pytest.approx(base, abs=0.01)
+    assert graduated_tax(lower + 100) == pytest.approx(base + 100 * rate)
+
+
+@pytest.mark.parametrize("gross_income, earner_type, taxable", [
+    (200_000, "sole", 0),                  # under the exemption
+    (250_000, "sole", 0),
+    (1_000_000, "sole", 750_000),
+    (200_000, "mixed", 200_000),           # mixed earners get no exemption
+])
+def test_eight_percent(gross_income, earner_type, taxable):
+    tax = income_tax(gross_income, 999_999, "8_percent", earner_type, None)
+    assert tax["taxable"] == taxable
+    assert tax["tax_due"] == pytest.approx(taxable * 0.08)
+    assert percentage_tax(gross_income, "8_percent") == 0.0
+
+
+def test_graduated_deductions():
+    osd = income_tax(1_000_000, 900_000, "graduated", "sole", "osd")
+    assert (osd["deductible"], osd["taxable"]) == (400_000, 600_000)
+    assert osd["tax_due"] == pytest.approx(30_000 + 200_000 * 0.25)
+
+    itemized = income_tax(1_000_000, 900_000, "graduated", "sole", "itemized")
+    assert (itemized["taxable"], itemized["tax_due"]) == (100_000, 0.0)
+    assert income_tax(100_000, 300_000, "graduated", "sole", "itemized")["taxable"] == 0
+    assert percentage_tax(1_000_000, "graduated") == pytest.approx(30_000)
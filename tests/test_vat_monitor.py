@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from core.storage import StorageManager
+from core.vat_monitor import VatThresholdMonitor
+
+YEAR = datetime.now().year
+
+
+def income(amount, year=YEAR):
+    return {"date": f"{year}-03-15", "gross_income": amount, "description": "", "cwt": 0.0,
+            "atc": "", "income_received": amount}
+
+
+@pytest.fixture
+def storage():
+    storage = StorageManager(db_path=":memory:")
+    storage.bulk_add_income([income(1_000_000.0), income(5_000_000.0, YEAR - 1)])
+    return storage
+
+
+def test_starts_from_this_years_total(storage):
+    assert VatThresholdMonitor(storage).total == 1_000_000.0
+
+
+def test_deltas_track_adds_edits_and_deletes(storage):
+    monitor = VatThresholdMonitor(storage)
+    added = income(500_000.0)
+    monitor.apply(new=added)
+    edited = dict(added, gross_income=700_000.0)
+    monitor.apply(old=added, new=edited)
+    assert monitor.total == 1_700_000.0
+
+    # Moved to last year: it leaves this year's total
+    monitor.apply(old=edited, new=dict(edited, date=f"{YEAR - 1}-12-31"))
+    monitor.apply(old=income(1_000_000.0))
+    assert monitor.total == 0.0
+
+
+def test_tiers(storage):
+    monitor = VatThresholdMonitor(storage)
+    assert monitor.current_tier() is None
+    monitor.apply(new=income(1_400_000.0))      # 2.4M = 80%
+    assert monitor.current_tier() == 0.80
+    monitor.apply(new=income(600_000.0))        # 3.0M
+    assert monitor.current_tier() == 1.00
+
+
+def test_reconciles_after_enough_writes(storage):
+    monitor = VatThresholdMonitor(storage, reconcile_every_writes=2)
+    # Written behind the monitor's back, e.g. by an import
+    storage.add_income(income(2_000_000.0))
+    monitor.apply(new=income(1.0))
+    assert monitor.current_tier() is None
+    monitor.apply(new=income(1.0))
+    assert monitor.current_tier() == 1.00
+    assert (monitor.total, monitor.writes) == (3_000_000.0, 0)